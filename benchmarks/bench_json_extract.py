@@ -0,0 +1,90 @@
+"""
+JSON extraction benchmark for model replies.
+
+Runs every reply in a corpus through the previous greedy-regex extractor and
+through `extract_json`, and reports how many replies each recovers correctly.
+Each reply one extractor recovers and the other does not is a section that
+would otherwise be lost or need another OpenAI call.
+
+The corpus is a JSON Lines file with one {"name", "reply", "expected"} object
+per line; "expected" is null for replies that contain no usable JSON.
+
+Usage:
+    python benchmarks/bench_json_extract.py [--corpus benchmarks/corpus/failed_replies.jsonl] [--runs 200]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from resumecraftr.cli.utils.json import extract_json  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "failed_replies.jsonl")
+
+
+def legacy_extract(response):
+    """The greedy-regex extractor `clean_json_response` used before extract_json."""
+    try:
+        match = re.search(r"(\{.*\}|\[.*\])", response, re.DOTALL)
+        if match:
+            return json.loads(match.group(0))
+        return None
+    except json.JSONDecodeError:
+        return None
+
+
+def load_corpus(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def time_extractor(extract, replies, runs):
+    """Return the mean time in microseconds to extract one reply."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        for reply in replies:
+            extract(reply)
+    return (time.perf_counter() - start) / (runs * len(replies)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--runs", type=int, default=200)
+    options = parser.parse_args()
+
+    corpus = load_corpus(options.corpus)
+    extractors = {"legacy": legacy_extract, "extract_json": extract_json}
+
+    print(f"{'reply':<40} {'legacy':>8} {'extract_json':>13}")
+    correct = {name: 0 for name in extractors}
+    saved = 0
+    for case in corpus:
+        results = {}
+        for name, extract in extractors.items():
+            results[name] = extract(case["reply"]) == case["expected"]
+            correct[name] += results[name]
+        if results["extract_json"] and not results["legacy"]:
+            saved += 1
+        print(
+            f"{case['name']:<40} {'ok' if results['legacy'] else 'FAIL':>8} "
+            f"{'ok' if results['extract_json'] else 'FAIL':>13}"
+        )
+
+    replies = [case["reply"] for case in corpus]
+    print()
+    for name, extract in extractors.items():
+        print(
+            f"{name:<14} {correct[name]}/{len(corpus)} correct, "
+            f"{time_extractor(extract, replies, options.runs):.1f} us/reply"
+        )
+    print(f"OpenAI re-calls saved: {saved} of {len(corpus)} replies")
+    return 0 if correct["extract_json"] >= correct["legacy"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
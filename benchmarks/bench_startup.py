@@ -0,0 +1,96 @@
+"""
+Startup benchmark for the resumecraftr CLI.
+
+Runs local-only commands in fresh interpreters, reports their median wall time
+and, from `python -X importtime`, the modules that dominate import time.
+Startup depends on the machine, so there is no default target: compare the
+numbers before and after a change, or pass --target-ms to exit with status 1
+when a command misses a budget you chose for this machine.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--target-ms MS] [--top 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Commands that never talk to OpenAI. They run in an empty directory, so they
+# exercise startup and argument handling without needing a workspace.
+LOCAL_COMMANDS = [
+    ["--help"],
+    ["view-cv", "--help"],
+    ["view-cv", "missing-cv"],
+    ["add-job", "--help"],
+]
+
+
+def run_cli(args, cwd, extra_flags=()):
+    cmd = [sys.executable, *extra_flags, "-m", "resumecraftr.cli.main", *args]
+    return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+
+
+def time_command(args, cwd, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run_cli(args, cwd)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def top_imports(args, cwd, top):
+    """Return the (cumulative_us, module) pairs with the largest import cost."""
+    result = run_cli(args, cwd, ("-X", "importtime"))
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        entries.append((int(cumulative), module.strip()))
+    return sorted(entries, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--target-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    options = parser.parse_args()
+
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.environ["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [repo_root, os.environ.get("PYTHONPATH")])
+    )
+
+    baseline = None
+    failures = 0
+    with tempfile.TemporaryDirectory() as cwd:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], cwd=cwd)
+        baseline = (time.perf_counter() - start) * 1000
+        print(f"Bare interpreter startup: {baseline:.1f} ms\n")
+
+        for args in LOCAL_COMMANDS:
+            median_ms = time_command(args, cwd, options.runs)
+            line = f"resumecraftr {' '.join(args):<24} {median_ms:7.1f} ms  (+{median_ms - baseline:.1f} ms)"
+            if options.target_ms is not None:
+                status = "ok" if median_ms <= options.target_ms else "SLOW"
+                failures += status != "ok"
+                line += f"  [{status}]"
+            print(line)
+            for cumulative, module in top_imports(args, cwd, options.top):
+                print(f"    {cumulative / 1000:7.1f} ms  {module}")
+            print()
+
+    if options.target_ms is None:
+        return 0
+    print(f"Target: {options.target_ms:.0f} ms per local command; {failures} over target.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+# The API pulls in the OpenAI and pydantic stacks; load it on first use so
+# `import resumecraftr.cli.main` stays fast for commands that do not need it.
+_API_NAMES = ("ResumeCraftr", "ResumeCraftrError", "ParseResult", "TailorResult")
+
+__all__ = list(_API_NAMES)
+
+
+def __getattr__(name):
+    if name in _API_NAMES:
+        from resumecraftr import api
+
+        return getattr(api, name)
+    raise AttributeError(f"module 'resumecraftr' has no attribute {name!r}")
@@ -0,0 +1,880 @@
+"""
+Embeddable Python API for ResumeCraftr.
+
+Works on in-memory CV text, sections and job descriptions, never prompts, and
+returns structured results, so services can run many CVs in one process
+instead of shelling out to the CLI once per file::
+
+    from resumecraftr import ResumeCraftr
+
+    craftr = ResumeCraftr("cv-workspace")  # or ResumeCraftr() for the current workspace
+    parsed = craftr.parse(cv_text)
+    tailored = craftr.tailor(parsed.sections, job_description)
+    markdown = craftr.render(tailored.sections, job_description)
+    craftr.to_pdf(markdown, "resume.pdf")
+
+The click commands are thin wrappers over this module: they pick files, call
+these functions and write the results to the workspace.
+"""
+import os
+import json
+import importlib.resources
+import concurrent.futures
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from resumecraftr.cli.agent import (
+    MAX_CONCURRENT_PROMPTS,
+    create_or_get_agent,
+    execute_prompt,
+    non_interactive,
+    use_config,
+)
+from resumecraftr.cli.artifacts import content_hash, get_artifact_store, prompt_version
+from resumecraftr.cli.budget import (
+    DEFAULT_MODEL,
+    PATCH_OUTPUT_RATIO,
+    Plan,
+    estimate_call,
+    estimate_tokens,
+    fits,
+    model_limits,
+)
+from resumecraftr.cli.bullets import select_bullets
+from resumecraftr.cli.deadlines import PromptCancelled, PromptError, cancellation
+from resumecraftr.cli.extractors import extract_locally
+from resumecraftr.cli.prompts.pdf import MARKDOWN_PROMPT
+from resumecraftr.cli.prompts.resume import RAW_PROMPTS as RESUME_PROMPTS
+from resumecraftr.cli.prompts.sections import RAW_PROMPTS as SECTION_PROMPTS, STRUCTURED_PROMPT
+from resumecraftr.cli.repair import repair_retries
+from resumecraftr.cli.routing import Route, route_for
+from resumecraftr.cli.schemas import (
+    load_sections_config,
+    schema_text,
+    section_model,
+    section_shape,
+    section_specs,
+    structured_outputs_enabled,
+    tailored_patch_model,
+    tailored_section_model,
+)
+from resumecraftr.cli.section_prompt import SectionPrompt, merge_parts
+from resumecraftr.cli.store import DB_NAME, get_store
+from resumecraftr.cli.tracing import span, submit
+from resumecraftr.cli.utils.json import json_shape
+from resumecraftr.cli.workspace import config_file, use_workspace, workspace_path, workspace_root
+
+
+# Smallest tailoring task an array section is split into, in estimated tokens
+# of entries. Below it, entries share a prompt: each run has a fixed overhead.
+MIN_ENTRY_TOKENS = 300
+
+
+class ResumeCraftrError(Exception):
+    """Raised when an API call cannot produce its result."""
+
+
+@dataclass
+class ParseResult:
+    """
+    The sections extracted from a CV.
+
+    Attributes:
+        sections (dict): Section contents keyed by section name, in sections.json order.
+        failed (dict): Why each missing section could not be extracted, keyed by section name.
+        local (dict): The confidence of each section filled in without a model
+            call (see `extractors`), keyed by section name.
+    """
+
+    sections: dict
+    failed: dict = field(default_factory=dict)
+    local: dict = field(default_factory=dict)
+
+
+@dataclass
+class TailorResult:
+    """
+    A CV tailored to a job description.
+
+    Attributes:
+        sections (dict): The full CV: tailored sections, plus the input sections
+            that could not be tailored, unchanged.
+        tailored (dict): Only the sections that were tailored.
+        failed (dict): Why each section could not be tailored, keyed by section name.
+    """
+
+    sections: dict
+    tailored: dict
+    failed: dict = field(default_factory=dict)
+
+
+def prompt_template(config, name, default):
+    """
+    Return a prompt template, or its replacement from `prompts.<name>` in the
+    configuration. Names are a section name for the extraction prompts,
+    "structured_extraction", "optimize_resume" and "optimize_resume_structured".
+    """
+    return config.get("prompts", {}).get(name, default)
+
+
+def extraction_prompt(config, section_name, text_content, language):
+    """
+    Build the extraction prompt for one section of a CV.
+
+    Returns:
+        SectionPrompt | None: The prompt, or None if the section has no prompt.
+    """
+    model = section_model(section_name) if structured_outputs_enabled(config) else None
+    if model is None and section_name not in SECTION_PROMPTS:
+        return None
+
+    if model is not None:
+        instructions = prompt_template(config, "structured_extraction", STRUCTURED_PROMPT).format(
+            section=section_name,
+            language=language,
+            description=section_specs()[section_name].get("description", ""),
+        )
+        version = prompt_version(instructions + schema_text(model))
+    else:
+        translated_prompt = (
+            f"Extract the following section in {language}:\n\n"
+            + prompt_template(config, section_name, SECTION_PROMPTS[section_name])
+        )
+        instructions = (
+            translated_prompt.format(language=config.get("primary_language"))
+            .replace("{{", "{")
+            .replace("}}", "}")
+        )
+        version = prompt_version(instructions)
+
+    route = route_for(config, "extracted_section", section_name)
+    # Array sections are checked in their unwrapped form; the structured
+    # format still makes the model return {"entries": [...]}.
+    return SectionPrompt(
+        kind="extracted_section",
+        section=section_name,
+        prompt=instructions + "\n\n" + text_content,
+        structured=model is not None,
+        expected=section_shape(section_name),
+        inputs={
+            "section": section_name,
+            "cv": content_hash(text_content),
+            "prompt": version,
+            "model": route.model,
+            # Sampling and reply limits change the answer too.
+            "route": route.run_options(),
+        },
+        route=route,
+    )
+
+
+def _tailoring_payload(section_name, content, job_description):
+    return json.dumps(
+        {
+            "section_name": section_name,
+            "section_content": content,
+            "job_description": job_description,
+        },
+        indent=4,
+    )
+
+
+def tailoring_prompt(config, section_name, content, job_description):
+    """
+    Build the prompt that tailors one CV section to a job description.
+
+    With `"tailor_output": "patch"` in the configuration, the model is asked
+    for an RFC 6902 JSON Patch against the section instead of the whole
+    rewritten section, which is applied locally (see `SectionPrompt.complete`).
+
+    Returns:
+        SectionPrompt: The prompt with its expected shape and cache inputs.
+    """
+    if config.get("tailor_output", "full") == "patch" and content:
+        full = tailoring_prompt({**config, "tailor_output": "full"}, section_name, content, job_description)
+        instructions = prompt_template(
+            config, "optimize_resume_patch", RESUME_PROMPTS["optimize_resume_patch"]
+        ).format(language=config.get("primary_language"))
+        return replace(
+            full,
+            prompt=instructions + "\n\n" + _tailoring_payload(section_name, content, job_description),
+            inputs={
+                **full.inputs,
+                "prompt": prompt_version(
+                    instructions
+                    + (schema_text(tailored_patch_model(section_name)) if full.structured else "")
+                ),
+            },
+            patch_base=content,
+            fallback_prompt=full.prompt,
+        )
+
+    model = (
+        tailored_section_model(section_name) if structured_outputs_enabled(config) else None
+    )
+    prompt_name = "optimize_resume" if model is None else "optimize_resume_structured"
+    instructions = prompt_template(config, prompt_name, RESUME_PROMPTS[prompt_name]).format(
+        language=config.get("primary_language")
+    )
+    prompt = instructions + "\n\n" + _tailoring_payload(section_name, content, job_description)
+    # Rule 1 of the prompt: the rewritten section keeps the input's structure.
+    # With structured outputs the schema defines that structure instead.
+    expected = {
+        "section_name": "string",
+        "section_content": (
+            json_shape(content) if model is None else section_shape(section_name)
+        ),
+    }
+    route = route_for(config, "optimized_section", section_name)
+    return SectionPrompt(
+        kind="optimized_section",
+        section=section_name,
+        prompt=prompt,
+        structured=model is not None,
+        expected=expected,
+        inputs={
+            "section": section_name,
+            "content": content_hash(content),
+            "job": content_hash(job_description),
+            "prompt": prompt_version(
+                instructions + (schema_text(model) if model is not None else "")
+            ),
+            "model": route.model,
+            # Sampling and reply limits change the answer too.
+            "route": route.run_options(),
+        },
+        route=route,
+    )
+
+
+def _split_text(text):
+    """Split a text in two at the line (or else the space) nearest its middle."""
+    middle = len(text) // 2
+    for separator in ("\n", " "):
+        before, after = text.rfind(separator, 0, middle), text.find(separator, middle)
+        candidates = [i for i in (before, after) if 0 < i < len(text) - 1]
+        if candidates:
+            cut = min(candidates, key=lambda i: abs(i - middle))
+            return text[:cut], text[cut + 1 :]
+    return None
+
+
+def _split_entries(content):
+    if not isinstance(content, list) or len(content) < 2:
+        return None
+    middle = len(content) // 2
+    return content[:middle], content[middle:]
+
+
+def _fit(config, build, payload, split):
+    """
+    Build the prompts for a payload, halving it until every prompt fits the model.
+
+    Args:
+        build (callable): payload -> (SectionPrompt, CallEstimate).
+        split (callable): payload -> its two halves, or None if it cannot be split.
+
+    Returns:
+        list: (SectionPrompt, CallEstimate) pairs, in payload order. A part that
+        cannot be split further is returned even if it does not fit.
+    """
+    section_prompt, call = build(payload)
+    halves = None if fits(config, call) else split(payload)
+    if halves is None:
+        return [(section_prompt, call)]
+    return _fit(config, build, halves[0], split) + _fit(config, build, halves[1], split)
+
+
+def extraction_parts(config, section_name, text_content, language):
+    """
+    Build the extraction prompts for one section, splitting the CV text when
+    one prompt would not fit the model.
+
+    Returns:
+        list: (SectionPrompt, CallEstimate) pairs; empty if the section has no prompt.
+    """
+    if extraction_prompt(config, section_name, "", language) is None:
+        return []
+
+    def build(text):
+        section_prompt = extraction_prompt(config, section_name, text, language)
+        return section_prompt, estimate_call(
+            section_prompt.kind,
+            section_name,
+            section_prompt.prompt,
+            text,
+            route=section_prompt.route,
+        )
+
+    return _fit(config, build, text_content, _split_text)
+
+
+def _group_entries(content, min_tokens):
+    """
+    Group consecutive array entries into tasks of at least `min_tokens` each.
+
+    A trailing group smaller than that joins the one before it, so a short
+    array stays a single task.
+    """
+    groups, current, size = [], [], 0
+    for entry in content:
+        current.append(entry)
+        size += estimate_tokens(json.dumps(entry, ensure_ascii=False))
+        if size >= min_tokens:
+            groups.append(current)
+            current, size = [], 0
+    if current:
+        if groups:
+            groups[-1].extend(current)
+        else:
+            groups.append(current)
+    return groups
+
+
+def tailoring_parts(config, section_name, content, job_description):
+    """
+    Build the tailoring prompts for one section.
+
+    Array sections are fanned out: their entries are grouped into tasks of
+    at least `min_entry_tokens` (resumecraftr.json, default
+    MIN_ENTRY_TOKENS) that run alongside the other sections, and a group
+    that would still not fit the model is halved.
+
+    Returns:
+        list: (SectionPrompt, CallEstimate) pairs, in entry order.
+    """
+
+    def build(part):
+        section_prompt = tailoring_prompt(config, section_name, part, job_description)
+        return section_prompt, estimate_call(
+            section_prompt.kind,
+            section_name,
+            section_prompt.prompt,
+            json.dumps(part, ensure_ascii=False),
+            route=section_prompt.route,
+            output_ratio=PATCH_OUTPUT_RATIO if section_prompt.patch_base is not None else None,
+        )
+
+    if not isinstance(content, list) or not content:
+        return _fit(config, build, content, _split_entries)
+    min_tokens = config.get("min_entry_tokens", MIN_ENTRY_TOKENS)
+    return [
+        part
+        for group in _group_entries(content, min_tokens)
+        for part in _fit(config, build, group, _split_entries)
+    ]
+
+
+def markdown_call(prompt, cv_sections, route=None):
+    """Estimate the call that renders a CV as Markdown."""
+    return estimate_call(
+        "markdown", "", prompt, json.dumps(cv_sections, ensure_ascii=False), route=route
+    )
+
+
+def run_section_prompt(config, section_prompt):
+    """
+    Answer a section prompt from the artifact cache, or with OpenAI on a miss.
+
+    Returns:
+        dict | list | None: The section content, or None if the reply was
+        still broken after the repair attempts.
+    """
+    with span("section", section=section_prompt.section):
+        stored = get_artifact_store().fetch_or_compute(
+            section_prompt.kind,
+            section_prompt.inputs,
+            lambda: section_prompt.run(repair_retries(config)),
+            enabled=config.get("artifact_cache", True),
+        )
+    return json.loads(stored) if stored is not None else None
+
+
+def _run_parts(config, parts_by_section, on_done):
+    """
+    Run the prompts of several sections in parallel.
+
+    Parts of every section share one pool sized to the process's prompt
+    limit, so the entries of a long section run alongside the short ones.
+
+    Args:
+        parts_by_section (dict): (SectionPrompt, CallEstimate) pairs keyed by section name.
+        on_done (callable): Called as `on_done(name, content, error)` once every
+            part of a section has finished, with the parts merged in order;
+            content is None when error is set.
+
+    A part whose run fails, whose request fails (rate limit, connection
+    reset; see `execute_prompt`) or that misses its deadline fails its section only.
+    On an exception such as Ctrl+C, the runs still in flight are cancelled.
+    A cancelled command (for example, a daemon client that went away) raises
+    PromptCancelled instead of failing its sections one by one.
+    """
+    # Longest replies first, so the slowest parts do not start last.
+    tasks = sorted(
+        (
+            (call.output_tokens, name, index, section_prompt)
+            for name, parts in parts_by_section.items()
+            for index, (section_prompt, call) in enumerate(parts)
+        ),
+        key=lambda task: task[0],
+        reverse=True,
+    )
+    replies = {name: [None] * len(parts) for name, parts in parts_by_section.items()}
+    errors = {}
+    remaining = {name: len(parts) for name, parts in parts_by_section.items()}
+    with span("fan_out"), cancellation() as cancel, concurrent.futures.ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_PROMPTS
+    ) as executor:
+        try:
+            future_to_part = {}
+            for _, name, index, section_prompt in tasks:
+                future = submit(executor, run_section_prompt, config, section_prompt)
+                future_to_part[future] = (name, index)
+
+            for future in concurrent.futures.as_completed(future_to_part):
+                name, index = future_to_part[future]
+                try:
+                    replies[name][index] = future.result()
+                except PromptCancelled:
+                    raise
+                except PromptError as e:
+                    errors[name] = str(e)
+                remaining[name] -= 1
+                if remaining[name]:
+                    continue
+                kind = parts_by_section[name][0][0].kind
+                contents = replies[name]
+                if name in errors:
+                    on_done(name, None, errors[name])
+                elif None in contents:
+                    on_done(name, None, "the reply is not valid JSON")
+                else:
+                    merged = merge_parts(kind, contents)
+                    if merged is None:
+                        on_done(name, None, "a part of the reply lost its entries")
+                    else:
+                        on_done(name, merged, None)
+        except BaseException:
+            # Stop the runs still polling before the pool waits for them.
+            cancel.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def extract_sections(config, text_content, section_names, language, on_section=None):
+    """
+    Extract CV sections from plain text in parallel.
+
+    Sections whose prompt would not fit the model are extracted from parts of
+    the text and merged. Sections the local extractors are confident about
+    are filled in without a model call.
+
+    Args:
+        config (dict): The workspace configuration.
+        text_content (str): The CV text.
+        section_names (list): The sections to extract.
+        language (str): The language to extract them in.
+        on_section (callable, optional): Called as `on_section(name, content, error)`
+            as each section finishes; content is None when error is set.
+
+    Returns:
+        ParseResult: The extracted sections, in the order of section_names.
+    """
+    results, failed = {}, {}
+    parts_by_section = {}
+    local = extract_locally(config, text_content, section_names, language)
+    for name in section_names:
+        if name in local:
+            results[name] = local[name].content
+            if on_section is not None:
+                on_section(name, results[name], None)
+            continue
+        parts = extraction_parts(config, name, text_content, language)
+        if not parts:
+            failed[name] = "no prompt found for this section"
+            if on_section is not None:
+                on_section(name, None, failed[name])
+        else:
+            parts_by_section[name] = parts
+
+    def done(name, content, error):
+        if error is not None:
+            failed[name] = error
+        else:
+            results[name] = content
+        if on_section is not None:
+            on_section(name, content, failed.get(name))
+
+    _run_parts(config, parts_by_section, done)
+    return ParseResult(
+        sections={name: results[name] for name in section_names if name in results},
+        failed=failed,
+        local={name: extraction.confidence for name, extraction in local.items()},
+    )
+
+
+def tailor_sections(config, sections_content, job_description, cache=None, on_section=None):
+    """
+    Optimize every CV section against a job description in parallel.
+
+    Args:
+        config (dict): The workspace configuration.
+        sections_content (dict): The extracted CV sections, keyed by section name.
+        job_description (str): The job description text.
+        cache (dict, optional): In-memory results from previous calls, keyed by
+            section content and job description. Sections found here are not
+            sent to OpenAI again; new results are stored in it.
+        on_section (callable, optional): Called as `on_section(name, content, error)`
+            as each section finishes.
+
+    With `top_bullets` set in the configuration, each Work Experience entry
+    only sends its most relevant bullets from the workspace's bullet bank.
+    Array sections are tailored in parts (see `tailoring_parts`) and
+    reassembled in their original order.
+
+    Returns:
+        TailorResult: The tailored sections, in the order of sections_content.
+        Sections that failed keep their original content, all bullets included.
+    """
+    optimized_resume, failed = {}, {}
+    keys, parts_by_section = {}, {}
+    selected = select_bullets(sections_content, job_description, config.get("top_bullets"))
+
+    for section, content in selected.items():
+        key = (section, json.dumps(content, sort_keys=True), job_description)
+        if cache is not None and key in cache:
+            optimized_resume[section] = cache[key]
+        else:
+            keys[section] = key
+            parts_by_section[section] = tailoring_parts(
+                config, section, content, job_description
+            )
+
+    def done(section_name, result, error):
+        if error is not None:
+            failed[section_name] = error
+        else:
+            optimized_resume[section_name] = result
+            if cache is not None:
+                cache[keys[section_name]] = result
+        if on_section is not None:
+            on_section(section_name, result, failed.get(section_name))
+
+    _run_parts(config, parts_by_section, done)
+
+    tailored = {
+        name: optimized_resume[name] for name in sections_content if name in optimized_resume
+    }
+    merged = {name: tailored.get(name, content) for name, content in sections_content.items()}
+    return TailorResult(sections=merged, tailored=tailored, failed=failed)
+
+
+def plan_calls(config, parts, batch=False):
+    """
+    Summarize what a set of prompts would cost, marking the ones already cached.
+
+    Args:
+        config (dict): The workspace configuration.
+        parts (list): (SectionPrompt, CallEstimate) pairs; only the prompts'
+            kind and inputs are used.
+        batch (bool, optional): Price the calls for the Batch API.
+
+    Returns:
+        Plan: The estimates, without calling OpenAI.
+    """
+    artifact_store = get_artifact_store()
+    use_cache = config.get("artifact_cache", True)
+    calls = []
+    for section_prompt, call in parts:
+        call.cached = use_cache and artifact_store.contains(section_prompt.kind, section_prompt.inputs)
+        calls.append(call)
+    return Plan(
+        calls=calls,
+        limits=model_limits(config),
+        concurrency=MAX_CONCURRENT_PROMPTS,
+        batch=batch,
+        routed={call.model: model_limits(config, call.model) for call in calls if call.model},
+    )
+
+
+def markdown_inputs(template, cv_sections, job_description, language, tailored_cv=None, custom="None", route=None):
+    """Return the provenance of a generated Markdown document sent with `route`."""
+    route = route or Route()
+    return {
+        "sections": content_hash(cv_sections),
+        "job": content_hash(job_description),
+        "template": content_hash(template),
+        "custom": content_hash(custom),
+        "tailored": content_hash(tailored_cv),
+        "prompt": prompt_version(MARKDOWN_PROMPT),
+        "model": route.model,
+        "route": route.run_options(),
+        "language": language,
+    }
+
+
+def markdown_prompt(template, cv_sections, job_description, language, tailored_cv=None, custom="None"):
+    """Build the prompt that renders CV sections as Markdown."""
+    return MARKDOWN_PROMPT.format(
+        template=template,
+        cv_sections=json.dumps(cv_sections, indent=2),
+        job_description=job_description,
+        tailored_cv=json.dumps(tailored_cv, indent=2) if tailored_cv else "None",
+        language=language,
+        custom=custom,
+    )
+
+
+def generate_markdown(
+    template,
+    cv_sections,
+    job_description,
+    language,
+    tailored_cv=None,
+    custom="None",
+    route=None,
+    use_cache=True,
+    on_delta=None,
+    config=None,
+):
+    """
+    Ask OpenAI to render the CV sections as an Eisvogel-compatible Markdown document.
+    A document previously generated from the same inputs is reused unless use_cache is False.
+    The call is sent with `route` (see `routing.route_for`), by default the assistant's model.
+    With `on_delta`, the reply is streamed to it as it is generated (see `execute_prompt`).
+    The prompt is checked against the token limits of `config` (see `budget.model_limits`).
+
+    Returns:
+        str: The generated Markdown, or an empty string when OpenAI returned nothing.
+
+    Raises:
+        ResumeCraftrError: If the prompt would not fit the model's context.
+    """
+    route = route or Route()
+    prompt = markdown_prompt(template, cv_sections, job_description, language, tailored_cv, custom)
+    if not fits(config or {}, markdown_call(prompt, cv_sections, route)):
+        raise ResumeCraftrError(
+            f"The CV and job description are too long for "
+            f"{route.model or (config or {}).get('chat_gpt', {}).get('model') or DEFAULT_MODEL}; "
+            "shorten the job description or use a model with a larger context."
+        )
+    markdown_content = get_artifact_store().fetch_or_compute(
+        "markdown",
+        markdown_inputs(template, cv_sections, job_description, language, tailored_cv, custom, route),
+        lambda: execute_prompt(prompt, route=route, on_delta=on_delta).strip() or None,
+        enabled=use_cache,
+    )
+    return markdown_content or ""
+
+
+class ResumeCraftr:
+    """
+    Parse, tailor and render CVs in-process.
+
+    Settings (model, language, structured outputs, repair retries, backend,
+    timeout, hedging, base_url) are read from the workspace's resumecraftr.json
+    unless a config dict is given, in which case the file is not needed.
+    Results are shared with the CLI through the workspace's artifact cache, so
+    repeated calls with the same inputs do not call OpenAI again.
+
+    Instances for different workspaces can be used from many threads at once;
+    they share the OpenAI client of each server, the limit on concurrent prompts and an
+    in-memory cache of recent results.
+
+    Args:
+        workspace (str, optional): The workspace directory. Defaults to the
+            current one (see `resumecraftr.cli.workspace.workspace_root`).
+        config (dict, optional): Settings to use instead of resumecraftr.json.
+        use_cache (bool, optional): Reuse and store results in the artifact cache.
+            Defaults to the workspace's `artifact_cache` setting, or True.
+
+    Raises:
+        ResumeCraftrError: If no config is given and the workspace has neither
+            a resumecraftr.json nor a resumecraftr.db.
+    """
+
+    def __init__(self, workspace: str = None, config: dict = None, use_cache: bool = None):
+        self.workspace = workspace or workspace_root()
+        if config is None:
+            with use_workspace(self.workspace):
+                if not os.path.exists(config_file()) and not os.path.exists(workspace_path(DB_NAME)):
+                    raise ResumeCraftrError(
+                        f"{self.workspace} is not a ResumeCraftr workspace: run 'resumecraftr setup' "
+                        "there or pass a config."
+                    )
+                config = get_store().load_config()
+        self.config = dict(config)
+        if use_cache is not None:
+            self.config["artifact_cache"] = use_cache
+
+    @property
+    def language(self) -> str:
+        return self.config.get("primary_language", "EN")
+
+    @contextmanager
+    def _scope(self):
+        # Every call runs in this instance's workspace and with its settings,
+        # which reach execute_prompt, the backend and the OpenAI client.
+        with use_workspace(self.workspace), use_config(self.config), non_interactive():
+            yield
+
+    def _connect(self):
+        # Resolve the client and assistant before fanning out, so threads do
+        # not race to create them. A missing API key raises instead of prompting.
+        from openai import OpenAIError
+
+        chat_config = self.config.get("chat_gpt", {})
+        uses_assistant = chat_config.get("backend", "assistants") == "assistants"
+        if uses_assistant and not chat_config.get("model"):
+            raise ResumeCraftrError(
+                f"No OpenAI assistant can be set up for {self.workspace} without chat_gpt.model: "
+                "run 'resumecraftr setup' there or pass a config with chat_gpt settings."
+            )
+        with self._scope():
+            try:
+                assistant = create_or_get_agent()
+            except OpenAIError as e:
+                raise ResumeCraftrError(f"Could not connect to OpenAI: {e}") from e
+        if assistant is None and uses_assistant:
+            raise ResumeCraftrError(f"No OpenAI assistant could be set up for {self.workspace}.")
+
+    def parse(self, text: str, sections: list = None, language: str = None, on_section=None) -> ParseResult:
+        """
+        Extract structured sections from CV text.
+
+        Args:
+            text (str): The CV as plain text.
+            sections (list, optional): Section names to extract. Defaults to every
+                section in sections.json.
+            language (str, optional): Output language. Defaults to the workspace language.
+            on_section (callable, optional): Progress callback, see `extract_sections`.
+
+        Returns:
+            ParseResult: The extracted sections and the ones that failed.
+
+        Raises:
+            ResumeCraftrError: If no assistant can be set up for the workspace.
+        """
+        if sections is None:
+            sections = [spec["name"] for spec in load_sections_config().get("sections", [])]
+        self._connect()
+        with self._scope():
+            return extract_sections(
+                self.config, text, sections, language or self.language, on_section=on_section
+            )
+
+    def tailor(self, sections: dict, job_description: str, cache: dict = None, on_section=None) -> TailorResult:
+        """
+        Rewrite CV sections for a job description.
+
+        Args:
+            sections (dict): The CV sections, as returned by `parse`.
+            job_description (str): The job description text.
+            cache (dict, optional): In-memory results shared between calls, see
+                `tailor_sections`.
+            on_section (callable, optional): Progress callback, see `tailor_sections`.
+
+        Returns:
+            TailorResult: The tailored CV and the sections that failed.
+
+        Raises:
+            ResumeCraftrError: If no assistant can be set up for the workspace.
+        """
+        self._connect()
+        with self._scope():
+            return tailor_sections(
+                self.config, sections, job_description, cache=cache, on_section=on_section
+            )
+
+    def _read_workspace_file(self, name):
+        path = os.path.join(self.workspace, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def render(
+        self,
+        sections: dict,
+        job_description: str = "",
+        language: str = None,
+        template: str = None,
+        tailored_cv: dict = None,
+        custom: str = None,
+        on_delta=None,
+    ) -> str:
+        """
+        Render CV sections as a Markdown document ready for Pandoc.
+
+        Args:
+            sections (dict): The CV sections, usually `TailorResult.sections`.
+            job_description (str, optional): The job the CV targets.
+            language (str, optional): Output language. Defaults to the workspace language.
+            template (str, optional): The Markdown template. Defaults to the
+                workspace's resume_template.md, or the bundled one.
+            tailored_cv (dict, optional): An earlier tailored CV to take into account.
+            custom (str, optional): Extra instructions. Defaults to the workspace's custom.md.
+            on_delta (callable, optional): Called with each piece of the document as
+                it is generated; not called when a stored document is reused. See
+                `markdown_stream.MarkdownStream`.
+
+        Returns:
+            str: The Markdown document.
+
+        Raises:
+            ResumeCraftrError: If OpenAI returned no document or the call failed.
+        """
+        if template is None:
+            template = self._read_workspace_file("resume_template.md")
+        if template is None:
+            template = (
+                importlib.resources.files("resumecraftr.templates")
+                .joinpath("resume_template.md")
+                .read_text(encoding="utf-8")
+            )
+        if custom is None:
+            custom = (self._read_workspace_file("custom.md") or "").strip() or "None"
+
+        self._connect()
+        with self._scope():
+            try:
+                markdown_content = generate_markdown(
+                    template,
+                    sections,
+                    job_description,
+                    language or self.language,
+                    tailored_cv=tailored_cv,
+                    custom=custom,
+                    route=route_for(self.config, "markdown"),
+                    use_cache=self.config.get("artifact_cache", True),
+                    on_delta=on_delta,
+                    config=self.config,
+                )
+            except PromptError as e:
+                raise ResumeCraftrError(str(e)) from e
+        if not markdown_content.strip():
+            raise ResumeCraftrError("OpenAI did not return a valid Markdown document.")
+        return markdown_content
+
+    def to_pdf(self, markdown: str, pdf_file: str) -> str:
+        """
+        Compile a Markdown document to PDF with Pandoc.
+
+        The Markdown is written next to the PDF, with the same name and a .md extension.
+
+        Returns:
+            str: The path of the PDF.
+
+        Raises:
+            ResumeCraftrError: If Pandoc is not installed or the conversion fails.
+        """
+        from resumecraftr.cli.cmd.export_pdf import check_pandoc, convert_markdown_to_pdf
+
+        if not check_pandoc():
+            raise ResumeCraftrError("Pandoc is not installed.")
+        md_file = os.path.splitext(pdf_file)[0] + ".md"
+        with open(md_file, "w", encoding="utf-8") as f:
+            f.write(markdown)
+        result = convert_markdown_to_pdf(md_file, pdf_file)
+        if result.returncode != 0:
+            raise ResumeCraftrError(result.stderr)
+        return pdf_file
@@ -2,53 +2,189 @@ import os
 import glob
 import time
 import json
-from dotenv import load_dotenv
-from openai import OpenAI
-from openai import OpenAIError
+import threading
+import contextvars
+import concurrent.futures
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
 from rich.console import Console
-from rich.progress import Progress
-from rich.prompt import Prompt
+from resumecraftr.cli import deadlines
+from resumecraftr.cli.deadlines import PromptCancelled, PromptError, PromptTimeout
+from resumecraftr.cli.tracing import span, submit
+from resumecraftr.cli.workspace import config_file, workspace_root
 
-load_dotenv()
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
+# The OpenAI SDK, python-dotenv and rich.prompt are imported where they are
+# used: importing the SDK alone takes most of a second, and commands that
+# never talk to OpenAI should not pay for it.
 
 console = Console()
-CV_WORKSPACE = "cv-workspace"
 SUPPORTED_EXTENSIONS = (".md", ".txt", ".doc", ".docx", ".pdf")
-CONFIG_FILE = "cv-workspace/resumecraftr.json"
+AGENT_INSTRUCTIONS = "Process resumes with ATS optimization techniques."
+
+# Assistants resolved during this process, keyed by client options (see
+# `client_options`) and agent name. Long-running commands such as `watch` call
+# create_or_get_agent on every rebuild, so the assistants listing is only paid once.
+_AGENT_CACHE = {}
+_AGENT_CACHE_LOCK = threading.Lock()
+
+# Prompts running at once in this process, across all workspaces and threads.
+# Every workspace fans its sections out in parallel, so without a shared limit
+# a service processing many CVs would open hundreds of runs at a time.
+MAX_CONCURRENT_PROMPTS = int(os.environ.get("RESUMECRAFTR_MAX_CONCURRENT_PROMPTS", "16"))
+_PROMPT_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_PROMPTS)
+
+# Run statuses that are still changing; every other status is final.
+ACTIVE_RUN_STATUSES = ("queued", "in_progress", "cancelling")
+POLL_INTERVAL = 1.0
+# Seconds one prompt may take unless chat_gpt.timeout says otherwise.
+DEFAULT_CALL_TIMEOUT = 300
+# Latencies of recent prompts, for the hedging threshold.
+HEDGE_MIN_SAMPLES = 20
+_LATENCIES = deque(maxlen=200)
+_LATENCIES_LOCK = threading.Lock()
+
+# False while the embeddable API (resumecraftr.api) is running: progress
+# messages are not printed and a missing API key raises instead of prompting.
+_interactive = contextvars.ContextVar("resumecraftr_interactive", default=True)
+
+
+# Settings given to `ResumeCraftr(config=...)`, used instead of the
+# workspace's resumecraftr.json while set.
+_config = contextvars.ContextVar("resumecraftr_config", default=None)
+
+
+@contextmanager
+def use_config(config):
+    """Read settings from `config` instead of resumecraftr.json; None keeps the current ones."""
+    if config is None:
+        yield
+        return
+    token = _config.set(config)
+    try:
+        yield
+    finally:
+        _config.reset(token)
+
+
+def current_config():
+    """
+    Return the settings in use: those of `use_config`, else the workspace's
+    resumecraftr.json.
+
+    Returns:
+        dict: The settings, or None when there are none.
+    """
+    config = _config.get()
+    if config is not None:
+        return config
+    if not os.path.exists(config_file()):
+        return None
+    with open(config_file(), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def is_interactive() -> bool:
+    """Return False inside `non_interactive()`."""
+    return _interactive.get()
+
+
+@contextmanager
+def non_interactive():
+    """Run without progress messages or prompts, for callers embedding ResumeCraftr."""
+    token = _interactive.set(False)
+    try:
+        yield
+    finally:
+        _interactive.reset(token)
+
 
 class OpenAIClientSingleton:
+    # One client per set of client options (see client_options), so workspaces
+    # and configs pointing at different servers each get their own. Commands
+    # warm the client up in a background thread (see warmup.py) while the
+    # foreground may ask for it too: the lock makes the second caller wait for
+    # the first instead of creating another client.
     _instance = None
-    _client = None
+    _clients = {}
+    _env_loaded = False
+    _lock = threading.Lock()
 
     @classmethod
     def get_instance(cls):
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
 
     def get_client(self):
-        if self._client is None:
-            try:
-                self._client = OpenAI()
-                # Test the client with a simple API call
-                self._client.models.list()
-            except OpenAIError as e:
-                if "api_key" in str(e).lower():
-                    console.print("[bold red]Error: OpenAI API key not found or invalid.[/bold red]")
-                    api_key = Prompt.ask("[bold yellow]Please enter your OpenAI API key[/bold yellow]")
-                    os.environ["OPENAI_API_KEY"] = api_key
-                    # Try again with the new key
-                    try:
-                        self._client = OpenAI()
-                        self._client.models.list()
-                        console.print("[bold green]Successfully connected to OpenAI with the new API key![/bold green]")
-                    except OpenAIError as retry_error:
-                        console.print(f"[bold red]Error: Still unable to connect to OpenAI: {str(retry_error)}[/bold red]")
-                        raise
-                else:
-                    console.print(f"[bold red]Error connecting to OpenAI: {str(e)}[/bold red]")
+        if not self._env_loaded:
+            from dotenv import load_dotenv
+
+            # The .env file may hold OPENAI_API_KEY, which client_options reads.
+            load_dotenv()
+            OpenAIClientSingleton._env_loaded = True
+        options = client_options()
+        key = json.dumps(options, sort_keys=True)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    with span("openai.client"):
+                        client = self._create_client(options)
+                    # Only a working client is kept, so a failed warm-up is retried.
+                    self._clients[key] = client
+        return client
+
+    def _create_client(self, options):
+        from openai import OpenAI, OpenAIError
+        from rich.prompt import Prompt
+
+        try:
+            client = OpenAI(**options)
+            # Test the client with a simple API call
+            client.models.list()
+            return client
+        except OpenAIError as e:
+            if "api_key" in str(e).lower() and is_interactive():
+                console.print("[bold red]Error: OpenAI API key not found or invalid.[/bold red]")
+                api_key = Prompt.ask("[bold yellow]Please enter your OpenAI API key[/bold yellow]")
+                os.environ["OPENAI_API_KEY"] = api_key
+                # Try again with the new key
+                try:
+                    client = OpenAI(**options)
+                    client.models.list()
+                    console.print("[bold green]Successfully connected to OpenAI with the new API key![/bold green]")
+                    return client
+                except OpenAIError as retry_error:
+                    console.print(f"[bold red]Error: Still unable to connect to OpenAI: {str(retry_error)}[/bold red]")
                     raise
-        return self._client
+            else:
+                if is_interactive():
+                    console.print(f"[bold red]Error connecting to OpenAI: {str(e)}[/bold red]")
+                raise
+
+def client_options() -> dict:
+    """
+    Return extra OpenAI client arguments from the settings in use (see `current_config`).
+
+    `chat_gpt.base_url` points the client at another OpenAI-compatible server,
+    such as llama.cpp, vLLM or a local stand-in for testing. Without it, the
+    SDK default (or the OPENAI_BASE_URL environment variable) is used. Local
+    servers usually need no API key, so OPENAI_API_KEY is optional with a
+    base_url.
+    """
+    options = {}
+    base_url = (current_config() or {}).get("chat_gpt", {}).get("base_url")
+    if base_url:
+        options["base_url"] = base_url
+    if (options or os.environ.get("OPENAI_BASE_URL")) and not os.environ.get("OPENAI_API_KEY"):
+        options["api_key"] = "local"
+    return options
 
 def get_openai_client():
     """Get an initialized OpenAI client using the Singleton pattern."""
@@ -74,6 +210,9 @@ def delete_all_resumecraftr_agents():
         for agent in matching_agents:
             console.print(f"[bold yellow]Deleting agent '{agent.name}'...[/bold yellow]")
             client.beta.assistants.delete(assistant_id=agent.id)
+            with _AGENT_CACHE_LOCK:
+                for key in [key for key in _AGENT_CACHE if key[1] == agent.name]:
+                    del _AGENT_CACHE[key]
             console.print(f"[bold green]Agent '{agent.name}' successfully deleted![/bold green]")
 
     except Exception as e:
@@ -112,14 +251,15 @@ def load_supported_files(directory: str) -> list:
     Returns:
         list: A list of file paths.
     """
-    console.print(f"[bold blue]Loading documents from '{directory}'...[/bold blue]")
+    if is_interactive():
+        console.print(f"[bold blue]Loading documents from '{directory}'...[/bold blue]")
     files = []
     for ext in SUPPORTED_EXTENSIONS:
         files.extend(glob.glob(f"{directory}/**/*{ext}", recursive=True))
     return files
 
 def upload_files_to_vector_store(
-    vector_store_id: str, progress: Progress = None, task=None
+    vector_store_id: str, progress: "Progress" = None, task=None
 ):
     """
     Upload all supported files to the specified vector store.
@@ -133,10 +273,11 @@ def upload_files_to_vector_store(
         None
     """
     client = get_openai_client()
-    files = load_supported_files(CV_WORKSPACE)
+    files = load_supported_files(workspace_root())
 
     if not files:
-        console.print("[bold yellow]No supported files found to upload.[/bold yellow]")
+        if is_interactive():
+            console.print("[bold yellow]No supported files found to upload.[/bold yellow]")
         return
 
     file_streams = [open(file, "rb") for file in files]
@@ -148,59 +289,84 @@ def upload_files_to_vector_store(
         status_message = f"{file_batch.status}..."
         if progress and task:
             progress.update(task, description=status_message)
-        else:
+        elif is_interactive():
             console.print(f"[bold yellow]{status_message}[/bold yellow]")
         time.sleep(1)
 
-    console.print(
-        f"[bold green]Files uploaded successfully to vector store '{vector_store_id}'.[/bold green]"
-    )
+    if is_interactive():
+        console.print(
+            f"[bold green]Files uploaded successfully to vector store '{vector_store_id}'.[/bold green]"
+        )
 
 def create_or_get_agent(name=None):
     """
     Create or retrieve an assistant for document processing.
 
+    With a local backend (see `backends`) there are no assistants: only the
+    client is set up, None is returned and no workspace file is uploaded.
+
     Args:
         name (str, optional): The name of the agent. Defaults to None.
 
     Returns:
-        assistant: The created or retrieved assistant.
+        assistant: The created or retrieved assistant; None without settings
+            (see `current_config`).
     """
-    if not os.path.exists(CONFIG_FILE):
-        console.print(
-            "[bold red]Configuration file not found. Run 'resumecraftr init' first.[/bold red]"
-        )
+    config = current_config()
+    if config is None:
+        if is_interactive():
+            console.print(
+                "[bold red]Configuration file not found. Run 'resumecraftr init' first.[/bold red]"
+            )
         return
 
-    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-        config = json.load(f)
+    if config.get("chat_gpt", {}).get("backend", "assistants") != "assistants":
+        get_openai_client()
+        return None
 
     agent_name = "ResumeCraftr Agent" if name is None else name
-    
+    key = (json.dumps(client_options(), sort_keys=True), agent_name)
+
+    with span("create_or_get_agent"), _AGENT_CACHE_LOCK:
+        if key in _AGENT_CACHE:
+            return _AGENT_CACHE[key]
+        assistant = _resolve_agent(config, agent_name)
+        if assistant is not None:
+            _AGENT_CACHE[key] = assistant
+        return assistant
+
+
+def _resolve_agent(config, agent_name):
+    """Look up the assistant by name on OpenAI, creating it if missing."""
     # Only initialize OpenAI client when needed
     client = get_openai_client()
 
-    assistants = client.beta.assistants.list()
+    with span("assistants.list"):
+        assistants = client.beta.assistants.list()
     for assistant in assistants.data:
         if assistant.name == agent_name:
             return assistant
 
-    console.print(
-        f"[bold yellow]Agent '{agent_name}' not exists, creating.[/bold yellow]"
-    )
+    if is_interactive():
+        console.print(
+            f"[bold yellow]Agent '{agent_name}' not exists, creating.[/bold yellow]"
+        )
 
-    vector_store = client.beta.vector_stores.create(name=f"{agent_name} Docs")
+    with span("vector_stores.create"):
+        vector_store = client.beta.vector_stores.create(name=f"{agent_name} Docs")
     if agent_name == "ResumeCraftr Agent":
-        upload_files_to_vector_store(vector_store.id)
-
-    assistant = client.beta.assistants.create(
-        instructions="Process resumes with ATS optimization techniques.",
-        name=agent_name,
-        tools=[{"type": "file_search"}],
-        model=config["chat_gpt"]["model"],
-        temperature=config["chat_gpt"]["temperature"],
-        top_p=config["chat_gpt"]["top_p"],
-    )
+        with span("vector_stores.upload"):
+            upload_files_to_vector_store(vector_store.id)
+
+    with span("assistants.create"):
+        assistant = client.beta.assistants.create(
+            instructions=AGENT_INSTRUCTIONS,
+            name=agent_name,
+            tools=[{"type": "file_search"}],
+            model=config["chat_gpt"]["model"],
+            temperature=config["chat_gpt"]["temperature"],
+            top_p=config["chat_gpt"]["top_p"],
+        )
 
     if agent_name == "ResumeCraftr Agent":
         client.beta.assistants.update(
@@ -208,48 +374,318 @@ def create_or_get_agent(name=None):
             tool_resources={"file_search": {"vector_store_ids": [vector_store.id]}},
         )
 
-    console.print(
-        f"[bold green]Agent '{agent_name}' created successfully.[/bold green]"
-    )
+    if is_interactive():
+        console.print(
+            f"[bold green]Agent '{agent_name}' created successfully.[/bold green]"
+        )
     return assistant
 
-def execute_prompt(prompt: str, name=None) -> str:
+def prompt_settings() -> dict:
+    """
+    Return how prompts are sent, from the settings in use (see `current_config`).
+
+    `chat_gpt.timeout` is the most seconds one prompt may take (default
+    DEFAULT_CALL_TIMEOUT). `chat_gpt.hedge` sends a duplicate of a prompt
+    that has taken longer than the p95 latency of this process's earlier
+    prompts, keeping whichever answer arrives first. `chat_gpt.backend`,
+    `batch_size`, `batch_window` and `completion_template` choose and tune a
+    local server backend (see `backends`).
+    """
+    from resumecraftr.cli.routing import default_route
+
+    config = current_config() or {}
+    chat_config = config.get("chat_gpt", {})
+    settings = {
+        "timeout": chat_config.get("timeout", DEFAULT_CALL_TIMEOUT),
+        "hedge": chat_config.get("hedge", False),
+        "backend": chat_config.get("backend", "assistants"),
+        "route": default_route(config),
+    }
+    for option in ("batch_size", "batch_window", "completion_template"):
+        if option in chat_config:
+            settings[option] = chat_config[option]
+    return settings
+
+
+def _sender(settings, name, on_delta=None):
+    """Return send(prompt, response_format, end, route) for the configured backend."""
+    if settings["backend"] == "assistants":
+        return lambda prompt, response_format, end, route: _run_prompt(
+            prompt, name, response_format, end, route, on_delta
+        )
+    from resumecraftr.cli.backends import SENDERS
+
+    if settings["backend"] not in SENDERS:
+        raise PromptError(f"Unknown chat_gpt.backend '{settings['backend']}'.")
+    send = SENDERS[settings["backend"]]
+    # Without an assistant, every request must name the model itself.
+    return lambda prompt, response_format, end, route: send(
+        prompt, response_format, end, route or settings["route"], settings, on_delta
+    )
+
+
+def _record_latency(seconds):
+    with _LATENCIES_LOCK:
+        _LATENCIES.append(seconds)
+
+
+def latency_p95():
+    """Return the p95 latency of this process's recent prompts, or None with too few samples."""
+    with _LATENCIES_LOCK:
+        samples = sorted(_LATENCIES)
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    return samples[int(0.95 * (len(samples) - 1))]
+
+
+def execute_prompt(prompt: str, name=None, response_format=None, route=None, on_delta=None) -> str:
     """
     Execute a given prompt using the AI agent, ensuring the vector database is refreshed.
     Provides real-time feedback to the user using Rich.
 
+    The prompt must finish within `chat_gpt.timeout` seconds and the
+    command's deadline (see `deadlines.deadline`); otherwise its run is
+    cancelled. With `chat_gpt.hedge`, a slow prompt is sent a second time.
+    `chat_gpt.backend` sends it to a local server instead of the Assistants
+    API (see `backends`).
+
     Args:
         prompt (str): The prompt to send to the AI agent.
         name (str, optional): The name of the agent. Defaults to None.
+        response_format (dict, optional): A strict JSON-schema response format. When
+            given, the reply is guaranteed to match the schema.
+        route (Route, optional): The model, temperature and reply limit for
+            this call (see `routing.route_for`). Defaults to the assistant's.
+        on_delta (callable, optional): Called with each piece of the reply as
+            it is generated. An exception raised from it stops the run. Streamed
+            prompts are never hedged, so the pieces come from one reply.
 
     Returns:
         str: The response from the AI agent.
+
+    Raises:
+        PromptError: The run failed, expired or was cancelled, or an OpenAI
+            request failed (rate limit, connection reset, server error).
+        PromptTimeout: No answer before the deadline.
     """
-    # Only initialize OpenAI client when needed
-    client = get_openai_client()
-    assistant = create_or_get_agent(name)
-    thread = client.beta.threads.create()
+    from openai import APIError, APITimeoutError
+
+    settings = prompt_settings()
+    send = _sender(settings, name, on_delta)
+    timeout = settings["timeout"]
+    left = deadlines.remaining()
+    if left is not None:
+        timeout = left if timeout is None else min(timeout, left)
+    end = None if timeout is None else time.monotonic() + timeout
+
+    with span("execute_prompt"):
+        with span("prompt_slot"):
+            if not _PROMPT_SLOTS.acquire(timeout=None if end is None else max(0, end - time.monotonic())):
+                raise PromptTimeout("No prompt slot became free before the deadline.")
+        try:
+            if settings["hedge"] and on_delta is None:
+                return _hedged_prompt(send, prompt, response_format, end, route)
+            started = time.monotonic()
+            response = send(prompt, response_format, end, route)
+            _record_latency(time.monotonic() - started)
+            return response
+        except APITimeoutError as e:
+            raise PromptTimeout("OpenAI did not answer before the deadline.") from e
+        except APIError as e:
+            # Callers handle PromptError per prompt, so one failed request
+            # only fails its own section.
+            raise PromptError(f"The OpenAI request failed: {e}") from e
+        finally:
+            _PROMPT_SLOTS.release()
+
+
+def _attempt(send, prompt, response_format, end, route, stop):
+    # Each attempt of a hedged prompt can be cancelled on its own.
+    with deadlines.cancellation() as own:
+        stop.append(own)
+        return send(prompt, response_format, end, route)
+
+
+def _hedged_prompt(send, prompt, response_format, end, route=None):
+    """Run a prompt, sending a duplicate once it is slower than the p95 latency."""
+    p95 = latency_p95()
+    stops = []
+    started = time.monotonic()
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    try:
+        attempts = [submit(pool, _attempt, send, prompt, response_format, end, route, stops)]
+        done, _ = concurrent.futures.wait(attempts, timeout=p95)
+        # The duplicate needs a free slot of its own; without one, keep waiting.
+        if not done and p95 is not None and _PROMPT_SLOTS.acquire(blocking=False):
+            with span("hedge", after=round(p95, 2)):
+                try:
+                    attempts.append(submit(pool, _attempt, send, prompt, response_format, end, route, stops))
+                    response = _first_answer(attempts)
+                finally:
+                    _PROMPT_SLOTS.release()
+        else:
+            response = _first_answer(attempts)
+        _record_latency(time.monotonic() - started)
+        return response
+    finally:
+        for stop in stops:
+            stop.set()
+        pool.shutdown(wait=False)
+
+
+def _first_answer(attempts):
+    """Return the first successful attempt's answer, or raise the last error."""
+    pending = set(attempts)
+    error = None
+    while pending:
+        done, pending = concurrent.futures.wait(
+            pending, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+    raise error
 
-    console.print("[bold cyan]🔄 Sending prompt to OpenAI...[/bold cyan]")
 
-    client.beta.threads.messages.create(
-        thread_id=thread.id, role="user", content=prompt
-    )
+def _cancel_run(client, thread_id, run_id):
+    try:
+        with span("runs.cancel"):
+            client.beta.threads.runs.cancel(thread_id=thread_id, run_id=run_id)
+    except Exception:
+        # The run may have finished in the meantime.
+        pass
 
-    run = client.beta.threads.runs.create(
-        thread_id=thread.id, assistant_id=assistant.id
-    )
 
-    console.print("[yellow]⏳ Waiting for OpenAI response...[/yellow]")
+def _stream_run(client, thread_id, assistant_id, run_options, end, on_delta):
+    """
+    Create a run that streams its reply, passing each piece to on_delta.
 
-    while run.status in ["queued", "in_progress"]:
-        run = client.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
-        time.sleep(1)
+    Returns:
+        tuple: The run as of its last event, and the reply text.
+    """
+    from openai import APIError, APITimeoutError
+
+    pieces = []
+    run = None
+    with span("run.wait") as waiting:
+        try:
+            with span("runs.create"):
+                stream = client.beta.threads.runs.create(
+                    thread_id=thread_id,
+                    assistant_id=assistant_id,
+                    stream=True,
+                    timeout=None if end is None else max(1.0, end - time.monotonic()),
+                    **run_options,
+                )
+            with stream:
+                for event in stream:
+                    if event.event == "thread.message.delta":
+                        for part in event.data.delta.content or []:
+                            text = getattr(getattr(part, "text", None), "value", None)
+                            if text:
+                                pieces.append(text)
+                                on_delta(text)
+                    elif event.event.startswith("thread.run.") and ".step." not in event.event:
+                        run = event.data
+                    if deadlines.cancelled():
+                        raise PromptCancelled("The prompt was cancelled.")
+                    if end is not None and time.monotonic() >= end:
+                        raise PromptTimeout("OpenAI did not answer before the deadline.")
+        except BaseException as e:
+            if run is not None and run.status in ACTIVE_RUN_STATUSES:
+                _cancel_run(client, thread_id, run.id)
+            if isinstance(e, APITimeoutError) or (end is not None and time.monotonic() >= end):
+                raise PromptTimeout("OpenAI did not answer before the deadline.") from e
+            if isinstance(e, APIError) or type(e).__module__.startswith("httpx"):
+                raise PromptError(f"The reply stream broke off: {e}") from e
+            raise
+        usage = getattr(run, "usage", None)
+        if waiting is not None and usage is not None:
+            waiting.attrs["input_tokens"] = usage.prompt_tokens
+            waiting.attrs["output_tokens"] = usage.completion_tokens
+    if run is None:
+        raise PromptError("The OpenAI stream ended before the run started.")
+    return run, "".join(pieces)
+
+
+def _run_prompt(prompt, name, response_format, end=None, route=None, on_delta=None):
+    # Only initialize OpenAI client when needed
+    client = get_openai_client()
+    assistant = create_or_get_agent(name)
+    with span("threads.create"):
+        thread = client.beta.threads.create()
 
-    console.print("[bold green]✅ Response received![/bold green]")
+    if is_interactive():
+        console.print("[bold cyan]🔄 Sending prompt to OpenAI...[/bold cyan]")
+
+    with span("messages.create"):
+        client.beta.threads.messages.create(
+            thread_id=thread.id, role="user", content=prompt
+        )
+
+    run_options = {}
+    if response_format is not None:
+        # Structured outputs cannot be combined with file_search, and prompts
+        # that use them already carry the document they work on.
+        run_options = {"response_format": response_format, "tools": []}
+    if route is not None:
+        run_options.update(route.run_options())
+
+    if on_delta is not None:
+        run, response = _stream_run(client, thread.id, assistant.id, run_options, end, on_delta)
+        if run.status != "completed":
+            last_error = getattr(run, "last_error", None)
+            detail = f": {last_error.message}" if getattr(last_error, "message", None) else ""
+            raise PromptError(f"The OpenAI run ended as '{run.status}'{detail}.")
+        return response
+
+    with span("runs.create"):
+        run = client.beta.threads.runs.create(
+            thread_id=thread.id, assistant_id=assistant.id, **run_options
+        )
 
-    messages = client.beta.threads.messages.list(thread_id=thread.id)
-    response = messages.data[0].content[0].text.value
+    if is_interactive():
+        console.print("[yellow]⏳ Waiting for OpenAI response...[/yellow]")
+
+    with span("run.wait") as waiting:
+        polls = 0
+        while run.status in ACTIVE_RUN_STATUSES:
+            # One span per status, so queueing and generation show separately.
+            with span(f"run.{run.status}"):
+                status = run.status
+                while run.status == status:
+                    if deadlines.cancelled():
+                        _cancel_run(client, thread.id, run.id)
+                        raise PromptCancelled("The prompt was cancelled.")
+                    if end is not None and time.monotonic() >= end:
+                        _cancel_run(client, thread.id, run.id)
+                        raise PromptTimeout("OpenAI did not answer before the deadline.")
+                    run = client.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
+                    if run.status == status:
+                        deadlines.wait(POLL_INTERVAL)
+                    polls += 1
+        if waiting is not None:
+            waiting.attrs["polls"] = polls
+
+    if run.status != "completed":
+        last_error = getattr(run, "last_error", None)
+        detail = f": {last_error.message}" if getattr(last_error, "message", None) else ""
+        raise PromptError(f"The OpenAI run ended as '{run.status}'{detail}.")
+    usage = getattr(run, "usage", None)
+    if waiting is not None and usage is not None:
+        waiting.attrs["input_tokens"] = usage.prompt_tokens
+        waiting.attrs["output_tokens"] = usage.completion_tokens
+
+    if is_interactive():
+        console.print("[bold green]✅ Response received![/bold green]")
+
+    with span("messages.list"):
+        messages = client.beta.threads.messages.list(thread_id=thread.id, run_id=run.id)
+    replies = [message for message in messages.data if message.role == "assistant"]
+    if not replies:
+        raise PromptError("The OpenAI run completed without a reply.")
+    response = replies[0].content[0].text.value
 
     if response.strip() == prompt.strip():
         console.print(
@@ -259,6 +695,7 @@ def execute_prompt(prompt: str, name=None) -> str:
             "OpenAI response is identical to the prompt. Possible credit exhaustion."
         )
 
-    console.print("[bold green]✅ Processing completed successfully![/bold green]")
+    if is_interactive():
+        console.print("[bold green]✅ Processing completed successfully![/bold green]")
 
     return response
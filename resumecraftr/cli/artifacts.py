@@ -0,0 +1,255 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from resumecraftr.cli.store import get_store
+from resumecraftr.cli.tracing import span
+from resumecraftr.cli.workspace import workspace_path
+
+ARTIFACTS_DIR_NAME = ".artifacts"
+# Results kept in memory and shared by every workspace of the process. Keys
+# hash the inputs themselves, so a result computed for one workspace is valid
+# for any other with the same CV, job, prompt and model.
+SHARED_CACHE_SIZE = 1024
+
+
+def content_hash(data) -> str:
+    """Return the SHA-256 hex digest of a string, bytes or JSON-serializable value."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    elif not isinstance(data, bytes):
+        data = json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def prompt_version(prompt_template: str) -> str:
+    """Version a prompt by the hash of its template text, so edits invalidate old outputs."""
+    return content_hash(prompt_template)[:12]
+
+
+class _DryRun(Exception):
+    """Raised to roll back the gc transaction when only reporting."""
+
+
+class _SharedCache:
+    """Small thread-safe LRU of cache key -> output, shared across workspaces."""
+
+    def __init__(self, size: int = SHARED_CACHE_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+
+    def put(self, key: str, content: str):
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+_SHARED_CACHE = _SharedCache()
+
+
+class ArtifactStore:
+    """
+    Content-addressed store for generated outputs.
+
+    Each output is written once under its SHA-256 hash in `.artifacts/`, and the
+    workspace database maps a cache key (the hash of the artifact kind and all of
+    its inputs: CV, job and template hashes, prompt version, model, language) to
+    that blob. Commands look the key up before calling OpenAI and reuse the blob
+    when the inputs are unchanged.
+    """
+
+    def __init__(self, store, blobs_dir: str):
+        self.store = store
+        self.blobs_dir = blobs_dir
+
+    def _blob_path(self, blob: str) -> str:
+        return os.path.join(self.blobs_dir, blob[:2], blob)
+
+    def cache_key(self, kind: str, inputs: dict) -> str:
+        return content_hash({"kind": kind, "inputs": inputs})
+
+    def write_blob(self, content: str) -> str:
+        """Store content under its hash and return the hash."""
+        blob = content_hash(content)
+        path = self._blob_path(blob)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        return blob
+
+    def read_blob(self, blob: str):
+        try:
+            with open(self._blob_path(blob), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def get(self, kind: str, inputs: dict):
+        """
+        Return the stored output for these inputs, or None if there is none.
+
+        Outputs computed by another workspace of this process are copied into
+        this one, so each workspace stays complete on its own.
+        """
+        key = self.cache_key(kind, inputs)
+        with self.store.reader() as conn:
+            row = conn.execute("SELECT blob FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            content = _SHARED_CACHE.get(key)
+            if content is not None:
+                self.put(kind, inputs, content)
+            return content
+        content = self.read_blob(row[0])
+        if content is not None:
+            _SHARED_CACHE.put(key, content)
+            with self.store.transaction() as conn:
+                conn.execute(
+                    "UPDATE cache SET last_used_at = ? WHERE key = ?", (time.time(), key)
+                )
+        return content
+
+    def contains(self, kind: str, inputs: dict) -> bool:
+        """Return True if an output is stored for these inputs, without marking it used."""
+        key = self.cache_key(kind, inputs)
+        if _SHARED_CACHE.get(key) is not None:
+            return True
+        with self.store.reader() as conn:
+            row = conn.execute("SELECT blob FROM cache WHERE key = ?", (key,)).fetchone()
+        return row is not None and os.path.exists(self._blob_path(row[0]))
+
+    def put(self, kind: str, inputs: dict, content: str) -> str:
+        """Store an output with its provenance and return its content hash."""
+        blob = self.write_blob(content)
+        _SHARED_CACHE.put(self.cache_key(kind, inputs), content)
+        now = time.time()
+        with self.store.transaction() as conn:
+            conn.execute(
+                "INSERT INTO cache (key, kind, blob, inputs, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET blob = excluded.blob, "
+                "last_used_at = excluded.last_used_at",
+                (
+                    self.cache_key(kind, inputs),
+                    kind,
+                    blob,
+                    json.dumps(inputs, sort_keys=True),
+                    now,
+                    now,
+                ),
+            )
+        return blob
+
+    def fetch_or_compute(self, kind: str, inputs: dict, compute, enabled: bool = True):
+        """
+        Reuse a stored output or compute and store a new one.
+
+        Args:
+            kind (str): The artifact type.
+            inputs (dict): Everything the output depends on.
+            compute (callable): Produces the output as a string, or None on failure.
+            enabled (bool, optional): When False, always compute (the result is still stored).
+
+        Returns:
+            str | None: The output, or None if compute failed.
+        """
+        if enabled:
+            with span("cache.lookup", kind=kind) as lookup:
+                cached = self.get(kind, inputs)
+                if lookup is not None:
+                    lookup.attrs["hit"] = cached is not None
+            if cached is not None:
+                return cached
+        content = compute()
+        if content is not None:
+            with span("cache.store", kind=kind):
+                self.put(kind, inputs, content)
+        return content
+
+    def gc(self, max_age_days: float = None, dry_run: bool = False) -> dict:
+        """
+        Remove unreferenced blobs.
+
+        Artifact records whose files no longer exist are dropped first, and, if
+        max_age_days is given, cache entries not used for that long. Blobs not
+        referenced by any remaining cache entry or artifact are then deleted.
+
+        Returns:
+            dict: Counts of removed records and blobs, and bytes freed.
+        """
+        now = time.time()
+        unreferenced = []
+        try:
+            with self.store.transaction() as conn:
+                # Older records hold paths relative to the directory that
+                # contains the workspace.
+                base_dir = os.path.dirname(os.path.dirname(os.path.abspath(self.store.db_file)))
+                missing = [
+                    path
+                    for (path,) in conn.execute("SELECT path FROM artifacts")
+                    if not os.path.exists(os.path.join(base_dir, path))
+                ]
+                conn.executemany("DELETE FROM artifacts WHERE path = ?", [(p,) for p in missing])
+                expired = 0
+                if max_age_days is not None:
+                    expired = conn.execute(
+                        "DELETE FROM cache WHERE last_used_at < ?",
+                        (now - max_age_days * 86400,),
+                    ).rowcount
+                referenced = {
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT blob FROM cache UNION SELECT blob FROM artifacts WHERE blob IS NOT NULL"
+                    )
+                }
+
+                for dirpath, _, filenames in os.walk(self.blobs_dir):
+                    for filename in filenames:
+                        path = os.path.join(dirpath, filename)
+                        # Blobs written moments ago may belong to a put() that
+                        # has not committed its cache entry yet.
+                        if filename in referenced or now - os.path.getmtime(path) < 60:
+                            continue
+                        unreferenced.append((path, os.path.getsize(path)))
+
+                if dry_run:
+                    raise _DryRun()
+                for path, _ in unreferenced:
+                    os.remove(path)
+        except _DryRun:
+            pass
+
+        return {
+            "artifacts": len(missing),
+            "cache_entries": expired,
+            "blobs": len(unreferenced),
+            "bytes": sum(size for _, size in unreferenced),
+        }
+
+
+_ARTIFACT_STORES = {}
+_ARTIFACT_STORES_LOCK = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Get the current workspace's artifact store, creating it once per process."""
+    blobs_dir = workspace_path(ARTIFACTS_DIR_NAME)
+    key = os.path.abspath(blobs_dir)
+    with _ARTIFACT_STORES_LOCK:
+        if key not in _ARTIFACT_STORES:
+            _ARTIFACT_STORES[key] = ArtifactStore(get_store(), blobs_dir)
+        return _ARTIFACT_STORES[key]
@@ -0,0 +1,261 @@
+import json
+import time
+import threading
+import contextvars
+import concurrent.futures
+from resumecraftr.cli import deadlines
+from resumecraftr.cli.agent import AGENT_INSTRUCTIONS, POLL_INTERVAL, client_options, get_openai_client
+from resumecraftr.cli.deadlines import PromptCancelled, PromptError, PromptTimeout
+from resumecraftr.cli.tracing import span
+
+# Backends for OpenAI-compatible servers without the Assistants API, such as
+# llama.cpp or vLLM running on-prem. Select one with `chat_gpt.backend`:
+#
+#   "assistants"   the default: threads and runs on OpenAI (see agent.py)
+#   "chat"         one /chat/completions request per prompt
+#   "completions"  plain /completions; prompts sent at the same time with the
+#                  same settings go out together as one request with a list
+#                  of prompts, which local servers decode as a batch
+#
+# Neither local backend creates assistants or uploads workspace files.
+
+BACKENDS = ("assistants", "chat", "completions")
+# Most prompts per /completions request, and how long the first prompt of a
+# batch waits for others to join it.
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_BATCH_WINDOW = 0.02
+# How plain completions are prompted; wrap it in the model's chat template if
+# the server does not apply one.
+DEFAULT_COMPLETION_TEMPLATE = "{instructions}\n\n{prompt}\n"
+
+
+def _remaining(end):
+    return None if end is None else max(0.0, end - time.monotonic())
+
+
+def chat_prompt(prompt, response_format=None, end=None, route=None, settings=None, on_delta=None) -> str:
+    """
+    Answer a prompt with one chat completion, streamed to `on_delta` if given.
+
+    Raises:
+        PromptError: The server returned no usable reply.
+        PromptTimeout: No answer before `end`.
+    """
+    from openai import APITimeoutError
+
+    if deadlines.cancelled():
+        raise PromptCancelled("The prompt was cancelled.")
+    options = route.chat_options() if route is not None else {}
+    if response_format is not None:
+        options["response_format"] = response_format
+    messages = [
+        {"role": "system", "content": AGENT_INSTRUCTIONS},
+        {"role": "user", "content": prompt},
+    ]
+    if on_delta is not None:
+        return _stream_chat(messages, options, end, on_delta)
+    with span("chat.completions") as call:
+        try:
+            response = get_openai_client().chat.completions.create(
+                messages=messages, timeout=_remaining(end), **options
+            )
+        except APITimeoutError as e:
+            raise PromptTimeout("The server did not answer before the deadline.") from e
+        if call is not None and response.usage is not None:
+            call.attrs["input_tokens"] = response.usage.prompt_tokens
+            call.attrs["output_tokens"] = response.usage.completion_tokens
+    choice = response.choices[0]
+    if choice.finish_reason == "length":
+        raise PromptError("The reply was cut off at max_tokens.")
+    if not choice.message.content:
+        raise PromptError("The server returned an empty reply.")
+    return choice.message.content
+
+
+def _stream_chat(messages, options, end, on_delta) -> str:
+    from openai import APIError, APITimeoutError
+
+    pieces, finish_reason = [], None
+    with span("chat.completions", stream=True) as call:
+        try:
+            stream = get_openai_client().chat.completions.create(
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=_remaining(end),
+                **options,
+            )
+            with stream:
+                for chunk in stream:
+                    for choice in chunk.choices:
+                        if choice.delta.content:
+                            pieces.append(choice.delta.content)
+                            on_delta(choice.delta.content)
+                        finish_reason = choice.finish_reason or finish_reason
+                    if chunk.usage is not None and call is not None:
+                        call.attrs["input_tokens"] = chunk.usage.prompt_tokens
+                        call.attrs["output_tokens"] = chunk.usage.completion_tokens
+                    if deadlines.cancelled():
+                        raise PromptCancelled("The prompt was cancelled.")
+                    if end is not None and time.monotonic() >= end:
+                        raise PromptTimeout("The server did not answer before the deadline.")
+        except APITimeoutError as e:
+            raise PromptTimeout("The server did not answer before the deadline.") from e
+        except APIError as e:
+            raise PromptError(f"The reply stream broke off: {e}") from e
+    if finish_reason == "length":
+        raise PromptError("The reply was cut off at max_tokens.")
+    if not pieces:
+        raise PromptError("The server returned an empty reply.")
+    return "".join(pieces)
+
+
+class MicroBatcher:
+    """
+    Groups prompts submitted around the same time into one request.
+
+    A batch is sent when it holds `size` prompts or `window` seconds after its
+    first prompt arrived, whichever comes first. Only prompts with the same
+    key (server, model and sampling settings) share a batch. A batch sent by
+    its timer runs in the context of its first prompt (workspace, settings).
+
+    Args:
+        send (callable): (key, payloads) -> one result or exception per payload.
+        size (int): Most prompts per request.
+        window (float): Seconds the first prompt waits for others.
+    """
+
+    def __init__(self, send, size: int, window: float):
+        self.send = send
+        self.size = max(1, size)
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def submit(self, key, payload) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        with self._lock:
+            batch = self._pending.setdefault(key, [])
+            batch.append((payload, future))
+            full = len(batch) >= self.size
+            if full:
+                del self._pending[key]
+            elif len(batch) == 1:
+                timer = threading.Timer(
+                    self.window, contextvars.copy_context().run, (self._flush, key, batch)
+                )
+                timer.daemon = True
+                timer.start()
+        if full:
+            self._dispatch(key, batch)
+        return future
+
+    def _flush(self, key, batch):
+        with self._lock:
+            if self._pending.get(key) is not batch:
+                # Already sent because it filled up.
+                return
+            del self._pending[key]
+        self._dispatch(key, batch)
+
+    def _dispatch(self, key, batch):
+        try:
+            results = self.send(key, [payload for payload, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def _send_completions(key, prompts):
+    """Send a batch of prompts as one /completions request."""
+    _, options, response_format = json.loads(key)
+    if response_format is not None:
+        # Servers with guided decoding (vLLM, llama.cpp) accept the schema here.
+        options["extra_body"] = {"response_format": response_format}
+    response = get_openai_client().completions.create(prompt=prompts, **options)
+    choices = sorted(response.choices, key=lambda choice: choice.index)
+    usage = response.usage
+    total_prompt = sum(len(prompt) for prompt in prompts) or 1
+    total_reply = sum(len(choice.text or "") for choice in choices) or 1
+    results = []
+    for prompt, choice in zip(prompts, choices):
+        if choice.finish_reason == "length":
+            results.append(PromptError("The reply was cut off at max_tokens."))
+        elif not (choice.text or "").strip():
+            results.append(PromptError("The server returned an empty reply."))
+        else:
+            # The server reports usage for the whole request; split it by size.
+            tokens = (
+                (
+                    round(usage.prompt_tokens * len(prompt) / total_prompt),
+                    round(usage.completion_tokens * len(choice.text) / total_reply),
+                )
+                if usage is not None
+                else None
+            )
+            results.append((choice.text, tokens))
+    if len(choices) < len(prompts):
+        results += [PromptError("The server returned fewer replies than prompts.")] * (
+            len(prompts) - len(choices)
+        )
+    return results
+
+
+_BATCHERS = {}
+_BATCHERS_LOCK = threading.Lock()
+
+
+def _batcher(size: int, window: float) -> MicroBatcher:
+    with _BATCHERS_LOCK:
+        if (size, window) not in _BATCHERS:
+            _BATCHERS[(size, window)] = MicroBatcher(_send_completions, size, window)
+        return _BATCHERS[(size, window)]
+
+
+def completion_prompt(prompt, response_format=None, end=None, route=None, settings=None, on_delta=None) -> str:
+    """
+    Answer a prompt with a plain completion, batched with concurrent prompts.
+
+    Batched replies are not streamed: `on_delta` gets the whole reply at once.
+
+    Raises:
+        PromptError: The server returned no usable reply.
+        PromptTimeout: No answer before `end`.
+    """
+    settings = settings or {}
+    text = settings.get("completion_template", DEFAULT_COMPLETION_TEMPLATE).format(
+        instructions=AGENT_INSTRUCTIONS, prompt=prompt
+    )
+    options = route.chat_options() if route is not None else {}
+    key = json.dumps([client_options(), options, response_format], sort_keys=True)
+    batcher = _batcher(
+        settings.get("batch_size", DEFAULT_BATCH_SIZE),
+        settings.get("batch_window", DEFAULT_BATCH_WINDOW),
+    )
+    with span("completions") as call:
+        future = batcher.submit(key, text)
+        while True:
+            if deadlines.cancelled():
+                raise PromptCancelled("The prompt was cancelled.")
+            left = _remaining(end)
+            if left == 0:
+                raise PromptTimeout("The server did not answer before the deadline.")
+            try:
+                reply, tokens = future.result(
+                    timeout=POLL_INTERVAL if left is None else min(POLL_INTERVAL, left)
+                )
+                break
+            except concurrent.futures.TimeoutError:
+                continue
+        if call is not None and tokens is not None:
+            call.attrs["input_tokens"], call.attrs["output_tokens"] = tokens
+    if on_delta is not None:
+        on_delta(reply)
+    return reply
+
+
+SENDERS = {"chat": chat_prompt, "completions": completion_prompt}
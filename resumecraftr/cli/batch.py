@@ -0,0 +1,118 @@
+import os
+import json
+import time
+from rich.console import Console
+from resumecraftr.cli.agent import AGENT_INSTRUCTIONS, get_openai_client
+from resumecraftr.cli.store import get_store
+from resumecraftr.cli.tracing import span
+from resumecraftr.cli.workspace import workspace_path
+
+console = Console()
+BATCH_DIR_NAME = "batches"
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+# Statuses after which a batch no longer changes. Expired and cancelled
+# batches still return the requests that finished before they stopped.
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def batch_request(custom_id: str, section_prompt) -> dict:
+    """
+    Build one line of a batch input file: a chat completion for a section prompt.
+
+    The Batch API does not run assistants, so the assistant instructions are
+    sent as the system message. Section prompts already carry the CV text.
+    The model and sampling settings come from the prompt's route.
+    """
+    body = {
+        **section_prompt.route.chat_options(),
+        "messages": [
+            {"role": "system", "content": AGENT_INSTRUCTIONS},
+            {"role": "user", "content": section_prompt.prompt},
+        ],
+    }
+    reply_format = section_prompt.reply_format()
+    if reply_format is not None:
+        body["response_format"] = reply_format
+    return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+
+
+def submit_batch(command: str, targets: list, config: dict) -> str:
+    """
+    Write section prompts to a JSONL batch file, submit it and record the batch.
+
+    Args:
+        command (str): "parse-cv" or "tailor-cv"; tells `collect` how to save the results.
+        targets (list): One dict per output file, with "cv", "job" (tailor-cv
+            only), "prompts" (the SectionPrompts to send) and "cached" (section
+            contents that are already available, keyed by section name).
+        config (dict): The workspace configuration.
+
+    Returns:
+        str: The batch ID.
+    """
+    batch_dir = workspace_path(BATCH_DIR_NAME)
+    os.makedirs(batch_dir, exist_ok=True)
+    input_file = os.path.join(
+        batch_dir, f"{command}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl"
+    )
+    records = []
+    with open(input_file, "w", encoding="utf-8") as f:
+        for target_index, target in enumerate(targets):
+            prompts = {}
+            for prompt_index, section_prompt in enumerate(target["prompts"]):
+                custom_id = f"{target_index}-{prompt_index}"
+                request = batch_request(custom_id, section_prompt)
+                f.write(json.dumps(request, ensure_ascii=False) + "\n")
+                prompts[custom_id] = section_prompt.record()
+            records.append(
+                {
+                    "cv": target["cv"],
+                    "job": target.get("job"),
+                    "prompts": prompts,
+                    "cached": target["cached"],
+                }
+            )
+
+    client = get_openai_client()
+    with span("files.create"), open(input_file, "rb") as f:
+        uploaded = client.files.create(file=f, purpose="batch")
+    with span("batches.create"):
+        batch = client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW,
+            metadata={"command": command},
+        )
+    get_store().record_batch(batch.id, command, batch.status, input_file, records)
+    return batch.id
+
+
+def batch_replies(batch):
+    """
+    Download the replies of a finished batch.
+
+    Returns:
+        tuple: (replies, errors), both keyed by request ID. Replies hold the
+        message text; errors hold why a request produced no reply.
+    """
+    client = get_openai_client()
+    replies, errors = {}, {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        with span("files.content"):
+            text = client.files.content(file_id).text
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                error = result.get("error") or {}
+                errors[result["custom_id"]] = error.get("message") or (
+                    f"HTTP {response.get('status_code')}"
+                )
+                continue
+            replies[result["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+    return replies, errors
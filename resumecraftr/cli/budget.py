@@ -0,0 +1,294 @@
+import math
+import re
+from dataclasses import dataclass, field, replace
+
+# Token budgets. Every prompt is estimated locally before it is sent, so a
+# section that would overflow the model's context or output limit is split
+# instead of failing after the run was paid for, and `--plan` can report what
+# a command would cost without calling OpenAI.
+
+
+@dataclass(frozen=True)
+class ModelLimits:
+    """
+    What a model accepts and costs.
+
+    Attributes:
+        context (int): Context window in tokens, prompt and reply together.
+        max_output (int): Most tokens the model writes in one reply.
+        input_price (float): US dollars per million prompt tokens.
+        output_price (float): US dollars per million reply tokens.
+        tokens_per_second (float): Typical reply speed, for latency estimates.
+    """
+
+    context: int
+    max_output: int
+    input_price: float
+    output_price: float
+    tokens_per_second: float
+
+
+# Matched by the longest prefix of the model name, so dated snapshots
+# ("gpt-4o-2024-08-06") use their family's limits. Prices are list prices;
+# override them with chat_gpt.limits in resumecraftr.json.
+MODEL_LIMITS = {
+    "gpt-4.1-nano": ModelLimits(1047576, 32768, 0.10, 0.40, 150),
+    "gpt-4.1-mini": ModelLimits(1047576, 32768, 0.40, 1.60, 100),
+    "gpt-4.1": ModelLimits(1047576, 32768, 2.00, 8.00, 70),
+    "gpt-4o-mini": ModelLimits(128000, 16384, 0.15, 0.60, 90),
+    "gpt-4o": ModelLimits(128000, 16384, 2.50, 10.00, 70),
+    "gpt-4-turbo": ModelLimits(128000, 4096, 10.00, 30.00, 35),
+    "gpt-4": ModelLimits(8192, 8192, 30.00, 60.00, 25),
+    "gpt-3.5-turbo": ModelLimits(16385, 4096, 0.50, 1.50, 90),
+    "o3-mini": ModelLimits(200000, 100000, 1.10, 4.40, 120),
+    "o1": ModelLimits(200000, 100000, 15.00, 60.00, 60),
+}
+DEFAULT_MODEL = "gpt-4o"
+# The Batch API bills half the list price.
+BATCH_DISCOUNT = 0.5
+# Seconds an Assistants run spends outside generation: thread and run
+# creation, queueing and polling.
+RUN_OVERHEAD = 2.5
+# Tokens added to every run: the assistant instructions and message framing.
+PROMPT_OVERHEAD = 60
+# Share of the context kept free, since the estimates are approximate.
+SAFETY_MARGIN = 0.1
+
+# Reply size relative to the content the reply is built from: an extracted
+# section is a part of the CV text, a tailored section is a rewrite of the
+# section plus its JSON wrapper, and the Markdown is a rewrite of the CV.
+OUTPUT_RATIOS = {
+    "extracted_section": 0.5,
+    "optimized_section": 1.2,
+    "markdown": 1.2,
+}
+
+# A JSON Patch reply only rewrites some strings of a tailored section.
+PATCH_OUTPUT_RATIO = 0.5
+
+# How each kind of call is labelled in plans.
+STEP_NAMES = {
+    "extracted_section": "parse",
+    "optimized_section": "tailor",
+    "markdown": "render",
+}
+
+_WORD = re.compile(r"\S+")
+_encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate how many tokens a text takes.
+
+    Uses tiktoken when it is installed; otherwise about four characters or
+    three quarters of a word per token, whichever is more.
+    """
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return max(math.ceil(len(text) / 4), math.ceil(len(_WORD.findall(text)) * 4 / 3))
+
+
+def model_limits(config: dict, model: str = None) -> ModelLimits:
+    """Return the limits of a model (the configured one by default), with chat_gpt.limits applied."""
+    chat_gpt = config.get("chat_gpt", {})
+    model = model or chat_gpt.get("model") or DEFAULT_MODEL
+    family = max(
+        (name for name in MODEL_LIMITS if model.startswith(name)),
+        key=len,
+        default=DEFAULT_MODEL,
+    )
+    limits = MODEL_LIMITS[family]
+    overrides = chat_gpt.get("limits", {})
+    return replace(limits, **overrides) if overrides else limits
+
+
+@dataclass
+class CallEstimate:
+    """
+    The estimated size of one model call.
+
+    Attributes:
+        kind (str): The artifact kind: "extracted_section", "optimized_section" or "markdown".
+        section (str): The section name, or "" for whole-document calls.
+        input_tokens (int): Prompt tokens, including the run overhead.
+        output_tokens (int): Expected reply tokens.
+        cached (bool): A stored result will be reused, so no call is made.
+        route (Route): The model and reply limit the call is sent with, or
+            None for the configured model.
+    """
+
+    kind: str
+    section: str
+    input_tokens: int
+    output_tokens: int
+    cached: bool = False
+    route: object = None
+
+    @property
+    def model(self):
+        return self.route.model if self.route is not None else None
+
+
+def estimate_call(
+    kind: str, section: str, prompt: str, payload: str, cached: bool = False, route=None, output_ratio: float = None
+) -> CallEstimate:
+    """
+    Estimate a call from its prompt and the content its reply is built from.
+
+    Args:
+        kind (str): The artifact kind, a key of OUTPUT_RATIOS.
+        section (str): The section name.
+        prompt (str): The full prompt text.
+        payload (str): The CV text or content the reply rewrites.
+        cached (bool, optional): Whether a stored result will be reused.
+        route (Route, optional): The route the call is sent with.
+        output_ratio (float, optional): Reply tokens per payload token, instead
+            of the kind's OUTPUT_RATIOS entry.
+    """
+    if output_ratio is None:
+        output_ratio = OUTPUT_RATIOS[kind]
+    return CallEstimate(
+        kind=kind,
+        section=section,
+        input_tokens=estimate_tokens(prompt) + PROMPT_OVERHEAD,
+        output_tokens=math.ceil(estimate_tokens(payload) * output_ratio) + 20,
+        cached=cached,
+        route=route,
+    )
+
+
+def fits(config: dict, call: CallEstimate) -> bool:
+    """
+    Return True if the call stays within its model's context and output
+    limits, and within the reply limit of its route.
+    """
+    limits = model_limits(config, call.model)
+    usable = limits.context * (1 - SAFETY_MARGIN)
+    max_output = limits.max_output
+    if call.route is not None and call.route.max_tokens:
+        max_output = min(max_output, call.route.max_tokens)
+    return (
+        call.input_tokens + call.output_tokens <= usable
+        and call.output_tokens <= max_output * (1 - SAFETY_MARGIN)
+    )
+
+
+@dataclass
+class Plan:
+    """
+    What a command would send to OpenAI.
+
+    Attributes:
+        calls (list): One CallEstimate per prompt, cached ones included.
+        limits (ModelLimits): The configured model's limits.
+        concurrency (int): How many calls run at once.
+        batch (bool): Priced and timed for the Batch API.
+        routed (dict): Limits of the other models calls are routed to, keyed by model.
+    """
+
+    calls: list
+    limits: ModelLimits
+    concurrency: int = 1
+    batch: bool = False
+    routed: dict = field(default_factory=dict)
+
+    def limits_for(self, call: CallEstimate) -> ModelLimits:
+        return self.routed.get(call.model, self.limits)
+
+    @property
+    def pending(self) -> list:
+        return [call for call in self.calls if not call.cached]
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(call.input_tokens for call in self.pending)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(call.output_tokens for call in self.pending)
+
+    @property
+    def cost(self) -> float:
+        """Estimated cost in US dollars."""
+        cost = sum(
+            call.input_tokens * self.limits_for(call).input_price
+            + call.output_tokens * self.limits_for(call).output_price
+            for call in self.pending
+        ) / 1_000_000
+        return cost * BATCH_DISCOUNT if self.batch else cost
+
+    def call_seconds(self, call: CallEstimate) -> float:
+        return RUN_OVERHEAD + call.output_tokens / self.limits_for(call).tokens_per_second
+
+    @property
+    def latency(self) -> float:
+        """
+        Estimated wall-clock seconds with the calls fanned out.
+
+        At least the slowest call, and at least the total spread over the
+        concurrent slots. Not meaningful for batches, which finish within 24h.
+        """
+        seconds = [self.call_seconds(call) for call in self.pending]
+        if not seconds:
+            return 0.0
+        return max(max(seconds), sum(seconds) / max(1, self.concurrency))
+
+    def oversized(self, config: dict) -> list:
+        """Return the calls that still do not fit after splitting."""
+        return [call for call in self.pending if not fits(config, call)]
+
+
+def print_plan(console, plan: Plan, config: dict):
+    """Print a plan per section, with its totals and any prompt that is still too large."""
+    from rich.table import Table
+
+    default_model = config.get("chat_gpt", {}).get("model") or DEFAULT_MODEL
+    # A model column only when some calls are routed to another model.
+    routed = any(call.model not in (None, default_model) for call in plan.calls)
+    table = Table(title=f"Plan for {default_model}")
+    columns = ("Step", "Section") + (("Model",) if routed else ()) + ("Calls", "Cached", "Input tokens", "Output tokens")
+    for column in columns:
+        table.add_column(column, justify="left" if column in ("Step", "Section", "Model") else "right")
+    rows = {}
+    for call in plan.calls:
+        row = rows.setdefault((call.kind, call.section, call.model or default_model), [0, 0, 0, 0])
+        if call.cached:
+            row[1] += 1
+        else:
+            row[0] += 1
+            row[2] += call.input_tokens
+            row[3] += call.output_tokens
+    for (kind, section, model), (calls, cached, input_tokens, output_tokens) in rows.items():
+        table.add_row(
+            STEP_NAMES.get(kind, kind),
+            section or "-",
+            *((model,) if routed else ()),
+            str(calls),
+            str(cached),
+            f"{input_tokens:,}",
+            f"{output_tokens:,}",
+        )
+    console.print(table)
+
+    pending = plan.pending
+    latency = "within 24h (Batch API)" if plan.batch else f"~{plan.latency:.0f}s"
+    console.print(
+        f"[bold]{len(pending)} call(s), {len(plan.calls) - len(pending)} cached; "
+        f"{plan.input_tokens:,} input + {plan.output_tokens:,} output tokens; "
+        f"~${plan.cost:.4f}{' with the batch discount' if plan.batch else ''}; {latency}.[/bold]"
+    )
+    for call in plan.oversized(config):
+        console.print(
+            f"[bold red]{STEP_NAMES.get(call.kind, call.kind)} '{call.section or 'document'}' needs about "
+            f"{call.input_tokens + call.output_tokens:,} tokens, more than {call.model or default_model} allows, "
+            "and cannot be split further.[/bold red]"
+        )
@@ -0,0 +1,225 @@
+import os
+import re
+import math
+import json
+import threading
+from collections import Counter
+from resumecraftr.cli.artifacts import content_hash
+from resumecraftr.cli.store import get_store
+from resumecraftr.cli.tracing import span
+from resumecraftr.cli.workspace import workspace_root
+
+# Bullet bank: every Responsibilities bullet of every parsed CV in the
+# workspace, indexed with TF-IDF so the bullets of each role that best match a
+# job can be picked locally before tailoring. The bank is kept in the
+# workspace database and only files whose content changed are re-indexed.
+# Bullets are pooled per role across the versions of a CV, so a bullet that
+# only one version kept can still be chosen for the others.
+
+SECTION = "Work Experience"
+BULLETS_FIELD = "Responsibilities"
+SOURCE_SUFFIX = ".extracted_sections.json"
+
+_WORD = re.compile(r"\w+")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the "
+    "their this to was we were will with you your".split()
+)
+
+
+def terms(text: str) -> dict:
+    """Count the terms of a text: lowercase words, without stop words or single characters."""
+    return dict(
+        Counter(
+            word
+            for word in _WORD.findall(text.lower())
+            if len(word) > 1 and word not in STOP_WORDS
+        )
+    )
+
+
+def _normalize(value) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def role_key(entry: dict, owner: str = "") -> str:
+    """Identify a role by the CV owner's name, the job title and the company."""
+    return "|".join(
+        _normalize(value) for value in (owner, entry.get("Job Title"), entry.get("Company"))
+    )
+
+
+def _owner(sections: dict) -> str:
+    contact = sections.get("Contact Information")
+    return contact.get("Full Name") or "" if isinstance(contact, dict) else ""
+
+
+def extract_bullets(sections: dict) -> list:
+    """Return the (role, text, terms) bullets of a CV's sections."""
+    owner = _owner(sections)
+    bullets = []
+    entries = sections.get(SECTION)
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or not isinstance(entry.get(BULLETS_FIELD), list):
+            continue
+        role = role_key(entry, owner)
+        for text in entry[BULLETS_FIELD]:
+            if isinstance(text, str) and text.strip():
+                bullets.append((role, text, terms(text)))
+    return bullets
+
+
+class BulletBank:
+    """
+    TF-IDF index over the bullets of a workspace's parsed CVs.
+
+    Vectors are sparse {term: weight} dicts, L2-normalized, so relevance is a
+    dot product over the terms a bullet and a job description share.
+    """
+
+    def __init__(self, store, root: str):
+        self.store = store
+        self.root = root
+        self.lock = threading.Lock()
+        self._idf = None
+        self._unseen_idf = 1.0
+        self._roles = {}
+
+    def refresh(self) -> bool:
+        """
+        Index new and changed sections files and drop deleted ones.
+
+        Returns:
+            bool: True if the bank changed.
+        """
+        indexed = self.store.bullet_sources()
+        current = set()
+        changed = False
+        names = os.listdir(self.root) if os.path.isdir(self.root) else []
+        for name in sorted(names):
+            if not name.endswith(SOURCE_SUFFIX):
+                continue
+            current.add(name)
+            with open(os.path.join(self.root, name), "r", encoding="utf-8") as f:
+                content = f.read()
+            digest = content_hash(content)
+            if indexed.get(name) == digest:
+                continue
+            try:
+                sections = json.loads(content)
+            except json.JSONDecodeError:
+                continue
+            self.store.index_bullets(
+                name, digest, extract_bullets(sections) if isinstance(sections, dict) else []
+            )
+            changed = True
+        for name in set(indexed) - current:
+            self.store.remove_bullet_source(name)
+            changed = True
+        return changed
+
+    def load(self):
+        """Rebuild the in-memory vectors from the bullets in the database."""
+        bullets = self.store.load_bullets()
+        document_frequency = Counter()
+        for _, _, counts in bullets:
+            document_frequency.update(counts.keys())
+        total = len(bullets)
+        # Smoothed IDF, as if one extra bullet contained every term.
+        self._idf = {
+            term: math.log((1 + total) / (1 + count)) + 1
+            for term, count in document_frequency.items()
+        }
+        self._unseen_idf = math.log(1 + total) + 1
+        self._roles = {}
+        for role, text, counts in bullets:
+            self._roles.setdefault(role, {}).setdefault(text, self.vector(counts))
+
+    def update(self):
+        """Bring the bank up to date with the workspace's sections files."""
+        with self.lock:
+            if self.refresh() or self._idf is None:
+                self.load()
+
+    def vector(self, counts: dict) -> dict:
+        """Weight term counts by IDF and normalize to unit length."""
+        weights = {
+            term: count * self._idf.get(term, self._unseen_idf)
+            for term, count in counts.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {term: weight / norm for term, weight in weights.items()} if norm else {}
+
+    def top_bullets(self, role: str, own: list, job_vector: dict, k: int) -> list:
+        """
+        Pick the k bullets of a role most relevant to a job.
+
+        Args:
+            role (str): The role, from `role_key`.
+            own (list): The bullets the CV entry has now; always candidates.
+            job_vector (dict): The job description's vector.
+            k (int): How many bullets to keep.
+
+        Returns:
+            list: The chosen bullets, most relevant first.
+        """
+        pooled = self._roles.get(role, {})
+        candidates = {}
+        for text in list(own) + list(pooled):
+            if isinstance(text, str) and text not in candidates:
+                candidates[text] = pooled.get(text) or self.vector(terms(text))
+
+        def score(text):
+            vector = candidates[text]
+            return sum(weight * job_vector[term] for term, weight in vector.items() if term in job_vector)
+
+        return sorted(candidates, key=score, reverse=True)[:k]
+
+
+_BANKS = {}
+_BANKS_LOCK = threading.Lock()
+
+
+def get_bullet_bank() -> BulletBank:
+    """Get the current workspace's bullet bank, creating it once per process."""
+    root = workspace_root()
+    key = os.path.abspath(root)
+    with _BANKS_LOCK:
+        if key not in _BANKS:
+            _BANKS[key] = BulletBank(get_store(), root)
+        return _BANKS[key]
+
+
+def select_bullets(sections: dict, job_description: str, top_k: int) -> dict:
+    """
+    Keep only the bullets of each Work Experience entry most relevant to a job.
+
+    Args:
+        sections (dict): The CV sections to tailor.
+        job_description (str): The job description text.
+        top_k (int): Bullets to keep per role.
+
+    Returns:
+        dict: The sections, with each entry's Responsibilities replaced by its
+        top_k bullets from the bank.
+    """
+    entries = sections.get(SECTION)
+    if not top_k or not isinstance(entries, list):
+        return sections
+
+    with span("select_bullets"):
+        bank = get_bullet_bank()
+        bank.update()
+        job_vector = bank.vector(terms(job_description))
+        owner = _owner(sections)
+        selected = []
+        for entry in entries:
+            if isinstance(entry, dict) and isinstance(entry.get(BULLETS_FIELD), list):
+                entry = {
+                    **entry,
+                    BULLETS_FIELD: bank.top_bullets(
+                        role_key(entry, owner), entry[BULLETS_FIELD], job_vector, top_k
+                    ),
+                }
+            selected.append(entry)
+    return {**sections, SECTION: selected}
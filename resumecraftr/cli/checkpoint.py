@@ -0,0 +1,67 @@
+import os
+import json
+import threading
+from resumecraftr.cli.artifacts import content_hash
+from resumecraftr.cli.workspace import workspace_path
+
+# Section results of a run in progress. Each finished section is written as
+# soon as it arrives, so a crash, Ctrl+C or API outage only loses the
+# sections still running, and `--resume` sends only the missing ones.
+
+CHECKPOINT_DIR_NAME = ".checkpoints"
+
+
+class Checkpoint:
+    """
+    Per-run record of the sections already finished for one output file.
+
+    Args:
+        name (str): The output file the run produces, e.g. "cv.optimized_sections.json".
+        inputs (dict): Everything the run's results depend on. A checkpoint
+            written for other inputs is ignored by `load`.
+    """
+
+    def __init__(self, name: str, inputs: dict):
+        self.path = workspace_path(CHECKPOINT_DIR_NAME, name)
+        self.key = content_hash(inputs)
+        self.sections = {}
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> dict:
+        """
+        Return the sections finished by an earlier run of the same inputs.
+
+        Returns:
+            dict: Section contents keyed by section name; empty if there is no
+            checkpoint or it belongs to other inputs.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if data.get("key") != self.key:
+            return {}
+        with self._lock:
+            self.sections = dict(data.get("sections", {}))
+            return dict(self.sections)
+
+    def record(self, section: str, content):
+        """Add a finished section and rewrite the checkpoint atomically."""
+        with self._lock:
+            self.sections[section] = content
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": self.key, "sections": self.sections}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def discard(self):
+        """Remove the checkpoint once the output file has been written."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
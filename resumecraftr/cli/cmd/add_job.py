@@ -1,12 +1,43 @@
 import os
-import json
 import click
 from rich.console import Console
-from rich.prompt import Prompt
+from resumecraftr.cli import minhash
+from resumecraftr.cli.store import get_store
+from resumecraftr.cli.tracing import span
+from resumecraftr.cli.workspace import config_file, workspace_path
 
 console = Console()
-CONFIG_FILE = os.path.join("cv-workspace", "resumecraftr.json")
-JOBS_DIR = os.path.join("cv-workspace", "job_descriptions")
+JOBS_DIR_NAME = "job_descriptions"
+
+
+def index_existing_jobs(store, jobs_dir):
+    """Index the jobs added before near-duplicate detection existed."""
+    for job in store.unindexed_jobs():
+        job_path = os.path.join(jobs_dir, job)
+        if os.path.exists(job_path):
+            with open(job_path, "r", encoding="utf-8") as f:
+                sig = minhash.signature(f.read())
+            store.index_job(job, sig, minhash.bands(sig))
+
+
+def find_similar_jobs(store, job_name, sig, threshold):
+    """
+    Return the stored jobs whose description is a near-duplicate of a signature.
+
+    Returns:
+        list: (job, similarity) pairs at or above `threshold`, most similar first.
+    """
+    with span("similar_jobs"):
+        candidates = store.similar_jobs(minhash.bands(sig), exclude=job_name)
+    matches = [
+        (job, minhash.similarity(sig, candidate)) for job, candidate in candidates.items()
+    ]
+    return sorted(
+        [(job, score) for job, score in matches if score >= threshold],
+        key=lambda match: match[1],
+        reverse=True,
+    )
+
 
 @click.command()
 @click.argument("job_name")
@@ -14,11 +45,23 @@ JOBS_DIR = os.path.join("cv-workspace", "job_descriptions")
 @click.option(
     "--file", "-f", type=click.Path(exists=True), help="Path to a job description file."
 )
-def add_job(job_name, content, file):
+@click.option(
+    "--reuse-similar",
+    is_flag=True,
+    help="If a near-duplicate job exists, reuse its tailoring results for this job.",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(0, 1),
+    default=None,
+    help=f"Similarity (0-1) from which a job counts as a near-duplicate [default: near_duplicate_threshold in resumecraftr.json, or {minhash.DEFAULT_THRESHOLD}].",
+)
+def add_job(job_name, content, file, reuse_similar, threshold):
     """Add a job description by copying content or from a file."""
-    os.makedirs(JOBS_DIR, exist_ok=True)
+    jobs_dir = workspace_path(JOBS_DIR_NAME)
+    os.makedirs(jobs_dir, exist_ok=True)
 
-    job_file = os.path.join(JOBS_DIR, f"{job_name}.txt")
+    job_file = os.path.join(jobs_dir, f"{job_name}.txt")
 
     if file:
         with open(file, "r", encoding="utf-8") as f:
@@ -34,24 +77,49 @@ def add_job(job_name, content, file):
     with open(job_file, "w", encoding="utf-8") as f:
         f.write(job_content)
 
-    # Update resumecraftr.json
-    config = {}
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, "r", encoding="utf-8") as config_file:
-            config = json.load(config_file)
+    # Register the job in the workspace store, which also updates resumecraftr.json
+    store = get_store()
+    job_name = os.path.basename(job_file)
+    store.add_job(job_name)
 
-    job_list = config.get("job_descriptions", [])
-    if os.path.basename(job_file) not in job_list:
-        job_list.append(os.path.basename(job_file))
-    config["job_descriptions"] = job_list
+    console.print(f"[bold green]Job description saved: {job_file}[/bold green]")
+    console.print(
+        f"[bold green]Updated {config_file()} with job description reference.[/bold green]"
+    )
 
-    with open(CONFIG_FILE, "w", encoding="utf-8") as config_file:
-        json.dump(config, config_file, indent=4)
+    if threshold is None:
+        threshold = store.load_config().get("near_duplicate_threshold", minhash.DEFAULT_THRESHOLD)
+    with span("minhash"):
+        sig = minhash.signature(job_content)
+    store.index_job(job_name, sig, minhash.bands(sig))
+    index_existing_jobs(store, jobs_dir)
+    matches = find_similar_jobs(store, job_name, sig, threshold)
 
-    console.print(f"[bold green]Job description saved: {job_file}[/bold green]")
+    # Forget any earlier mapping; the description may have changed.
+    store.set_job_alias(job_name, None)
+    if not matches:
+        return
+
+    for job, score in matches:
+        console.print(
+            f"[bold yellow]Near-duplicate of '{job}' ({score:.0%} similar).[/bold yellow]"
+        )
+    if not reuse_similar:
+        console.print(
+            "[cyan]Add it again with --reuse-similar to reuse that job's tailoring results.[/cyan]"
+        )
+        return
+
+    # Point at the original description, not at another copy of it.
+    best = matches[0][0]
+    original = store.job_alias(best) or best
+    store.set_job_alias(job_name, original)
+    tailored = [a for a in store.list_artifacts(job=original) if a["kind"] == "optimized_sections"]
     console.print(
-        f"[bold green]Updated {CONFIG_FILE} with job description reference.[/bold green]"
+        f"[bold green]'{job_name}' will be tailored with the description of '{original}'"
+        + (", reusing the CVs already tailored to it." if tailored else ".")
+        + "[/bold green]"
     )
 
 if __name__ == "__main__":
-    add_job() 
\ No newline at end of file
+    add_job()
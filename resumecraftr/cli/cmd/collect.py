@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import click
+from rich.console import Console
+from resumecraftr.cli.artifacts import get_artifact_store
+from resumecraftr.cli.batch import TERMINAL_STATUSES, batch_replies
+from resumecraftr.cli.agent import get_openai_client
+from resumecraftr.cli.cmd.parse_cv import save_extracted_sections
+from resumecraftr.cli.cmd.tailor_cv import (
+    load_sections_file,
+    read_job_description,
+    save_optimized_sections,
+)
+from resumecraftr.cli.repair import repair_retries
+from resumecraftr.cli.schemas import section_specs
+from resumecraftr.cli.section_prompt import SectionPrompt, merge_parts
+from resumecraftr.cli.store import get_store, load_config
+from resumecraftr.cli.tracing import span
+from resumecraftr.cli.workspace import config_file, workspace_path
+
+console = Console()
+
+
+def _read_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _section_order(sections):
+    """Order sections as in sections.json, followed by any custom sections."""
+    order = {name: index for index, name in enumerate(section_specs())}
+    return dict(sorted(sections.items(), key=lambda item: order.get(item[0], len(order))))
+
+
+def collect_target(config, target, replies, errors):
+    """
+    Complete the replies of one output file and store them in the artifact cache.
+
+    A section sent as several prompts (see `api.extraction_parts`) is merged
+    from its parts, in order, and dropped if any part is missing.
+
+    Returns:
+        dict: Section contents keyed by section name, including those that were
+        already cached when the batch was submitted.
+    """
+    artifact_store = get_artifact_store()
+    retries = repair_retries(config)
+    results = dict(target["cached"])
+    parts, kinds = {}, {}
+    for custom_id, record in target["prompts"].items():
+        section_prompt = SectionPrompt.from_record(record)
+        kinds[section_prompt.section] = section_prompt.kind
+        section_parts = parts.setdefault(section_prompt.section, [])
+        if custom_id not in replies:
+            console.print(
+                f"[bold red]No reply for section '{section_prompt.section}' of "
+                f"{target['cv']}: {errors.get(custom_id, 'request did not finish')}[/bold red]"
+            )
+            section_parts.append(None)
+            continue
+        stored = section_prompt.complete(replies[custom_id], retries)
+        if stored is None:
+            console.print(
+                f"[bold red]Failed to parse JSON for section '{section_prompt.section}' "
+                f"of {target['cv']}. Skipping.[/bold red]"
+            )
+            section_parts.append(None)
+            continue
+        artifact_store.put(section_prompt.kind, section_prompt.inputs, stored)
+        section_parts.append(json.loads(stored))
+    for section, contents in parts.items():
+        content = None if None in contents else merge_parts(kinds[section], contents)
+        if content is not None:
+            results[section] = content
+    return _section_order(results)
+
+
+def collect_batch(config, batch, record):
+    """Merge a finished batch into the workspace's section files."""
+    replies, errors = batch_replies(batch)
+    for target in record["targets"]:
+        results = collect_target(config, target, replies, errors)
+        if record["command"] == "parse-cv":
+            text_content = _read_text(workspace_path(target["cv"]))
+            output_path = save_extracted_sections(config, target["cv"], text_content, results)
+        else:
+            sections_content = load_sections_file(target["cv"])
+            if sections_content is None:
+                continue
+            job_description, _ = read_job_description(target["job"])
+            output_path = save_optimized_sections(
+                config, target["cv"], target["job"], sections_content, job_description, results
+            )
+        console.print(f"[bold green]Saved: {output_path}[/bold green]")
+
+
+@click.command()
+@click.option("--wait", is_flag=True, help="Keep polling until every pending batch has finished.")
+@click.option("--interval", default=60.0, show_default=True, help="Seconds between polls with --wait.")
+def collect(wait, interval):
+    """Merge finished OpenAI batches into the parsed and tailored CV files."""
+    if not os.path.exists(config_file()):
+        console.print(
+            "[bold red]Configuration file not found. Run 'resumecraftr setup' first.[/bold red]"
+        )
+        return
+
+    store = get_store()
+    pending = store.list_batches(pending=True)
+    if not pending:
+        console.print("[bold yellow]No pending batches.[/bold yellow]")
+        return
+
+    config = load_config()
+    client = get_openai_client()
+
+    while True:
+        waiting = []
+        for record in pending:
+            with span("batches.retrieve"):
+                batch = client.batches.retrieve(record["id"])
+            store.update_batch(batch.id, batch.status)
+            if batch.status not in TERMINAL_STATUSES:
+                counts = batch.request_counts
+                progress = f" ({counts.completed}/{counts.total})" if counts else ""
+                console.print(f"[cyan]Batch {batch.id} ({record['command']}) is {batch.status}{progress}.[/cyan]")
+                waiting.append(record)
+                continue
+
+            if batch.status == "failed":
+                console.print(f"[bold red]Batch {batch.id} failed; nothing to collect.[/bold red]")
+            else:
+                if batch.status != "completed":
+                    console.print(
+                        f"[bold yellow]Batch {batch.id} {batch.status}; collecting the requests that finished.[/bold yellow]"
+                    )
+                collect_batch(config, batch, record)
+            store.update_batch(batch.id, batch.status, collected=True)
+
+        if not wait or not waiting:
+            break
+        time.sleep(interval)
+        pending = waiting
+
+
+if __name__ == "__main__":
+    collect()
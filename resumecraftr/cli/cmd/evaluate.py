@@ -0,0 +1,89 @@
+import os
+import click
+from rich.console import Console
+from resumecraftr.cli.evaluation import (
+    STEPS,
+    VARIANTS_FILE,
+    load_corpus,
+    load_variants,
+    print_report,
+    run_variant,
+    summarize,
+    write_report,
+)
+from resumecraftr.cli.store import load_config
+from resumecraftr.cli.workspace import config_file
+
+console = Console()
+
+
+@click.command(name="eval")
+@click.argument("corpus", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--variants",
+    "variants_file",
+    type=click.Path(exists=True, dir_okay=False),
+    help=f"Variants to compare, as {{name: config overlay}} JSON. Defaults to the corpus's {VARIANTS_FILE}.",
+)
+@click.option("--variant", "only", multiple=True, help="Only run this variant; repeat for several.")
+@click.option(
+    "--step",
+    type=click.Choice(STEPS + ("all",)),
+    default="all",
+    show_default=True,
+    help="Which step to evaluate.",
+)
+@click.option("--repeat", type=click.IntRange(min=1), default=1, show_default=True, help="Runs per corpus item.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Also write the summary and every sample as JSON.")
+def evaluate(corpus, variants_file, only, step, repeat, output):
+    """Compare prompt revisions and models on a corpus of CVs and job descriptions."""
+    if not os.path.exists(config_file()):
+        console.print(
+            "[bold red]Configuration file not found. Run 'resumecraftr setup' first.[/bold red]"
+        )
+        return
+
+    inputs = load_corpus(corpus)
+    if not inputs.cvs:
+        console.print(f"[bold red]No CVs found in {os.path.join(corpus, 'cvs')}.[/bold red]")
+        return
+
+    try:
+        variants = load_variants(variants_file or os.path.join(corpus, VARIANTS_FILE), load_config())
+    except ValueError as e:
+        console.print(f"[bold red]{e}[/bold red]")
+        return
+    unknown = [name for name in only if name not in variants]
+    if unknown:
+        console.print(f"[bold red]Unknown variant(s): {', '.join(unknown)}.[/bold red]")
+        return
+    steps = STEPS if step == "all" else (step,)
+
+    def report(sample):
+        console.print(
+            f"[cyan]{sample.variant} {sample.step} {sample.item}: {sample.seconds:.2f}s, "
+            f"{sample.calls} call(s), {sample.sections} section(s), {sample.failed} failed[/cyan]"
+        )
+
+    samples = []
+    for name, config in variants.items():
+        if only and name not in only:
+            continue
+        console.print(f"[bold blue]Evaluating variant '{name}'...[/bold blue]")
+        try:
+            samples.extend(run_variant(name, config, inputs, steps, repeat, on_sample=report))
+        except Exception as e:
+            console.print(f"[bold red]Variant '{name}' failed: {e}[/bold red]")
+
+    if not samples:
+        console.print("[bold yellow]Nothing was measured.[/bold yellow]")
+        return
+    rows = summarize(samples)
+    print_report(console, rows)
+    if output:
+        write_report(output, rows, samples)
+        console.print(f"[bold green]Report saved to: {output}[/bold green]")
+
+
+if __name__ == "__main__":
+    evaluate()
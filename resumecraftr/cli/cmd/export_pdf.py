@@ -3,25 +3,60 @@ import os
 import json
 import subprocess
 from rich.console import Console
+from rich.markdown import Markdown
 from rich.prompt import Prompt
-from resumecraftr.cli.agent import execute_prompt, create_or_get_agent
-from resumecraftr.cli.prompts.pdf import MARKDOWN_PROMPT
+from resumecraftr.api import (
+    ResumeCraftr,
+    ResumeCraftrError,
+    markdown_call,
+    markdown_inputs,
+    markdown_prompt,
+    plan_calls,
+)
+from resumecraftr.cli.agent import create_or_get_agent
+from resumecraftr.cli.artifacts import get_artifact_store
+from resumecraftr.cli.budget import print_plan
+from resumecraftr.cli.markdown_stream import MarkdownStream
+from resumecraftr.cli.routing import print_routing, route_for
+from resumecraftr.cli.section_prompt import SectionPrompt
+from resumecraftr.cli.store import get_store
+from resumecraftr.cli.warmup import in_background, warm_up_openai
+from resumecraftr.cli.tracing import span
 from datetime import datetime
+from resumecraftr.cli.workspace import config_file, workspace_path, workspace_root
 
 console = Console()
-CONFIG_FILE = "cv-workspace/resumecraftr.json"
-MD_TEMPLATE = "cv-workspace/resume_template.md"
-CUSTOM_PROMPT = "cv-workspace/custom.md"
+MD_TEMPLATE_NAME = "resume_template.md"
+CUSTOM_PROMPT_NAME = "custom.md"
+PANDOC_ARGS = [
+    "--pdf-engine=xelatex",
+    "--variable", "mainfont=DejaVu Sans",
+    "--variable", "sansfont=DejaVu Sans",
+    "--variable", "monofont=DejaVu Sans Mono",
+    "--variable", "fontsize=11pt",
+    "--variable", "geometry=margin=2.5cm",
+    "--variable", "linestretch=1.25",
+    "--variable", "colorlinks=true",
+    "--variable", "linkcolor=blue",
+    "--variable", "urlcolor=blue",
+    "--variable", "toccolor=blue",
+    "--variable", "documentclass=article",
+    "--variable", "header-includes=\\usepackage[utf8]{inputenc}\\usepackage[T1]{fontenc}\\usepackage{hyperref}",
+    "--standalone",
+    "--from", "markdown+yaml_metadata_block",
+    "--to", "pdf",
+]
 
 def check_pandoc():
     """Check if pandoc is installed and provide installation instructions if not."""
     try:
-        subprocess.run(
-            ["pandoc", "--version"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True,
-        )
+        with span("pandoc.check"):
+            subprocess.run(
+                ["pandoc", "--version"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True,
+            )
         return True
     except (FileNotFoundError, subprocess.CalledProcessError):
         return False
@@ -74,6 +109,36 @@ Once installed, retry running `resumecraftr export-pdf`! ✅
 """
     console.print(Markdown(instructions))
 
+def load_custom_instructions():
+    """Return the contents of custom.md, or "None" when the workspace has none."""
+    custom_prompt = workspace_path(CUSTOM_PROMPT_NAME)
+    if not os.path.exists(custom_prompt):
+        return "None"
+    with open(custom_prompt, "r", encoding="utf-8") as f:
+        return f.read().strip() or "None"
+
+def export_language(config, language=None, translate=False, target_language=None):
+    """Return the language to export in: the target or given one, else `primary_language`, else "EN"."""
+    if translate and target_language:
+        return target_language
+    return language or config.get("primary_language", "EN")
+
+def pdf_output_path(sections_file, language):
+    """Return the PDF path generated for a given optimized sections file and language."""
+    sections_base_name = os.path.splitext(sections_file)[0].replace("_optimized_sections", "")
+    return workspace_path(f"{sections_base_name}_{language.lower()}.pdf")
+
+def convert_markdown_to_pdf(md_file, pdf_file):
+    """
+    Convert a Markdown file to PDF with Pandoc.
+
+    Returns:
+        subprocess.CompletedProcess: The finished Pandoc process.
+    """
+    pandoc_cmd = ["pandoc", md_file, "-o", pdf_file] + PANDOC_ARGS
+    with span("pandoc"):
+        return subprocess.run(pandoc_cmd, check=False, capture_output=True, text=True)
+
 @click.command()
 @click.option(
     "--skip-md-gen",
@@ -95,20 +160,37 @@ Once installed, retry running `resumecraftr export-pdf`! ✅
     type=str,
     help="Target language for translation (e.g., 'en', 'es'). Required if --translate is used.",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Generate the Markdown with OpenAI even if a stored document for the same inputs exists.",
+)
+@click.option(
+    "--plan",
+    "show_plan",
+    is_flag=True,
+    help="Print the calls, tokens, cost and time this would take, without calling OpenAI.",
+)
 def export_pdf(
     skip_md_gen: bool = False,
     language: str = None,
     translate: bool = False,
     target_language: str = None,
+    no_cache: bool = False,
+    show_plan: bool = False,
 ):
     """Export a PDF resume using Pandoc."""
-    if not check_pandoc():
-        print_pandoc_installation_guide()
+    if show_plan and skip_md_gen:
+        console.print("[bold]With --skip-md-gen, export-pdf makes no OpenAI calls.[/bold]")
         return
 
+    # Look for Pandoc and connect to OpenAI while the user picks files; the
+    # results are waited for right before they are needed.
+    pandoc = None if show_plan else in_background("pandoc", check_pandoc)
+
     # Load configuration
     try:
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+        with open(config_file(), "r", encoding="utf-8") as f:
             config = json.load(f)
     except FileNotFoundError:
         console.print("[bold red]Configuration file not found. Please run 'resumecraftr init' first.[/bold red]")
@@ -117,25 +199,20 @@ def export_pdf(
         console.print("[bold red]Invalid configuration file. Please run 'resumecraftr init' first.[/bold red]")
         return
 
-    # Determine language
-    if translate and target_language:
-        language = target_language
-    elif not language:
-        language = config.get("default_language", "en")
+    language = export_language(config, language, translate, target_language)
 
     console.print(f"[bold blue]Generating resume in language: {language}[/bold blue]")
 
-    # Only create the agent when we're about to use OpenAI
-    if not skip_md_gen:
-        create_or_get_agent()
+    if not skip_md_gen and not show_plan:
+        warm_up_openai()
 
     # Get the Markdown file to use
     if skip_md_gen:
         # Find existing Markdown files in the workspace that start with "openai-response"
-        md_files = [f for f in os.listdir("cv-workspace") if f.endswith(".md") and f.startswith("openai-response")]
+        md_files = [f for f in os.listdir(workspace_root()) if f.endswith(".md") and f.startswith("openai-response")]
         
         if not md_files:
-            console.print("[bold red]No OpenAI response Markdown files found in cv-workspace directory.[/bold red]")
+            console.print(f"[bold red]No OpenAI response Markdown files found in {workspace_root()} directory.[/bold red]")
             return
             
         if len(md_files) > 1:
@@ -146,11 +223,11 @@ def export_pdf(
         else:
             md_file = md_files[0]
             
-        output_md_file = os.path.join("cv-workspace", md_file)
+        output_md_file = workspace_path(md_file)
         console.print(f"[bold blue]Using OpenAI response file: {md_file}[/bold blue]")
         
         # Find the corresponding sections file
-        sections_files = [f for f in os.listdir("cv-workspace") if f.endswith(".optimized_sections.json")]
+        sections_files = [f for f in os.listdir(workspace_root()) if f.endswith(".optimized_sections.json")]
         if not sections_files:
             console.print("[bold red]No optimized CV sections files found. Please run 'resumecraftr tailor-cv' first.[/bold red]")
             return
@@ -162,11 +239,15 @@ def export_pdf(
             )
         else:
             sections_file = sections_files[0]
+
+        if not pandoc.result():
+            print_pandoc_installation_guide()
+            return
     else:
         # Normal flow - generate Markdown with OpenAI
         # Load the Markdown template
         try:
-            with open(MD_TEMPLATE, "r", encoding="utf-8") as f:
+            with open(workspace_path(MD_TEMPLATE_NAME), "r", encoding="utf-8") as f:
                 template = f.read()
         except FileNotFoundError:
             console.print("[bold red]Markdown template not found.[/bold red]")
@@ -175,7 +256,7 @@ def export_pdf(
         # Load the parsed CV sections
         try:
             # Find all optimized sections files
-            sections_files = [f for f in os.listdir("cv-workspace") if f.endswith(".optimized_sections.json")]
+            sections_files = [f for f in os.listdir(workspace_root()) if f.endswith(".optimized_sections.json")]
             
             if not sections_files:
                 console.print("[bold red]No optimized CV sections files found. Please run 'resumecraftr tailor-cv' first.[/bold red]")
@@ -189,7 +270,7 @@ def export_pdf(
             else:
                 sections_file = sections_files[0]
                 
-            with open(f"cv-workspace/{sections_file}", "r", encoding="utf-8") as f:
+            with open(workspace_path(sections_file), "r", encoding="utf-8") as f:
                 cv_sections = json.load(f)
         except FileNotFoundError:
             console.print("[bold red]Selected CV sections file not found.[/bold red]")
@@ -201,7 +282,7 @@ def export_pdf(
         # Load the job description
         try:
             # Find all job description files
-            job_files = [f for f in os.listdir("cv-workspace/job_descriptions") if f.endswith(".txt")]
+            job_files = [f for f in os.listdir(workspace_path("job_descriptions")) if f.endswith(".txt")]
             
             if not job_files:
                 console.print("[bold red]No job description files found. Please run 'resumecraftr add-job' first.[/bold red]")
@@ -215,14 +296,14 @@ def export_pdf(
             else:
                 job_file = job_files[0]
                 
-            with open(f"cv-workspace/job_descriptions/{job_file}", "r", encoding="utf-8") as f:
+            with open(workspace_path("job_descriptions", job_file), "r", encoding="utf-8") as f:
                 job_description = f.read()
         except FileNotFoundError:
             console.print("[bold red]Selected job description file not found.[/bold red]")
             return
 
         # Load the tailored CV if it exists
-        tailored_cv_path = "cv-workspace/tailored/tailored_cv.json"
+        tailored_cv_path = workspace_path("tailored", "tailored_cv.json")
         if os.path.exists(tailored_cv_path):
             try:
                 with open(tailored_cv_path, "r", encoding="utf-8") as f:
@@ -233,67 +314,96 @@ def export_pdf(
         else:
             tailored_cv = None
 
-        # Prepare the prompt
-        prompt = MARKDOWN_PROMPT.format(
-            template=template,
-            cv_sections=json.dumps(cv_sections, indent=2),
-            job_description=job_description,
-            tailored_cv=json.dumps(tailored_cv, indent=2) if tailored_cv else "None",
-            language=language,
-        )
+        custom = load_custom_instructions()
+        route = route_for(config, "markdown")
+        if show_plan:
+            prompt = markdown_prompt(
+                template, cv_sections, job_description, language, tailored_cv, custom
+            )
+            markdown_request = SectionPrompt(
+                kind="markdown",
+                section="",
+                prompt=prompt,
+                structured=False,
+                expected=None,
+                inputs=markdown_inputs(
+                    template, cv_sections, job_description, language, tailored_cv, custom, route
+                ),
+                route=route,
+            )
+            config["artifact_cache"] = not no_cache
+            print_plan(
+                console,
+                plan_calls(config, [(markdown_request, markdown_call(prompt, cv_sections, route))]),
+                config,
+            )
+            return
+
+        if not pandoc.result():
+            print_pandoc_installation_guide()
+            return
+        # Waits for the warm-up; connects here if it failed.
+        create_or_get_agent()
 
         # Generate the Markdown content
+        print_routing(console, config, "markdown")
         try:
-            # Generate Markdown with the agent
-            markdown_content = execute_prompt(prompt)
-            
-            if not markdown_content.strip():
-                console.print("[bold red]Error: OpenAI did not return a valid Markdown document.[/bold red]")
-                return
-
-            # Save the OpenAI response
-            output_md_file = os.path.join(
-                "cv-workspace",
+            # The document is written to its file and shown as it is generated,
+            # so an interrupted run still leaves something for --skip-md-gen.
+            output_md_file = workspace_path(
                 f"openai-response-{datetime.now().strftime('%Y%m%d-%H%M%S')}.md",
             )
-            with open(output_md_file, "w", encoding="utf-8") as f:
-                f.write(markdown_content)
+            stream = MarkdownStream(
+                output_md_file,
+                echo=lambda piece: console.out(piece, end="", highlight=False),
+            )
+            try:
+                markdown_content = ResumeCraftr(config=config, use_cache=not no_cache).render(
+                    cv_sections,
+                    job_description,
+                    language=language,
+                    template=template,
+                    tailored_cv=tailored_cv,
+                    custom=custom,
+                    on_delta=stream,
+                )
+            except (ResumeCraftrError, KeyboardInterrupt) as e:
+                stream.close()
+                if stream.pieces:
+                    console.out("")
+                    console.print(
+                        f"[bold yellow]The partial Markdown is kept in {output_md_file}; complete it and run "
+                        "'resumecraftr export-pdf --skip-md-gen'.[/bold yellow]"
+                    )
+                if isinstance(e, KeyboardInterrupt):
+                    raise
+                console.print(f"[bold red]Error: {e}[/bold red]")
+                return
+            if stream.pieces:
+                console.out("")
+            stream.close(markdown_content)
             console.print(f"[bold green]Markdown content saved to: {output_md_file}[/bold green]")
+            get_store().record_artifact(
+                output_md_file,
+                "markdown",
+                cv=sections_file.replace(".optimized_sections.json", ".txt"),
+                job=job_file,
+                blob=get_artifact_store().write_blob(markdown_content),
+                inputs=markdown_inputs(
+                    template, cv_sections, job_description, language, tailored_cv, custom, route
+                ),
+            )
         except Exception as e:
             console.print(f"[bold red]Error generating Markdown content: {e}[/bold red]")
             return
 
-    # Get the base name of the sections file for the PDF output
-    sections_base_name = os.path.splitext(sections_file)[0].replace("_optimized_sections", "")
-    output_pdf_file = os.path.join("cv-workspace", f"{sections_base_name}_{language.lower()}.pdf")
+    output_pdf_file = pdf_output_path(sections_file, language)
 
     console.print(f"[bold cyan]Converting Markdown to PDF: {output_md_file}[/bold cyan]")
 
     # Convert Markdown to PDF using Pandoc
     try:
-        pandoc_cmd = [
-            "pandoc",
-            output_md_file,
-            "-o", output_pdf_file,
-            "--pdf-engine=xelatex",
-            "--variable", "mainfont=DejaVu Sans",
-            "--variable", "sansfont=DejaVu Sans",
-            "--variable", "monofont=DejaVu Sans Mono",
-            "--variable", "fontsize=11pt",
-            "--variable", "geometry=margin=2.5cm",
-            "--variable", "linestretch=1.25",
-            "--variable", "colorlinks=true",
-            "--variable", "linkcolor=blue",
-            "--variable", "urlcolor=blue",
-            "--variable", "toccolor=blue",
-            "--variable", "documentclass=article",
-            "--variable", "header-includes=\\usepackage[utf8]{inputenc}\\usepackage[T1]{fontenc}\\usepackage{hyperref}",
-            "--standalone",
-            "--from", "markdown+yaml_metadata_block",
-            "--to", "pdf",
-        ]
-        
-        result = subprocess.run(pandoc_cmd, check=False, capture_output=True, text=True)
+        result = convert_markdown_to_pdf(output_md_file, output_pdf_file)
         
         if result.returncode != 0:
             console.print(f"[bold red]Error during PDF export:[/bold red]")
@@ -304,6 +414,11 @@ def export_pdf(
         console.print(
             f"[bold green]PDF successfully exported: {output_pdf_file}[/bold green]"
         )
+        get_store().record_artifact(
+            output_pdf_file,
+            "pdf",
+            cv=sections_file.replace(".optimized_sections.json", ".txt"),
+        )
     except Exception as e:
         console.print(f"[bold red]Error during PDF export: {e}[/bold red]")
         console.print(
@@ -5,10 +5,11 @@ from rich.console import Console
 from rich.prompt import Prompt
 from resumecraftr.cli.agent import execute_prompt, create_or_get_agent
 from resumecraftr.cli.prompts.resume import RAW_PROMPTS
+from resumecraftr.cli.store import get_store, load_config
 from resumecraftr.cli.utils.json import clean_json_response
+from resumecraftr.cli.workspace import config_file, workspace_path, workspace_root
 
 console = Console()
-CONFIG_FILE = os.path.join("cv-workspace", "resumecraftr.json")
 
 def extract_sections_from_cv(config, cv_content):
     """
@@ -34,14 +35,13 @@ def extract_sections_from_cv(config, cv_content):
 @click.option("--dummy", is_flag=True, help="Create a dummy CV without extraction")
 def extract_sections(dummy):
     """Extract sections from a CV."""
-    if not os.path.exists(CONFIG_FILE):
+    if not os.path.exists(config_file()):
         console.print(
             "[bold red]Configuration file not found. Run 'resumecraftr init' first.[/bold red]"
         )
         return
 
-    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-        config = json.load(f)
+    config = load_config()
 
     if dummy:
         # Create a dummy CV sections file
@@ -60,21 +60,16 @@ def extract_sections(dummy):
         # Generate a unique filename
         base_name = "dummy"
         counter = 1
-        while os.path.exists(os.path.join("cv-workspace", f"{base_name}{counter}.extracted_sections.json")):
+        while os.path.exists(workspace_path(f"{base_name}{counter}.extracted_sections.json")):
             counter += 1
         
-        output_file = os.path.join("cv-workspace", f"{base_name}{counter}.extracted_sections.json")
+        output_file = workspace_path(f"{base_name}{counter}.extracted_sections.json")
         
         with open(output_file, "w", encoding="utf-8") as f:
             json.dump(dummy_sections, f, indent=4, ensure_ascii=False)
         
         # Update config
-        if "extracted_files" not in config:
-            config["extracted_files"] = []
-        config["extracted_files"].append(f"{base_name}{counter}.txt")
-        
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=4, ensure_ascii=False)
+        get_store().add_cv(f"{base_name}{counter}.txt")
         
         console.print(f"[bold green]Created dummy CV sections file: {output_file}[/bold green]")
         return
@@ -82,10 +77,10 @@ def extract_sections(dummy):
     # Only create the agent when we're about to use OpenAI
     create_or_get_agent()
 
-    cv_files = [f for f in os.listdir("cv-workspace") if f.endswith(".txt") and not f.startswith("dummy")]
+    cv_files = [f for f in os.listdir(workspace_root()) if f.endswith(".txt") and not f.startswith("dummy")]
 
     if not cv_files:
-        console.print("[bold red]No CV files found in cv-workspace directory.[/bold red]")
+        console.print(f"[bold red]No CV files found in {workspace_root()} directory.[/bold red]")
         return
 
     if len(cv_files) > 1:
@@ -93,7 +88,7 @@ def extract_sections(dummy):
     else:
         cv_file = cv_files[0]
 
-    cv_path = os.path.join("cv-workspace", cv_file)
+    cv_path = workspace_path(cv_file)
 
     with open(cv_path, "r", encoding="utf-8") as f:
         cv_content = f.read()
@@ -104,18 +99,11 @@ def extract_sections(dummy):
     if sections is None:
         return
 
-    output_file = os.path.join(
-        "cv-workspace", cv_file.replace(".txt", ".extracted_sections.json")
-    )
+    output_file = workspace_path(cv_file.replace(".txt", ".extracted_sections.json"))
 
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(sections, f, indent=4, ensure_ascii=False)
 
-    if "extracted_files" not in config:
-        config["extracted_files"] = []
-    config["extracted_files"].append(cv_file)
-
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=4, ensure_ascii=False)
+    get_store().add_cv(cv_file)
 
     console.print(f"[bold green]Sections extracted and saved to: {output_file}[/bold green]") 
\ No newline at end of file
@@ -6,11 +6,11 @@ from rich.console import Console
 from rich.prompt import Prompt
 from resumecraftr.cli.agent import execute_prompt, create_or_get_agent
 from resumecraftr.cli.prompts.pdf import MARKDOWN_PROMPT
+from resumecraftr.cli.workspace import config_file, workspace_path, workspace_root
 
 console = Console()
-CONFIG_FILE = "cv-workspace/resumecraftr.json"
-MD_TEMPLATE = "cv-workspace/resume_template.md"
-CUSTOM_PROMPT = "cv-workspace/custom.md"
+MD_TEMPLATE_NAME = "resume_template.md"
+CUSTOM_PROMPT_NAME = "custom.md"
 
 def check_pandoc():
     """Check if pandoc is installed and provide installation instructions if not."""
@@ -85,21 +85,21 @@ def extract_pdf():
         return
 
     # Load configuration
-    if not os.path.exists(CONFIG_FILE):
+    if not os.path.exists(config_file()):
         console.print(
             "[bold red]Configuration file not found. Run 'resumecraftr init' first.[/bold red]"
         )
         return
 
-    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+    with open(config_file(), "r", encoding="utf-8") as f:
         config = json.load(f)
 
-    with open(CUSTOM_PROMPT, "r", encoding="utf-8") as f:
+    with open(workspace_path(CUSTOM_PROMPT_NAME), "r", encoding="utf-8") as f:
         custom_promt = f.readlines()
 
     # Find extracted sections files
     extracted_files = []
-    for file in os.listdir("cv-workspace"):
+    for file in os.listdir(workspace_root()):
         if file.endswith(".extracted_sections.json"):
             extracted_files.append(file)
 
@@ -115,7 +115,7 @@ def extract_pdf():
             "Multiple extracted CV files detected. Choose one", choices=extracted_files
         )
 
-    sections_path = os.path.abspath(os.path.join("cv-workspace", sections_file))
+    sections_path = os.path.abspath(workspace_path(sections_file))
     if not os.path.exists(sections_path):
         console.print(
             f"[bold red]Selected extracted sections file '{sections_file}' does not exist.[/bold red]"
@@ -128,13 +128,14 @@ def extract_pdf():
         extracted_sections = json.load(f)
 
     # Load Markdown template
-    if not os.path.exists(MD_TEMPLATE):
+    md_template = workspace_path(MD_TEMPLATE_NAME)
+    if not os.path.exists(md_template):
         console.print(
-            f"[bold red]Markdown template '{MD_TEMPLATE}' not found.[/bold red]"
+            f"[bold red]Markdown template '{md_template}' not found.[/bold red]"
         )
         return
 
-    with open(MD_TEMPLATE, "r", encoding="utf-8") as f:
+    with open(md_template, "r", encoding="utf-8") as f:
         md_template = f.read()
 
     # Convert JSON to string for OpenAI
@@ -165,9 +166,7 @@ def extract_pdf():
         return
 
     # Save the Markdown file
-    output_md_file = os.path.join(
-        "cv-workspace", sections_file.replace(".extracted_sections.json", ".md")
-    )
+    output_md_file = workspace_path(sections_file.replace(".extracted_sections.json", ".md"))
     output_pdf_file = output_md_file.replace(".md", ".pdf")
 
     with open(output_md_file, "w", encoding="utf-8") as f:
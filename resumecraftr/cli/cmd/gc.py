@@ -0,0 +1,35 @@
+import os
+import click
+from rich.console import Console
+from resumecraftr.cli.artifacts import get_artifact_store
+from resumecraftr.cli.workspace import config_file
+
+console = Console()
+
+
+@click.command()
+@click.option(
+    "--max-age",
+    type=float,
+    help="Also forget cached results that have not been reused for this many days.",
+)
+@click.option("--dry-run", is_flag=True, help="Only report what would be removed.")
+def gc(max_age, dry_run):
+    """Remove stored artifacts that nothing references anymore."""
+    if not os.path.exists(config_file()):
+        console.print(
+            "[bold red]Configuration file not found. Run 'resumecraftr setup' first.[/bold red]"
+        )
+        return
+
+    result = get_artifact_store().gc(max_age_days=max_age, dry_run=dry_run)
+    verb = "Would remove" if dry_run else "Removed"
+    console.print(
+        f"[bold green]{verb} {result['blobs']} blob(s) ({result['bytes'] / 1024:.1f} KiB), "
+        f"{result['artifacts']} record(s) of deleted files and "
+        f"{result['cache_entries']} expired cache entr{'y' if result['cache_entries'] == 1 else 'ies'}.[/bold green]"
+    )
+
+
+if __name__ == "__main__":
+    gc()
@@ -1,12 +1,12 @@
 import click
 import os
-import json
 import PyPDF2
 from rich.console import Console
 from rich.progress import Progress
+from resumecraftr.cli.store import get_store
+from resumecraftr.cli.workspace import config_file, workspace_root
 
 console = Console()
-CONFIG_FILE = "cv-workspace/resumecraftr.json"
 
 @click.command()
 @click.argument("pdf_path", type=click.Path(exists=True))
@@ -20,7 +20,7 @@ def import_cv(pdf_path):
     Returns:
         None
     """
-    workspace_dir = "cv-workspace"
+    workspace_dir = workspace_root()
     os.makedirs(workspace_dir, exist_ok=True)
 
     output_filename = os.path.join(
@@ -49,19 +49,9 @@ def import_cv(pdf_path):
         f"[bold green]CV imported and saved to:[/bold green] {output_filename}"
     )
 
-    # Update resumecraftr.json
-    config = {}
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, "r", encoding="utf-8") as config_file:
-            config = json.load(config_file)
-
-    extracted_files = config.get("extracted_files", [])
-    extracted_files.append(os.path.basename(output_filename))
-    config["extracted_files"] = list(set(extracted_files))  # Ensure unique values
-
-    with open(CONFIG_FILE, "w", encoding="utf-8") as config_file:
-        json.dump(config, config_file, indent=4)
+    # Register the CV in the workspace store, which also updates resumecraftr.json
+    get_store().add_cv(os.path.basename(output_filename))
 
     console.print(
-        f"[bold green]Updated {CONFIG_FILE} with imported file.[/bold green]"
+        f"[bold green]Updated {config_file()} with imported file.[/bold green]"
     ) 
\ No newline at end of file
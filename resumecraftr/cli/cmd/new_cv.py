@@ -3,16 +3,16 @@ import json
 import click
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
-from rich.panel import Panel
 from resumecraftr.cli.prompts.sections import RAW_PROMPTS
+from resumecraftr.cli.store import get_store
+from resumecraftr.cli.workspace import config_file, workspace_path, workspace_root
 
 console = Console()
-CONFIG_FILE = os.path.join("cv-workspace", "resumecraftr.json")
 
 def get_cv_path(cv_name):
     """Get the path to a CV JSON file."""
     # Save directly in cv-workspace directory
-    return os.path.join("cv-workspace", f"dummy_{cv_name}.extracted_sections.json")
+    return workspace_path(f"dummy_{cv_name}.extracted_sections.json")
 
 def load_cv(cv_name):
     """Load a CV from its JSON file."""
@@ -32,46 +32,25 @@ def save_cv(cv_name, cv_data):
 
 def update_config_file(cv_name):
     """Update the resumecraftr.json file to include the new CV."""
-    if not os.path.exists(CONFIG_FILE):
+    if not os.path.exists(config_file()):
         console.print("[bold red]Configuration file not found. Run 'resumecraftr setup' first.[/bold red]")
         return False
     
     try:
-        # Read the current configuration
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            config = json.load(f)
-        
         # Create a dummy text file path to simulate extraction
         dummy_txt_path = f"dummy_{cv_name}.txt"
         
-        # Ensure the extracted_files section exists
-        if "extracted_files" not in config:
-            config["extracted_files"] = []
-            console.print("[bold yellow]Created 'extracted_files' section in configuration.[/bold yellow]")
-        
-        # Add the dummy text file to the extracted_files list if it's not already there
-        if dummy_txt_path not in config["extracted_files"]:
-            config["extracted_files"].append(dummy_txt_path)
-            console.print(f"[bold green]Added '{dummy_txt_path}' to extracted_files.[/bold green]")
-        
         # Create a dummy text file to simulate extraction
-        dummy_txt_full_path = os.path.join("cv-workspace", dummy_txt_path)
+        dummy_txt_full_path = workspace_path(dummy_txt_path)
         with open(dummy_txt_full_path, "w", encoding="utf-8") as f:
             f.write(f"# {cv_name}\n\nThis is a dummy file created for CV '{cv_name}'")
         
-        # Save the updated configuration
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
-        
-        # Verify the update was successful
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            updated_config = json.load(f)
-            if dummy_txt_path in updated_config.get("extracted_files", []):
-                console.print("[bold green]Configuration file updated successfully.[/bold green]")
-                return True
-            else:
-                console.print("[bold red]Failed to update configuration file.[/bold red]")
-                return False
+        # Add the dummy text file to extracted_files; the store commits the
+        # change and rewrites resumecraftr.json in a single transaction
+        if get_store().add_cv(dummy_txt_path):
+            console.print(f"[bold green]Added '{dummy_txt_path}' to extracted_files.[/bold green]")
+        console.print("[bold green]Configuration file updated successfully.[/bold green]")
+        return True
     except Exception as e:
         console.print(f"[bold red]Error updating configuration file: {str(e)}[/bold red]")
         return False
@@ -109,7 +88,7 @@ def new_cv(cv_name):
             cv_data[section] = []
     
     # Ensure cv-workspace directory exists
-    os.makedirs("cv-workspace", exist_ok=True)
+    os.makedirs(workspace_root(), exist_ok=True)
     
     # Save the CV
     save_cv(cv_name, cv_data)
@@ -1,74 +1,130 @@
 import os
 import json
-import re
 import click
-import concurrent.futures
-import importlib.resources
 from rich.console import Console
 from rich.prompt import Prompt
-from resumecraftr.cli.agent import execute_prompt, create_or_get_agent
-from resumecraftr.cli.prompts.sections import RAW_PROMPTS
-from resumecraftr.cli.utils.json import clean_json_response
+from resumecraftr.api import ResumeCraftr, extraction_parts, plan_calls
+from resumecraftr.cli.agent import create_or_get_agent
+from resumecraftr.cli.warmup import warm_up_openai
+from resumecraftr.cli.artifacts import content_hash, get_artifact_store
+from resumecraftr.cli.budget import print_plan
+from resumecraftr.cli.checkpoint import Checkpoint
+from resumecraftr.cli.extractors import extract_locally
+from resumecraftr.cli.routing import print_routing
+from resumecraftr.cli.schemas import load_sections_config
+from resumecraftr.cli.section_prompt import merge_parts
+from resumecraftr.cli.store import get_store, load_config
+from resumecraftr.cli.tracing import span
+from resumecraftr.cli.workspace import config_file, workspace_path
 
 
 console = Console()
-CONFIG_FILE = os.path.join("cv-workspace", "resumecraftr.json")
-try:
-    with importlib.resources.path(
-        "resumecraftr.templates", "sections.json"
-    ) as sections_path:
-        SECTIONS_FILE = str(sections_path)
-except ModuleNotFoundError:
-    console.print(
-        "[bold red]Error: Could not locate the sections file inside the installed package.[/bold red]"
-    )
-OUTPUT_FILE = os.path.join("cv-workspace", "{0}.extracted_sections.json")
+OUTPUT_FILE = "{0}.extracted_sections.json"
 
 
-def process_section(config, section_name, text_content, language):
-    if section_name not in RAW_PROMPTS:
-        console.print(
-            f"[bold red]No prompt found for section '{section_name}'. Skipping extraction.[/bold red]"
+def output_file(file_to_process):
+    """Return the sections file parse-cv writes for a CV text file."""
+    return workspace_path(
+        OUTPUT_FILE.format(
+            file_to_process.replace(".txt", "").replace(".extracted_sections.json", "")
         )
-        return section_name, None
-
-    console.print(f"[cyan]Extracting {section_name} in {language}...[/cyan]")
-    translated_prompt = (
-        f"Extract the following section in {language}:\n\n" + RAW_PROMPTS[section_name]
     )
 
-    raw_result = execute_prompt(
-        translated_prompt.format(language=config.get("primary_language"))
-        .replace("{{", "{")
-        .replace("}}", "}")
-        + "\n\n"
-        + text_content
-    )
-    parsed_result = clean_json_response(raw_result)
 
-    if parsed_result is None:
-        console.print(
-            f"[bold red]Failed to parse JSON for section '{section_name}'. Skipping.[/bold red]"
+def save_extracted_sections(config, file_to_process, text_content, extracted_data):
+    """Write a CV's extracted sections and record them in the workspace store."""
+    output_path = output_file(file_to_process)
+
+    with span("write_outputs"):
+        output_content = json.dumps(extracted_data, indent=4, ensure_ascii=False)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(output_content)
+
+        get_store().record_artifact(
+            output_path,
+            "extracted_sections",
+            cv=file_to_process,
+            blob=get_artifact_store().write_blob(output_content),
+            inputs={
+                "cv": content_hash(text_content),
+                "model": config.get("chat_gpt", {}).get("model"),
+                "language": config.get("primary_language", "EN"),
+            },
         )
+    return output_path
 
-    return section_name, parsed_result  # Devuelve el objeto JSON o None
+
+def batch_target(config, file_to_process, text_content, sections_config):
+    """
+    Split a CV's sections into prompts for a batch and results already cached.
+
+    Returns:
+        dict: A target for `batch.submit_batch`.
+    """
+    language = config.get("primary_language", "EN")
+    artifact_store = get_artifact_store()
+    section_names = [section_info["name"] for section_info in sections_config.get("sections", [])]
+    cached = {
+        name: extraction.content
+        for name, extraction in extract_locally(config, text_content, section_names, language).items()
+    }
+    prompts = []
+    for section_info in sections_config.get("sections", []):
+        if section_info["name"] in cached:
+            continue
+        parts = extraction_parts(config, section_info["name"], text_content, language)
+        if not parts:
+            continue
+        stored = [
+            artifact_store.get(section_prompt.kind, section_prompt.inputs)
+            if config.get("artifact_cache", True)
+            else None
+            for section_prompt, _ in parts
+        ]
+        if None not in stored:
+            cached[section_info["name"]] = merge_parts(
+                parts[0][0].kind, [json.loads(content) for content in stored]
+            )
+        else:
+            prompts.extend(section_prompt for section_prompt, _ in parts)
+    return {"cv": file_to_process, "prompts": prompts, "cached": cached}
 
 
 @click.command()
-def parse_cv():
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Call OpenAI for every section even if a stored result for the same inputs exists.",
+)
+@click.option(
+    "--batch",
+    "use_batch",
+    is_flag=True,
+    help="Submit the section prompts to the OpenAI Batch API; run 'resumecraftr collect' later.",
+)
+@click.option("--all", "all_files", is_flag=True, help="Parse every imported CV.")
+@click.option(
+    "--plan",
+    "show_plan",
+    is_flag=True,
+    help="Print the calls, tokens, cost and time this would take, without calling OpenAI.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Keep the sections an interrupted or partly failed run already extracted; only extract the rest.",
+)
+def parse_cv(no_cache, use_batch, all_files, show_plan, resume):
     """Parse a CV from a previously imported text file into structured sections."""
     # Load configuration
-    if not os.path.exists(CONFIG_FILE):
+    if not os.path.exists(config_file()):
         console.print(
             "[bold red]Configuration file not found. Run 'resumecraftr setup' first.[/bold red]"
         )
         return
 
-    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-        config = json.load(f)
-
-    # Only create the agent when we're about to use OpenAI
-    create_or_get_agent()
+    config = load_config()
+    config["artifact_cache"] = not no_cache
 
     extracted_files = config.get("extracted_files", [])
     language = config.get("primary_language", "EN")
@@ -79,60 +135,139 @@ def parse_cv():
         )
         return
 
+    # Connect to OpenAI while the user picks files (see warmup.py); batches
+    # need the client but no assistant.
+    if not show_plan:
+        warm_up_openai(assistant=not use_batch)
+
     # If multiple files exist, let the user choose
-    file_to_process = extracted_files[0]
-    if len(extracted_files) > 1:
-        file_to_process = Prompt.ask(
-            "Multiple files detected. Choose one", choices=extracted_files
-        )
+    files_to_process = extracted_files if all_files else extracted_files[:1]
+    if len(extracted_files) > 1 and not all_files:
+        files_to_process = [
+            Prompt.ask("Multiple files detected. Choose one", choices=extracted_files)
+        ]
+
+    texts = {}
+    for file_to_process in files_to_process:
+        file_path = workspace_path(file_to_process)
+        if not os.path.exists(file_path):
+            console.print(
+                f"[bold red]Selected file '{file_to_process}' does not exist.[/bold red]"
+            )
+            return
+        with open(file_path, "r", encoding="utf-8") as f:
+            texts[file_to_process] = f.read()
 
-    file_path = os.path.join("cv-workspace", file_to_process)
-    if not os.path.exists(file_path):
+    try:
+        sections_config = load_sections_config()
+    except (FileNotFoundError, ModuleNotFoundError):
         console.print(
-            f"[bold red]Selected file '{file_to_process}' does not exist.[/bold red]"
+            "[bold red]Sections configuration file not found in templates/sections.json.[/bold red]"
         )
         return
 
-    console.print(f"[bold blue]Processing file: {file_path}[/bold blue]")
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        text_content = f.read()
+    section_names = [section_info["name"] for section_info in sections_config.get("sections", [])]
 
-    if not os.path.exists(SECTIONS_FILE):
-        console.print(
-            "[bold red]Sections configuration file not found in templates/sections.json.[/bold red]"
-        )
+    if show_plan:
+        parts = [
+            part
+            for text_content in texts.values()
+            for name in section_names
+            if name not in extract_locally(config, text_content, [name], language)
+            for part in extraction_parts(config, name, text_content, language)
+        ]
+        print_plan(console, plan_calls(config, parts, batch=use_batch), config)
         return
 
-    with open(SECTIONS_FILE, "r", encoding="utf-8") as f:
-        sections_config = json.load(f)
+    if use_batch:
+        from resumecraftr.cli.batch import submit_batch
 
-    extracted_data = {}
+        targets = [
+            batch_target(config, file_to_process, text_content, sections_config)
+            for file_to_process, text_content in texts.items()
+        ]
+        pending = sum(len(target["prompts"]) for target in targets)
+        if pending:
+            batch_id = submit_batch("parse-cv", targets, config)
+            console.print(
+                f"[bold green]Submitted batch {batch_id} with {pending} section prompts. "
+                "Run 'resumecraftr collect' when it has finished.[/bold green]"
+            )
+            return
+        # Everything was cached: nothing to submit, save the outputs now.
+        for target in targets:
+            output_path = save_extracted_sections(
+                config, target["cv"], texts[target["cv"]], target["cached"]
+            )
+            console.print(
+                f"[bold green]Parsed CV sections saved to: {output_path}[/bold green]"
+            )
+        return
 
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        future_to_section = {
-            executor.submit(
-                process_section, config, section_info["name"], text_content, language
-            ): section_info["name"]
-            for section_info in sections_config.get("sections", [])
-        }
+    # Waits for the warm-up; connects here if it failed.
+    create_or_get_agent()
+    craftr = ResumeCraftr(config=config)
 
-        for future in concurrent.futures.as_completed(future_to_section):
-            section_name, result = future.result()
-            if result is not None:  # Solo guardar si es JSON válido
-                extracted_data[section_name] = result
+    for file_to_process, text_content in texts.items():
+        file_path = workspace_path(file_to_process)
+        console.print(f"[bold blue]Processing file: {file_path}[/bold blue]")
 
-    output_path = OUTPUT_FILE.format(
-        file_to_process.replace(".txt", "").replace(".extracted_sections.json", "")
-    )
+        checkpoint = Checkpoint(
+            os.path.basename(output_file(file_to_process)),
+            {
+                "command": "parse-cv",
+                "cv": content_hash(text_content),
+                "model": config.get("chat_gpt", {}).get("model"),
+                "language": language,
+            },
+        )
+        done = checkpoint.load() if resume else {}
+        if done:
+            console.print(
+                f"[cyan]Resuming: {len(done)} section(s) already extracted by an earlier run.[/cyan]"
+            )
+        elif checkpoint.exists() and not resume:
+            console.print(
+                "[bold yellow]An earlier run of this CV did not finish; "
+                "use --resume to keep its sections.[/bold yellow]"
+            )
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(extracted_data, f, indent=4, ensure_ascii=False)
+        def report(section_name, content, error):
+            if error is not None:
+                console.print(
+                    f"[bold red]Could not extract section '{section_name}': {error}. Skipping.[/bold red]"
+                )
+            else:
+                checkpoint.record(section_name, content)
+                console.print(f"[cyan]Extracted {section_name} in {language}.[/cyan]")
 
-    console.print(
-        f"[bold green]Parsed CV sections saved to: {output_path}[/bold green]"
-    )
+        missing = [name for name in section_names if name not in done]
+        print_routing(console, config, "extracted_section", missing)
+        with span("parse", file=file_to_process):
+            result = craftr.parse(
+                text_content, sections=missing, language=language, on_section=report
+            )
+        sections = {
+            name: done[name] if name in done else result.sections[name]
+            for name in section_names
+            if name in done or name in result.sections
+        }
 
+        if result.local:
+            console.print(
+                f"[cyan]Filled in locally, without OpenAI: {', '.join(result.local)}.[/cyan]"
+            )
+        output_path = save_extracted_sections(config, file_to_process, text_content, sections)
+        console.print(
+            f"[bold green]Parsed CV sections saved to: {output_path}[/bold green]"
+        )
+        if result.failed:
+            console.print(
+                f"[bold yellow]{len(result.failed)} section(s) failed; "
+                "run 'resumecraftr parse-cv --resume' to retry only those.[/bold yellow]"
+            )
+        else:
+            checkpoint.discard()
 
 if __name__ == "__main__":
-    parse_cv() 
\ No newline at end of file
+    parse_cv()
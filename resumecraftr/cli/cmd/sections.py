@@ -8,11 +8,13 @@ from rich.console import Console
 from rich.prompt import Prompt
 from resumecraftr.cli.agent import execute_prompt, create_or_get_agent
 from resumecraftr.cli.prompts.sections import RAW_PROMPTS
+from resumecraftr.cli.store import get_store, load_config
+from resumecraftr.cli.tracing import submit
 from resumecraftr.cli.utils.json import clean_json_response
+from resumecraftr.cli.workspace import config_file, workspace_path
 
 
 console = Console()
-CONFIG_FILE = os.path.join("cv-workspace", "resumecraftr.json")
 try:
     with importlib.resources.path(
         "resumecraftr.templates", "sections.json"
@@ -22,7 +24,7 @@ except ModuleNotFoundError:
     console.print(
         "[bold red]Error: Could not locate the sections file inside the installed package.[/bold red]"
     )
-OUTPUT_FILE = os.path.join("cv-workspace", "{0}.extracted_sections.json")
+OUTPUT_FILE = "{0}.extracted_sections.json"
 
 
 def process_section(config, section_name, text_content, language):
@@ -58,14 +60,13 @@ def process_section(config, section_name, text_content, language):
 def extract_sections():
     """Extract CV sections from a previously processed text file."""
     # Load configuration
-    if not os.path.exists(CONFIG_FILE):
+    if not os.path.exists(config_file()):
         console.print(
             "[bold red]Configuration file not found. Run 'resumecraftr init' first.[/bold red]"
         )
         return
 
-    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-        config = json.load(f)
+    config = load_config()
 
     # Only create the agent when we're about to use OpenAI
     create_or_get_agent()
@@ -86,7 +87,7 @@ def extract_sections():
             "Multiple files detected. Choose one", choices=extracted_files
         )
 
-    file_path = os.path.join("cv-workspace", file_to_process)
+    file_path = workspace_path(file_to_process)
     if not os.path.exists(file_path):
         console.print(
             f"[bold red]Selected file '{file_to_process}' does not exist.[/bold red]"
@@ -111,7 +112,8 @@ def extract_sections():
 
     with concurrent.futures.ThreadPoolExecutor() as executor:
         future_to_section = {
-            executor.submit(
+            submit(
+                executor,
                 process_section, config, section_info["name"], text_content, language
             ): section_info["name"]
             for section_info in sections_config.get("sections", [])
@@ -122,13 +124,17 @@ def extract_sections():
             if result is not None:  # Solo guardar si es JSON válido
                 extracted_data[section_name] = result
 
-    output_path = OUTPUT_FILE.format(
-        file_to_process.replace(".txt", "").replace(".extracted_sections.json", "")
+    output_path = workspace_path(
+        OUTPUT_FILE.format(
+            file_to_process.replace(".txt", "").replace(".extracted_sections.json", "")
+        )
     )
 
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(extracted_data, f, indent=4, ensure_ascii=False)
 
+    get_store().record_artifact(output_path, "extracted_sections", cv=file_to_process)
+
     console.print(
         f"[bold green]Extracted sections saved to: {output_path}[/bold green]"
     )
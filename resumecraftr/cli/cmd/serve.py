@@ -0,0 +1,75 @@
+import os
+import sys
+import signal
+import importlib
+import click
+from rich.console import Console
+from resumecraftr.cli import daemon
+from resumecraftr.cli.agent import create_or_get_agent, get_openai_client
+from resumecraftr.cli.artifacts import get_artifact_store
+from resumecraftr.cli.schemas import load_sections_config
+from resumecraftr.cli.workspace import config_file
+
+console = Console()
+
+
+def warm_up():
+    """Load everything commands would otherwise load on each invocation."""
+    from resumecraftr.cli.main import LAZY_COMMANDS
+
+    for target, _ in LAZY_COMMANDS.values():
+        importlib.import_module(target.split(":")[0])
+    load_sections_config()
+    get_artifact_store()
+    get_openai_client()
+    create_or_get_agent()
+
+
+@click.command()
+@click.option(
+    "--no-warmup",
+    is_flag=True,
+    help="Start serving immediately; connect to OpenAI on the first command instead.",
+)
+def serve(no_warmup):
+    """Run a background server that keeps OpenAI and workspace state warm for other commands."""
+    if not os.path.exists(config_file()):
+        console.print(
+            "[bold red]Configuration file not found. Run 'resumecraftr setup' first.[/bold red]"
+        )
+        return
+
+    socket_file = daemon.socket_file()
+    if daemon.is_running(socket_file):
+        console.print(
+            f"[bold yellow]A server is already running on {socket_file}.[/bold yellow]"
+        )
+        return
+    if os.path.exists(socket_file):
+        # Left behind by a server that did not shut down cleanly.
+        os.remove(socket_file)
+
+    if not no_warmup:
+        console.print("[cyan]Warming up: loading commands, OpenAI client and assistant...[/cyan]")
+        warm_up()
+
+    server = daemon.DaemonServer(socket_file, daemon.RequestHandler)
+    daemon.install_stream_proxies()
+    # Clean up the socket on `kill` as well as on Ctrl+C.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    console.print(
+        f"[bold green]Serving on {socket_file}. Other resumecraftr commands in this "
+        "directory now run here. Press Ctrl+C to stop.[/bold green]"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("[bold yellow]Server stopped.[/bold yellow]")
+    finally:
+        server.server_close()
+        if os.path.exists(socket_file):
+            os.remove(socket_file)
+
+
+if __name__ == "__main__":
+    serve()
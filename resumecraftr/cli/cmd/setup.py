@@ -4,35 +4,25 @@ import shutil
 import importlib.resources
 import click
 from rich.console import Console
+from resumecraftr.cli.store import get_store
+from resumecraftr.cli.workspace import config_file, workspace_path, workspace_root
 
 console = Console()
 
-CONFIG_FILE = os.path.join("cv-workspace", "resumecraftr.json")
-CUSTOM_FILE = os.path.join("cv-workspace", "custom.md")
+CUSTOM_FILE_NAME = "custom.md"
 
-try:
-    with importlib.resources.path(
-        "resumecraftr.templates", "resume_template.md"
-    ) as md_template_path:
-        MD_TEMPLATE_SRC = str(md_template_path)
-except ModuleNotFoundError:
-    console.print(
-        "[bold red]Error: Could not locate the template file inside the installed package.[/bold red]"
-    )
-    MD_TEMPLATE_SRC = None
-
-try:
-    with importlib.resources.path(
-        "resumecraftr.templates", "eisvogel.latex"
-    ) as eisvogel_template_path:
-        EISVOGEL_TEMPLATE_SRC = str(eisvogel_template_path)
-except ModuleNotFoundError:
-    console.print(
-        "[bold red]Error: Could not locate the eisvogel template file inside the installed package.[/bold red]"
-    )
-    EISVOGEL_TEMPLATE_SRC = None
+def template_source(filename):
+    """Return the path of a template bundled with the package, or None if it is missing."""
+    try:
+        with importlib.resources.path("resumecraftr.templates", filename) as template_path:
+            return str(template_path)
+    except ModuleNotFoundError:
+        console.print(
+            f"[bold red]Error: Could not locate the template file '{filename}' inside the installed package.[/bold red]"
+        )
+        return None
 
-MD_TEMPLATE_DEST = os.path.join("cv-workspace", "resume_template.md")
+MD_TEMPLATE_NAME = "resume_template.md"
 PANDOC_TEMPLATES_DIR = os.path.expanduser("~/.local/share/pandoc/templates")
 EISVOGEL_TEMPLATE_DEST = os.path.join(PANDOC_TEMPLATES_DIR, "eisvogel.latex")
 
@@ -51,8 +41,11 @@ DEFAULT_CONFIG = {
 )
 def setup(language, gpt_model):
     """Initialize a new ResumeCraftr workspace."""
+    md_template_src = template_source("resume_template.md")
+    eisvogel_template_src = template_source("eisvogel.latex")
+
     # Create workspace directory
-    os.makedirs("cv-workspace", exist_ok=True)
+    os.makedirs(workspace_root(), exist_ok=True)
 
     # Create or update config file
     config = DEFAULT_CONFIG.copy()
@@ -61,40 +54,48 @@ def setup(language, gpt_model):
         "model": gpt_model,
         "temperature": 0.7,
         "top_p": 1.0,
+        "structured_outputs": True,
+        "repair_retries": 2,
     }
 
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
+    with open(config_file(), "w", encoding="utf-8") as f:
         json.dump(config, f, indent=4)
 
-    console.print(f"[bold green]Configuration file created:[/bold green] {CONFIG_FILE}")
+    # Keep CVs and jobs registered before a re-run of setup
+    get_store().export_json()
+
+    console.print(f"[bold green]Configuration file created:[/bold green] {config_file()}")
+
+    custom_file = workspace_path(CUSTOM_FILE_NAME)
+    md_template_dest = workspace_path(MD_TEMPLATE_NAME)
 
     # Create custom.md if it doesn't exist
-    if not os.path.exists(CUSTOM_FILE):
-        with open(CUSTOM_FILE, "w", encoding="utf-8") as f:
+    if not os.path.exists(custom_file):
+        with open(custom_file, "w", encoding="utf-8") as f:
             f.write("# Custom Instructions and Data\n\n")
-        console.print(f"[bold green]Custom file created:[/bold green] {CUSTOM_FILE}")
+        console.print(f"[bold green]Custom file created:[/bold green] {custom_file}")
 
     # Copy Markdown template if it doesn't exist
-    if os.path.exists(MD_TEMPLATE_SRC) and not os.path.exists(MD_TEMPLATE_DEST):
-        shutil.copy(MD_TEMPLATE_SRC, MD_TEMPLATE_DEST)
-        console.print(f"[bold green]Markdown template copied to:[/bold green] {MD_TEMPLATE_DEST}")
-    elif not os.path.exists(MD_TEMPLATE_SRC):
+    if os.path.exists(md_template_src) and not os.path.exists(md_template_dest):
+        shutil.copy(md_template_src, md_template_dest)
+        console.print(f"[bold green]Markdown template copied to:[/bold green] {md_template_dest}")
+    elif not os.path.exists(md_template_src):
         console.print(
-            f"[bold red]Markdown template source not found at:[/bold red] {MD_TEMPLATE_SRC}"
+            f"[bold red]Markdown template source not found at:[/bold red] {md_template_src}"
         )
     else:
         console.print(
-            f"[bold yellow]Markdown template already exists in workspace:[/bold yellow] {MD_TEMPLATE_DEST}"
+            f"[bold yellow]Markdown template already exists in workspace:[/bold yellow] {md_template_dest}"
         )
     
     # Install eisvogel template for Pandoc
-    if os.path.exists(EISVOGEL_TEMPLATE_SRC):
+    if os.path.exists(eisvogel_template_src):
         # Create pandoc templates directory if it doesn't exist
         os.makedirs(PANDOC_TEMPLATES_DIR, exist_ok=True)
         
         # Copy eisvogel template if it doesn't exist
         if not os.path.exists(EISVOGEL_TEMPLATE_DEST):
-            shutil.copy(EISVOGEL_TEMPLATE_SRC, EISVOGEL_TEMPLATE_DEST)
+            shutil.copy(eisvogel_template_src, EISVOGEL_TEMPLATE_DEST)
             console.print(f"[bold green]Eisvogel template installed for Pandoc:[/bold green] {EISVOGEL_TEMPLATE_DEST}")
         else:
             console.print(
@@ -102,7 +103,7 @@ def setup(language, gpt_model):
             )
     else:
         console.print(
-            f"[bold red]Eisvogel template source not found at:[/bold red] {EISVOGEL_TEMPLATE_SRC}"
+            f"[bold red]Eisvogel template source not found at:[/bold red] {eisvogel_template_src}"
         )
 
     console.print("[bold green]Workspace initialized successfully![/bold green]") 
\ No newline at end of file
@@ -1,62 +1,203 @@
 import os
 import json
 import click
-import concurrent.futures
 from rich.console import Console
 from rich.prompt import Prompt
-from resumecraftr.cli.agent import execute_prompt, create_or_get_agent
-from resumecraftr.cli.prompts.resume import RAW_PROMPTS
-from resumecraftr.cli.utils.json import clean_json_response, merge_json_files
+from resumecraftr.api import ResumeCraftr, plan_calls, tailoring_parts
+from resumecraftr.cli.agent import create_or_get_agent
+from resumecraftr.cli.warmup import warm_up_openai
+from resumecraftr.cli.artifacts import content_hash, get_artifact_store
+from resumecraftr.cli.budget import print_plan
+from resumecraftr.cli.bullets import select_bullets
+from resumecraftr.cli.checkpoint import Checkpoint
+from resumecraftr.cli.routing import print_routing
+from resumecraftr.cli.section_prompt import merge_parts
+from resumecraftr.cli.store import get_store, load_config
+from resumecraftr.cli.tracing import span
+from resumecraftr.cli.utils.json import merge_json_files
+from resumecraftr.cli.workspace import config_file, workspace_path
 
 console = Console()
-CONFIG_FILE = os.path.join("cv-workspace", "resumecraftr.json")
-OUTPUT_FILE = os.path.join("cv-workspace", "{0}.optimized_sections.json")
+OUTPUT_FILE = "{0}.optimized_sections.json"
 
 
-def optimize_section(config, section_name, content, job_description):
+def output_file(sections_file):
+    """Return the tailored sections file tailor-cv writes for a parsed CV."""
+    return workspace_path(
+        OUTPUT_FILE.format(
+            sections_file.replace(".txt", "").replace(".extracted_sections.json", "")
+        )
+    )
+
+
+def save_optimized_sections(
+    config, sections_file, job_desc_file, sections_content, job_description, optimized_resume
+):
     """
-    Llama a OpenAI para optimizar la sección del CV en base a la descripción del trabajo.
+    Write a tailored CV, filling sections that were not tailored from the
+    extracted ones, and record it in the workspace store.
     """
-
-    prompt = (
-        RAW_PROMPTS["optimize_resume"].format(language=config.get("primary_language"))
-        + "\n\n"
-        + json.dumps(
-            {
-                "section_name": section_name,
-                "section_content": content,
-                "job_description": job_description,
+    sections_path = os.path.abspath(workspace_path(sections_file))
+    output_path = output_file(sections_file)
+
+    with span("write_outputs"):
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(optimized_resume, f, indent=4, ensure_ascii=False)
+
+        merge_json_files(output_path, sections_path, output_path)
+
+        with open(output_path, "r", encoding="utf-8") as f:
+            output_content = f.read()
+
+        cv_file = sections_file.replace(".extracted_sections.json", ".txt")
+        get_store().record_artifact(
+            output_path,
+            "optimized_sections",
+            cv=cv_file,
+            job=job_desc_file,
+            blob=get_artifact_store().write_blob(output_content),
+            inputs={
+                "sections": content_hash(sections_content),
+                "job": content_hash(job_description),
+                "model": config.get("chat_gpt", {}).get("model"),
             },
-            indent=4,
         )
-    )
+    return output_path
 
-    raw_result = execute_prompt(prompt)
-    parsed_result = clean_json_response(raw_result)
 
-    if parsed_result is None:
+def load_sections_file(sections_file):
+    """Read a parsed CV sections file, or print why it cannot be used and return None."""
+    sections_path = os.path.abspath(workspace_path(sections_file))
+    if not os.path.exists(sections_path):
         console.print(
-            f"[bold red]Failed to parse JSON for section '{section_name}'. Skipping.[/bold red]"
+            f"[bold red]Selected CV sections file '{sections_file}' does not exist.[/bold red]"
         )
+        return None
 
-    return section_name, parsed_result  # Devuelve el JSON limpio o None
+    with open(sections_path, "r", encoding="utf-8") as f:
+        content = f.read().strip()
+        if not content:
+            console.print(
+                f"[bold red]Error: The CV sections file '{sections_file}' is empty.[/bold red]"
+            )
+            return None
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError as e:
+            console.print(
+                f"[bold red]Error: The CV sections file '{sections_file}' is not a valid JSON file.\nDetails: {e}[bold red]"
+            )
+            return None
+
+
+def read_job_description(job_desc_file):
+    """
+    Read the description a job is tailored with.
+
+    A job added with `add-job --reuse-similar` is tailored with the description
+    of the near-duplicate it was mapped to, so its section prompts hit the
+    results already stored for that job.
+
+    Returns:
+        tuple: The description text and the job file it was read from.
+    """
+    original = get_store().job_alias(job_desc_file)
+    if original and os.path.exists(workspace_path("job_descriptions", original)):
+        job_desc_file = original
+    with open(workspace_path("job_descriptions", job_desc_file), "r", encoding="utf-8") as f:
+        return f.read(), job_desc_file
+
+
+def batch_target(config, sections_file, job_desc_file, sections_content, job_description):
+    """
+    Split a CV's sections into prompts for a batch and results already cached.
+
+    Returns:
+        dict: A target for `batch.submit_batch`.
+    """
+    artifact_store = get_artifact_store()
+    prompts, cached = [], {}
+    sections_content = select_bullets(
+        sections_content, job_description, config.get("top_bullets")
+    )
+    for section, content in sections_content.items():
+        parts = tailoring_parts(config, section, content, job_description)
+        stored = [
+            artifact_store.get(section_prompt.kind, section_prompt.inputs)
+            if config.get("artifact_cache", True)
+            else None
+            for section_prompt, _ in parts
+        ]
+        if None not in stored:
+            cached[section] = merge_parts(
+                parts[0][0].kind, [json.loads(content) for content in stored]
+            )
+        else:
+            prompts.extend(section_prompt for section_prompt, _ in parts)
+    return {"cv": sections_file, "job": job_desc_file, "prompts": prompts, "cached": cached}
 
 
 @click.command()
-def tailor_cv():
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Call OpenAI for every section even if a stored result for the same inputs exists.",
+)
+@click.option(
+    "--batch",
+    "use_batch",
+    is_flag=True,
+    help="Submit the section prompts to the OpenAI Batch API; run 'resumecraftr collect' later.",
+)
+@click.option(
+    "--all", "all_files", is_flag=True, help="Tailor every parsed CV to the job description."
+)
+@click.option(
+    "--top-bullets",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Send only the N Work Experience bullets per role most relevant to the job (0 sends all) [default: top_bullets in resumecraftr.json].",
+)
+@click.option(
+    "--min-entry-tokens",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Tailor array sections such as Work Experience in tasks of at least this many tokens of entries, run in parallel (0 gives one task per entry) [default: min_entry_tokens in resumecraftr.json, or 300].",
+)
+@click.option(
+    "--patch/--full-output",
+    "use_patch",
+    default=None,
+    help="Ask for a JSON Patch of the changes to each section instead of the whole rewritten section; a patch that does not apply falls back to the whole section [default: tailor_output in resumecraftr.json, or full].",
+)
+@click.option(
+    "--plan",
+    "show_plan",
+    is_flag=True,
+    help="Print the calls, tokens, cost and time this would take, without calling OpenAI.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Keep the sections an interrupted or partly failed run already tailored; only tailor the rest.",
+)
+def tailor_cv(no_cache, use_batch, all_files, top_bullets, min_entry_tokens, use_patch, show_plan, resume):
     """Tailor a CV based on a job description."""
     # Cargar configuración
-    if not os.path.exists(CONFIG_FILE):
+    if not os.path.exists(config_file()):
         console.print(
             "[bold red]Configuration file not found. Run 'resumecraftr setup' first.[/bold red]"
         )
         return
 
-    # Only create the agent when we're about to use OpenAI
-    create_or_get_agent()
-
-    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-        config = json.load(f)
+    config = load_config()
+    config["artifact_cache"] = not no_cache
+    if top_bullets is not None:
+        config["top_bullets"] = top_bullets
+    if min_entry_tokens is not None:
+        config["min_entry_tokens"] = min_entry_tokens
+    if use_patch is not None:
+        config["tailor_output"] = "patch" if use_patch else "full"
 
     job_descriptions = config.get("job_descriptions", [])
     extracted_files = config.get("extracted_files", [])
@@ -73,89 +214,161 @@ def tailor_cv():
         )
         return
 
+    # Connect to OpenAI while the user picks files (see warmup.py); batches
+    # need the client but no assistant.
+    if not show_plan:
+        warm_up_openai(assistant=not use_batch)
+
     # Seleccionar archivos
     extracted_files = [
         f.replace(".txt", ".extracted_sections.json") for f in extracted_files
     ]
-    sections_file = extracted_files[0]
+    sections_files = extracted_files if all_files else extracted_files[:1]
     job_desc_file = job_descriptions[0]
 
-    if len(extracted_files) > 1:
-        sections_file = Prompt.ask(
-            "Multiple parsed CV files detected. Choose one", choices=extracted_files
-        )
+    if len(extracted_files) > 1 and not all_files:
+        sections_files = [
+            Prompt.ask(
+                "Multiple parsed CV files detected. Choose one", choices=extracted_files
+            )
+        ]
 
     if len(job_descriptions) > 1:
         job_desc_file = Prompt.ask(
             "Multiple job descriptions detected. Choose one", choices=job_descriptions
         )
 
-    sections_path = os.path.abspath(os.path.join("cv-workspace", sections_file))
     job_desc_path = os.path.abspath(
-        os.path.join("cv-workspace", "job_descriptions", job_desc_file)
+        workspace_path("job_descriptions", job_desc_file)
     )
 
-    if not os.path.exists(sections_path):
+    if not os.path.exists(job_desc_path):
         console.print(
-            f"[bold red]Selected CV sections file '{sections_file}' does not exist.[/bold red]"
+            f"[bold red]Selected job description file '{job_desc_file}' does not exist.[/bold red]"
         )
         return
 
-    if not os.path.exists(job_desc_path):
+    all_sections = {}
+    for sections_file in sections_files:
+        sections_content = load_sections_file(sections_file)
+        if sections_content is None:
+            return
+        all_sections[sections_file] = sections_content
+
+    job_description, source_job = read_job_description(job_desc_file)
+    if source_job != job_desc_file:
         console.print(
-            f"[bold red]Selected job description file '{job_desc_file}' does not exist.[/bold red]"
+            f"[cyan]'{job_desc_file}' is a near-duplicate of '{source_job}'; "
+            "reusing its job description and tailoring results.[/cyan]"
         )
+
+    if show_plan:
+        parts = []
+        for sections_content in all_sections.values():
+            sections_content = select_bullets(
+                sections_content, job_description, config.get("top_bullets")
+            )
+            for section, content in sections_content.items():
+                parts.extend(tailoring_parts(config, section, content, job_description))
+        print_plan(console, plan_calls(config, parts, batch=use_batch), config)
         return
 
-    console.print(
-        f"[bold blue]Tailoring CV using: {sections_file} and {job_desc_file}[/bold blue]"
-    )
+    if use_batch:
+        from resumecraftr.cli.batch import submit_batch
 
-    with open(sections_path, "r", encoding="utf-8") as f:
-        content = f.read().strip()
-        if not content:
+        targets = [
+            batch_target(config, sections_file, job_desc_file, sections_content, job_description)
+            for sections_file, sections_content in all_sections.items()
+        ]
+        pending = sum(len(target["prompts"]) for target in targets)
+        if pending:
+            batch_id = submit_batch("tailor-cv", targets, config)
             console.print(
-                f"[bold red]Error: The CV sections file '{sections_file}' is empty.[/bold red]"
+                f"[bold green]Submitted batch {batch_id} with {pending} section prompts. "
+                "Run 'resumecraftr collect' when it has finished.[/bold green]"
             )
             return
-        try:
-            sections_content = json.loads(content)
-        except json.JSONDecodeError as e:
-            console.print(
-                f"[bold red]Error: The CV sections file '{sections_file}' is not a valid JSON file.\nDetails: {e}[bold red]"
+        # Everything was cached: nothing to submit, save the outputs now.
+        for target in targets:
+            output_path = save_optimized_sections(
+                config,
+                target["cv"],
+                job_desc_file,
+                all_sections[target["cv"]],
+                job_description,
+                target["cached"],
             )
-            return
+            console.print(f"[bold green]Tailored CV saved to: {output_path}[/bold green]")
+        return
 
-    with open(job_desc_path, "r", encoding="utf-8") as f:
-        job_description = f.read()
+    # Waits for the warm-up; connects here if it failed.
+    create_or_get_agent()
+    craftr = ResumeCraftr(config=config)
 
-    console.print("[cyan]Processing tailoring in parallel...[/cyan]")
+    for sections_file, sections_content in all_sections.items():
+        console.print(
+            f"[bold blue]Tailoring CV using: {sections_file} and {job_desc_file}[/bold blue]"
+        )
 
-    optimized_resume = {}
+        checkpoint = Checkpoint(
+            os.path.basename(output_file(sections_file)),
+            {
+                "command": "tailor-cv",
+                "sections": content_hash(sections_content),
+                "job": content_hash(job_description),
+                "model": config.get("chat_gpt", {}).get("model"),
+                "top_bullets": config.get("top_bullets"),
+            },
+        )
+        done = checkpoint.load() if resume else {}
+        if done:
+            console.print(
+                f"[cyan]Resuming: {len(done)} section(s) already tailored by an earlier run.[/cyan]"
+            )
+        elif checkpoint.exists() and not resume:
+            console.print(
+                "[bold yellow]An earlier run for this CV and job did not finish; "
+                "use --resume to keep its sections.[/bold yellow]"
+            )
 
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        future_to_section = {
-            executor.submit(
-                optimize_section, config, section, content, job_description
-            ): section
-            for section, content in sections_content.items()
+        def report(section_name, content, error):
+            if error is not None:
+                console.print(
+                    f"[bold red]Could not tailor section '{section_name}': {error}. Skipping.[/bold red]"
+                )
+            else:
+                checkpoint.record(section_name, content)
+
+        console.print("[cyan]Processing tailoring in parallel...[/cyan]")
+        missing = {
+            name: content for name, content in sections_content.items() if name not in done
+        }
+        print_routing(console, config, "optimized_section", list(missing))
+        with span("tailor", file=sections_file):
+            result = craftr.tailor(missing, job_description, on_section=report)
+        tailored = {
+            name: done[name] if name in done else result.tailored[name]
+            for name in sections_content
+            if name in done or name in result.tailored
         }
 
-        for future in concurrent.futures.as_completed(future_to_section):
-            section_name, result = future.result()
-            if result is not None:  # Solo guardar si es JSON válido
-                optimized_resume[section_name] = result
-
-    output_path = OUTPUT_FILE.format(
-        sections_file.replace(".txt", "").replace(".extracted_sections.json", "")
-    )
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(optimized_resume, f, indent=4, ensure_ascii=False)
-
-    merge_json_files(output_path, sections_path, output_path)
-    console.print(f"[bold green]Tailored CV saved to: {output_path}[/bold green]")
+        output_path = save_optimized_sections(
+            config,
+            sections_file,
+            job_desc_file,
+            sections_content,
+            job_description,
+            tailored,
+        )
+        console.print(f"[bold green]Tailored CV saved to: {output_path}[/bold green]")
+        if result.failed:
+            console.print(
+                f"[bold yellow]{len(result.failed)} section(s) failed; "
+                "run 'resumecraftr tailor-cv --resume' to retry only those.[/bold yellow]"
+            )
+        else:
+            checkpoint.discard()
 
 
 if __name__ == "__main__":
-    tailor_cv() 
\ No newline at end of file
+    tailor_cv()
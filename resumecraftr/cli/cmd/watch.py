@@ -0,0 +1,285 @@
+import os
+import json
+import click
+from rich.console import Console
+from rich.prompt import Prompt
+from resumecraftr.api import generate_markdown, tailor_sections
+from resumecraftr.cli.agent import create_or_get_agent
+from resumecraftr.cli.artifacts import ARTIFACTS_DIR_NAME
+from resumecraftr.cli.checkpoint import CHECKPOINT_DIR_NAME
+from resumecraftr.cli.cmd.tailor_cv import OUTPUT_FILE
+from resumecraftr.cli.daemon import SOCKET_NAME
+from resumecraftr.cli.routing import route_for
+from resumecraftr.cli.store import DB_NAME, get_store, load_config
+from resumecraftr.cli.tracing import span
+from resumecraftr.cli.cmd.export_pdf import (
+    MD_TEMPLATE_NAME,
+    CUSTOM_PROMPT_NAME,
+    check_pandoc,
+    convert_markdown_to_pdf,
+    export_language,
+    load_custom_instructions,
+    pdf_output_path,
+    print_pandoc_installation_guide,
+)
+from resumecraftr.cli.utils.json import merge_json_files
+from resumecraftr.cli.utils.watcher import create_watcher
+from resumecraftr.cli.workspace import config_file, workspace_path, workspace_root
+
+console = Console()
+JOBS_DIR_NAME = "job_descriptions"
+# Workspace files that commands write on their own (the artifact cache,
+# checkpoints, the database and its journals, the daemon socket). Changes
+# there are never inputs of a rebuild.
+IGNORED_PATHS = (ARTIFACTS_DIR_NAME, CHECKPOINT_DIR_NAME, f"{DB_NAME}*", SOCKET_NAME)
+
+
+class BuildGraph:
+    """
+    Dependency graph between workspace files.
+
+    Rules must be added in dependency order: a rule may only use as sources
+    files that are inputs or targets of rules added before it. That order is
+    then a valid build order.
+    """
+
+    def __init__(self):
+        self._rules = {}
+
+    def add_rule(self, target, sources, builder):
+        self._rules[os.path.abspath(target)] = (
+            [os.path.abspath(source) for source in sources],
+            builder,
+        )
+
+    def builder(self, target):
+        return self._rules[target][1]
+
+    def stale_after(self, changed):
+        """Return the targets downstream of the changed paths, in build order."""
+        dirty = {os.path.abspath(path) for path in changed}
+        stale = []
+        for target, (sources, _) in self._rules.items():
+            if any(source in dirty for source in sources):
+                dirty.add(target)
+                stale.append(target)
+        return stale
+
+    def out_of_date(self):
+        """Return targets that are missing or older than one of their sources."""
+        dirty = set()
+        stale = []
+        for target, (sources, _) in self._rules.items():
+            if not os.path.exists(target):
+                is_stale = True
+            else:
+                target_mtime = os.path.getmtime(target)
+                is_stale = any(
+                    source in dirty
+                    or (os.path.exists(source) and os.path.getmtime(source) > target_mtime)
+                    for source in sources
+                )
+            if is_stale:
+                dirty.add(target)
+                stale.append(target)
+        return stale
+
+
+class WatchSession:
+    """Rebuilds the tailored CV, Markdown and PDF for one CV and one job description."""
+
+    def __init__(self, sections_file, job_file, language):
+        base_name = sections_file.replace(".extracted_sections.json", "")
+        self.sections_path = workspace_path(sections_file)
+        self.job_path = workspace_path(JOBS_DIR_NAME, job_file)
+        self.optimized_file = OUTPUT_FILE.format(base_name)
+        self.optimized_path = workspace_path(self.optimized_file)
+        self.md_template = workspace_path(MD_TEMPLATE_NAME)
+        self.custom_prompt = workspace_path(CUSTOM_PROMPT_NAME)
+        self.md_path = workspace_path(f"openai-response-{base_name}.md")
+        self.pdf_path = pdf_output_path(self.optimized_file, language)
+        self.language = language
+        self.cv_file = sections_file.replace(".extracted_sections.json", ".txt")
+        self.job_file = job_file
+        # Optimized sections from previous rebuilds, so editing one section or
+        # the Markdown template does not re-tailor the whole CV.
+        self.tailor_cache = {}
+        self._written = {}
+        self._pandoc_guide_shown = False
+
+        self.graph = BuildGraph()
+        self.graph.add_rule(
+            self.optimized_path, [self.sections_path, self.job_path], self.build_optimized
+        )
+        self.graph.add_rule(
+            self.md_path,
+            [self.optimized_path, self.job_path, self.md_template, self.custom_prompt],
+            self.build_markdown,
+        )
+        self.graph.add_rule(self.pdf_path, [self.md_path], self.build_pdf)
+        self._artifact_kinds = {
+            os.path.abspath(self.optimized_path): "optimized_sections",
+            os.path.abspath(self.md_path): "markdown",
+            os.path.abspath(self.pdf_path): "pdf",
+        }
+
+    def _read_json(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _read_text(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def build_optimized(self):
+        config = self._read_json(config_file())
+        optimized = tailor_sections(
+            config,
+            self._read_json(self.sections_path),
+            self._read_text(self.job_path),
+            cache=self.tailor_cache,
+        ).tailored
+        with open(self.optimized_path, "w", encoding="utf-8") as f:
+            json.dump(optimized, f, indent=4, ensure_ascii=False)
+        merge_json_files(self.optimized_path, self.sections_path, self.optimized_path)
+
+    def build_markdown(self):
+        config = self._read_json(config_file())
+        markdown_content = generate_markdown(
+            self._read_text(self.md_template),
+            self._read_json(self.optimized_path),
+            self._read_text(self.job_path),
+            self.language,
+            custom=load_custom_instructions(),
+            route=route_for(config, "markdown"),
+            config=config,
+        )
+        if not markdown_content:
+            raise RuntimeError("OpenAI did not return a valid Markdown document.")
+        with open(self.md_path, "w", encoding="utf-8") as f:
+            f.write(markdown_content)
+
+    def build_pdf(self):
+        result = convert_markdown_to_pdf(self.md_path, self.pdf_path)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr)
+
+    def rebuild(self, targets):
+        """Run the builders for the given targets in order, stopping at the first failure."""
+        for target in targets:
+            if target == os.path.abspath(self.pdf_path) and not check_pandoc():
+                # The tailored CV and Markdown are still kept up to date.
+                if not self._pandoc_guide_shown:
+                    print_pandoc_installation_guide()
+                    self._pandoc_guide_shown = True
+                console.print(
+                    f"[bold yellow]Pandoc is not installed; skipping {os.path.relpath(target)}.[/bold yellow]"
+                )
+                continue
+            console.print(f"[cyan]Rebuilding {os.path.relpath(target)}...[/cyan]")
+            try:
+                with span("rebuild", target=os.path.basename(target)):
+                    self.graph.builder(target)()
+            except Exception as e:
+                console.print(
+                    f"[bold red]Failed to rebuild {os.path.relpath(target)}: {e}[/bold red]"
+                )
+                return
+            self._written[target] = os.stat(target).st_mtime_ns
+            get_store().record_artifact(
+                target, self._artifact_kinds[target], cv=self.cv_file, job=self.job_file
+            )
+            console.print(f"[bold green]Updated: {os.path.relpath(target)}[/bold green]")
+
+    def external_changes(self, paths):
+        """Drop change events caused by our own rebuilds."""
+        changed = set()
+        for path in paths:
+            path = os.path.abspath(path)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if self._written.get(path) != mtime:
+                changed.add(path)
+        return changed
+
+
+def _choose(label, choices, selected):
+    if selected:
+        if selected not in choices:
+            raise click.BadParameter(f"'{selected}' is not one of: {', '.join(choices)}")
+        return selected
+    if len(choices) > 1:
+        return Prompt.ask(f"Multiple {label} detected. Choose one", choices=choices)
+    return choices[0]
+
+
+@click.command()
+@click.option("--cv", "cv_file", help="Extracted sections file to watch (e.g. 'cv.extracted_sections.json').")
+@click.option("--job", "job_file", help="Job description file to tailor against (e.g. 'job.txt').")
+@click.option("--language", type=str, help="Language of the exported resume. Defaults to the language in resumecraftr.json.")
+@click.option("--debounce", default=1.0, show_default=True, help="Seconds without changes before rebuilding.")
+@click.option("--polling", is_flag=True, help="Poll for changes instead of using inotify.")
+def watch(cv_file, job_file, language, debounce, polling):
+    """Watch the workspace and rebuild the tailored CV, Markdown and PDF when inputs change."""
+    if not os.path.exists(config_file()):
+        console.print(
+            "[bold red]Configuration file not found. Run 'resumecraftr setup' first.[/bold red]"
+        )
+        return
+
+    config = load_config()
+
+    extracted_files = [
+        f.replace(".txt", ".extracted_sections.json")
+        for f in config.get("extracted_files", [])
+    ]
+    job_descriptions = config.get("job_descriptions", [])
+
+    if not extracted_files:
+        console.print("[bold red]No parsed CV sections found in configuration.[/bold red]")
+        return
+
+    if not job_descriptions:
+        console.print("[bold red]No job descriptions found in configuration.[/bold red]")
+        return
+
+    sections_file = _choose("parsed CV files", extracted_files, cv_file)
+    job_desc_file = _choose("job descriptions", job_descriptions, job_file)
+    session = WatchSession(
+        sections_file, job_desc_file, export_language(config, language)
+    )
+
+    # Resolve the assistant once; every rebuild reuses it and the OpenAI client.
+    create_or_get_agent()
+
+    session.rebuild(session.graph.out_of_date())
+
+    watcher = create_watcher(workspace_root(), polling=polling, ignore=IGNORED_PATHS)
+    console.print(
+        f"[bold blue]Watching {workspace_root()} for changes ({type(watcher).__name__}). "
+        "Press Ctrl+C to stop.[/bold blue]"
+    )
+
+    try:
+        while True:
+            changed = watcher.wait()
+            # Debounce: keep collecting events until the workspace is quiet.
+            while True:
+                more = watcher.wait(timeout=debounce)
+                if not more:
+                    break
+                changed |= more
+
+            stale = session.graph.stale_after(session.external_changes(changed))
+            if stale:
+                session.rebuild(stale)
+    except KeyboardInterrupt:
+        console.print("[bold yellow]Stopped watching.[/bold yellow]")
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    watch()
@@ -0,0 +1,342 @@
+import io
+import os
+import re
+import sys
+import json
+import hashlib
+import queue
+import socket
+import threading
+import contextvars
+import socketserver
+from resumecraftr.cli.deadlines import cancellation
+from resumecraftr.cli.workspace import use_workspace, workspace_path, workspace_root
+
+# `resumecraftr serve` keeps one process warm: the OpenAI SDK is imported, the
+# client and assistant are resolved, and workspace stores, caches and
+# templates stay loaded. Other invocations connect to its Unix socket, send
+# their arguments and relay the command's output and input.
+#
+# Protocol: one JSON object per line. The client sends {"argv", "cwd",
+# "workspace", "isatty", "env"} and then {"in": text} for each line of its stdin ({"eof": true}
+# when stdin closes). The server sends {"out": text} and {"err": text} while
+# the command runs and finally {"exit": code}, or {"local": true} if the
+# client should run the command itself.
+#
+# The daemon only runs commands for clients in its own working directory
+# whose OpenAI settings in the environment (see SHARED_ENV) match the ones
+# it started with: its client is already built from them and relative paths
+# resolve against its cwd. Other clients run the command themselves. The
+# client sends digests of those variables, never their values.
+#
+# If the client goes away before the exit code (Ctrl+C, or a closed socket),
+# the command's runs are cancelled as they would be on Ctrl+C in a local run.
+
+SOCKET_NAME = ".resumecraftr.sock"
+NO_DAEMON_ENV = "RESUMECRAFTR_NO_DAEMON"
+# Commands that always run in their own process.
+LOCAL_COMMANDS = {"serve", "watch"}
+# Group options that take a value, so the value is not taken for the command.
+_VALUE_OPTIONS = {"--workspace", "--trace-file", "--timeout"}
+# Environment variables that change how a command talks to OpenAI.
+SHARED_ENV = (
+    "OPENAI_API_KEY",
+    "OPENAI_BASE_URL",
+    "OPENAI_ORG_ID",
+    "OPENAI_PROJECT_ID",
+    "RESUMECRAFTR_MAX_CONCURRENT_PROMPTS",
+)
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+
+_streams = contextvars.ContextVar("resumecraftr_streams", default=None)
+
+
+def socket_file() -> str:
+    """Return the daemon socket of the current workspace."""
+    return workspace_path(SOCKET_NAME)
+
+
+def _environment_digest() -> dict:
+    """Return a SHA-256 digest of each SHARED_ENV variable (None when unset)."""
+    return {
+        name: hashlib.sha256(os.environ[name].encode("utf-8")).hexdigest() if name in os.environ else None
+        for name in SHARED_ENV
+    }
+
+
+def _command_name(argv):
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in _VALUE_OPTIONS:
+            skip = True
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def forward(argv):
+    """
+    Run a command in the daemon if one is serving the current workspace.
+
+    Args:
+        argv (list): The command-line arguments, without the program name.
+
+    Returns:
+        int | None: The command's exit code, or None if the command must run
+        in this process (no daemon, a stale socket, a local-only command, or
+        a different cwd or OpenAI environment than the daemon's).
+    """
+    if os.environ.get(NO_DAEMON_ENV) or _command_name(argv) in LOCAL_COMMANDS:
+        return None
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(socket_file())
+    except OSError:
+        conn.close()
+        return None
+
+    with conn:
+        writer = conn.makefile("w", encoding="utf-8")
+        reader = conn.makefile("r", encoding="utf-8")
+        isatty = sys.stdout.isatty()
+        writer.write(
+            json.dumps(
+                {
+                    "argv": argv,
+                    "cwd": os.getcwd(),
+                    "workspace": os.path.abspath(workspace_root()),
+                    "isatty": isatty,
+                    "env": _environment_digest(),
+                }
+            )
+            + "\n"
+        )
+        writer.flush()
+        threading.Thread(target=_pump_stdin, args=(writer,), daemon=True).start()
+
+        try:
+            for line in reader:
+                message = json.loads(line)
+                if "exit" in message:
+                    return message["exit"]
+                if message.get("local"):
+                    return None
+                for key, stream in (("out", sys.stdout), ("err", sys.stderr)):
+                    if key in message:
+                        text = message[key]
+                        stream.write(text if stream.isatty() else _ANSI_ESCAPE.sub("", text))
+                        stream.flush()
+        except KeyboardInterrupt:
+            # Closing the connection makes the daemon cancel the command.
+            sys.stderr.write("\nAborted!\n")
+            return 1
+    # The daemon closed the connection without an exit code.
+    return 1
+
+
+def _pump_stdin(writer):
+    try:
+        for line in sys.stdin:
+            writer.write(json.dumps({"in": line}) + "\n")
+            writer.flush()
+        writer.write(json.dumps({"eof": True}) + "\n")
+        writer.flush()
+    except (OSError, ValueError):
+        pass
+
+
+class _SocketOutput(io.TextIOBase):
+    """
+    Text stream that sends writes to the client as {key: text} messages.
+
+    Output for a client that has gone away is dropped and sets `cancel`.
+    """
+
+    def __init__(self, writer, lock, key, isatty, cancel):
+        self._writer = writer
+        self._lock = lock
+        self._key = key
+        self._isatty = isatty
+        self._cancel = cancel
+
+    def write(self, text):
+        if isinstance(text, bytes):
+            # click.echo writes bytes to streams it cannot identify as text.
+            text = text.decode("utf-8", errors="replace")
+        if text and not self._cancel.is_set():
+            try:
+                with self._lock:
+                    self._writer.write(json.dumps({self._key: text}) + "\n")
+                    self._writer.flush()
+            except (OSError, ValueError):
+                self._cancel.set()
+        return len(text)
+
+    def isatty(self):
+        return self._isatty
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+
+class _SocketInput(io.TextIOBase):
+    """Text stream that reads the client's stdin from the lines `_read_client` queues."""
+
+    def __init__(self, lines):
+        self._lines = lines
+        self._eof = False
+
+    def readline(self, size=-1):
+        if self._eof:
+            return ""
+        line = self._lines.get()
+        if not line:
+            self._eof = True
+        return line
+
+    def read(self, size=-1):
+        return "".join(iter(self.readline, ""))
+
+    def readable(self):
+        return True
+
+
+class _StreamProxy(io.TextIOBase):
+    """
+    Stand-in for sys.stdout, sys.stderr or sys.stdin inside the daemon.
+
+    Resolves to the streams of the request running in the current context,
+    so concurrent commands each talk to their own client. Threads started
+    with `tracing.submit` inherit the context; anything else falls back to
+    the daemon's own stream.
+    """
+
+    def __init__(self, index, fallback):
+        self._index = index
+        self._fallback = fallback
+
+    def _target(self):
+        streams = _streams.get()
+        return streams[self._index] if streams is not None else self._fallback
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        return self._target().flush()
+
+    def readline(self, size=-1):
+        return self._target().readline(size)
+
+    def read(self, size=-1):
+        return self._target().read(size)
+
+    def isatty(self):
+        return self._target().isatty()
+
+    def fileno(self):
+        return self._target().fileno()
+
+    @property
+    def encoding(self):
+        return self._target().encoding
+
+
+def _read_client(reader, lines, cancel):
+    """
+    Queue the client's stdin lines ("" at its end) until the client disconnects,
+    then set `cancel`.
+    """
+    try:
+        for line in reader:
+            message = json.loads(line)
+            lines.put("" if message.get("eof") else message.get("in", ""))
+    except (OSError, ValueError):
+        pass
+    lines.put("")
+    cancel.set()
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        writer = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+        reader = io.TextIOWrapper(self.rfile, encoding="utf-8")
+        lock = threading.Lock()
+        header = json.loads(reader.readline())
+
+        if (
+            os.path.realpath(header["cwd"]) != os.path.realpath(os.getcwd())
+            or header.get("env") != self.server.environment
+        ):
+            writer.write(json.dumps({"local": True}) + "\n")
+            return
+
+        isatty = header.get("isatty", False)
+        # Requests for other workspaces run side by side with this one's.
+        with use_workspace(header.get("workspace")), cancellation() as cancel:
+            lines = queue.Queue()
+            threading.Thread(target=_read_client, args=(reader, lines, cancel), daemon=True).start()
+            _streams.set(
+                (
+                    _SocketOutput(writer, lock, "out", isatty, cancel),
+                    _SocketOutput(writer, lock, "err", isatty, cancel),
+                    _SocketInput(lines),
+                )
+            )
+            code = run_command(header["argv"])
+        if cancel.is_set():
+            return
+        with lock:
+            writer.write(json.dumps({"exit": code}) + "\n")
+
+
+def run_command(argv):
+    """Run a CLI command in this process and return its exit code."""
+    import click
+    from resumecraftr.cli.main import cli
+
+    try:
+        result = cli.main(args=argv, prog_name="resumecraftr", standalone_mode=False)
+        return result if isinstance(result, int) else 0
+    except click.exceptions.Abort:
+        sys.stderr.write("Aborted!\n")
+        return 1
+    except click.exceptions.ClickException as e:
+        e.show()
+        return e.exit_code
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The environment the daemon's OpenAI client is built from.
+        self.environment = _environment_digest()
+
+
+def install_stream_proxies():
+    """Route sys.stdout, sys.stderr and sys.stdin to the client of the current request."""
+    sys.stdout = _StreamProxy(0, sys.stdout)
+    sys.stderr = _StreamProxy(1, sys.stderr)
+    sys.stdin = _StreamProxy(2, sys.stdin)
+
+
+def is_running(path=None):
+    """Return True if a daemon accepts connections on the socket (default: the current workspace's)."""
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(path or socket_file())
+        return True
+    except OSError:
+        return False
+    finally:
+        conn.close()
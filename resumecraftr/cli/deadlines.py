@@ -0,0 +1,84 @@
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# Deadlines and cancellation for OpenAI calls, scoped to the current context
+# like the workspace root: a command (or a daemon request) sets them, and the
+# threads it fans out to with `tracing.submit` inherit them.
+
+_deadline = contextvars.ContextVar("resumecraftr_deadline", default=None)
+_cancel = contextvars.ContextVar("resumecraftr_cancel", default=())
+
+
+class PromptError(RuntimeError):
+    """Raised when a prompt's run ends without an answer."""
+
+
+class PromptTimeout(PromptError):
+    """Raised when a prompt does not finish before its deadline."""
+
+
+class PromptCancelled(PromptError):
+    """Raised when a prompt's run is cancelled, e.g. after Ctrl+C."""
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Require every prompt in this context to finish within `seconds` from now.
+
+    Nested deadlines keep the earlier one. None sets no limit.
+    """
+    if seconds is None:
+        yield
+        return
+    end = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(end if current is None else min(current, end))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """Return the seconds left before the context's deadline, or None without one."""
+    end = _deadline.get()
+    return None if end is None else end - time.monotonic()
+
+
+@contextmanager
+def cancellation():
+    """
+    Cancel the runs started in this block if it exits with an exception.
+
+    Runs polling in other threads see the flag within a poll interval and
+    cancel themselves on OpenAI, so Ctrl+C does not leave them running.
+
+    Yields:
+        threading.Event: Set it to cancel the block's runs explicitly.
+    """
+    event = threading.Event()
+    token = _cancel.set(_cancel.get() + (event,))
+    try:
+        yield event
+    except BaseException:
+        event.set()
+        raise
+    finally:
+        _cancel.reset(token)
+
+
+def cancelled() -> bool:
+    """Return True if this context, or one it was started from, was cancelled."""
+    return any(event.is_set() for event in _cancel.get())
+
+
+def wait(seconds: float):
+    """Sleep up to `seconds`, waking early if this context is cancelled."""
+    events = _cancel.get()
+    if events:
+        events[-1].wait(seconds)
+    else:
+        time.sleep(seconds)
@@ -0,0 +1,405 @@
+import os
+import copy
+import json
+import time
+import contextvars
+from dataclasses import asdict, dataclass
+from resumecraftr.cli import tracing
+
+# Evaluation harness: runs a fixed corpus of CVs and job descriptions through
+# parsing and tailoring once per variant (a model, prompt or setting change
+# layered over the workspace configuration) and measures latency, tokens,
+# reply validity and agreement with golden outputs. Every call goes to the
+# configured backend with the artifact cache off; point OPENAI_BASE_URL at
+# tests/fake_openai_server.py to run it without OpenAI.
+#
+# A corpus is a directory:
+#
+#   cvs/<cv>.txt                                   CV texts
+#   jobs/<job>.txt                                 job descriptions
+#   golden/<cv>.extracted_sections.json            expected parse output (optional)
+#   golden/<cv>--<job>.optimized_sections.json     expected tailor output (optional)
+#   variants.json                                  {"<name>": {<config overlay>}} (optional)
+#
+# An overlay is merged into resumecraftr.json, e.g.
+# {"chat_gpt": {"model": "gpt-4o-mini"}}. Its "prompt_files" entry maps
+# prompt names (see `api.prompt_template`) to files, relative to the
+# variants file, holding the prompt revision to try.
+
+STEPS = ("parse", "tailor")
+# The settings a variant may change: those parsing and tailoring read. Any
+# other key would have no effect, and the variant would report the same runs
+# as the workspace configuration under another name.
+VARIANT_KEYS = {
+    "chat_gpt",
+    "prompts",
+    "prompt_files",
+    "primary_language",
+    "top_bullets",
+    "min_entry_tokens",
+    "tailor_output",
+    "local_extraction",
+    "local_extraction_threshold",
+}
+CHAT_GPT_KEYS = {
+    "model",
+    "temperature",
+    "top_p",
+    "max_tokens",
+    "sections",
+    "commands",
+    "structured_outputs",
+    "repair_retries",
+    "limits",
+    "timeout",
+    "hedge",
+    "backend",
+    "base_url",
+    "batch_size",
+    "batch_window",
+    "completion_template",
+}
+# Trace spans that stand for one request to the model, per backend.
+CALL_SPANS = ("run.wait", "chat.completions", "completions")
+VARIANTS_FILE = "variants.json"
+
+
+@dataclass
+class Corpus:
+    """
+    The inputs of an evaluation.
+
+    Attributes:
+        root (str): The corpus directory.
+        cvs (dict): CV texts keyed by name.
+        jobs (dict): Job descriptions keyed by name.
+    """
+
+    root: str
+    cvs: dict
+    jobs: dict
+
+    def golden(self, name: str):
+        """Return a golden output by file name, or None if there is none."""
+        path = os.path.join(self.root, "golden", name)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+@dataclass
+class Sample:
+    """
+    One measured parse or tailor of a corpus item.
+
+    Attributes:
+        variant (str): The variant name.
+        step (str): "parse" or "tailor".
+        item (str): The CV name, or "<cv>--<job>" when tailoring.
+        seconds (float): Wall-clock time of the step.
+        calls (int): Prompts sent, repairs included.
+        input_tokens (int): Prompt tokens reported by the backend.
+        output_tokens (int): Reply tokens reported by the backend.
+        replies (int): Section replies checked, before any repair.
+        valid_json (int): Replies that parsed as JSON.
+        well_formed (int): Replies with the expected structure.
+        sections (int): Sections produced.
+        failed (int): Sections that could not be produced.
+        agreement (float): Share of golden fields reproduced, or None without a golden output.
+    """
+
+    variant: str
+    step: str
+    item: str
+    seconds: float
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    replies: int = 0
+    valid_json: int = 0
+    well_formed: int = 0
+    sections: int = 0
+    failed: int = 0
+    agreement: float = None
+
+
+def _read_dir(path: str) -> dict:
+    texts = {}
+    if not os.path.isdir(path):
+        return texts
+    for name in sorted(os.listdir(path)):
+        if name.endswith((".txt", ".md")):
+            with open(os.path.join(path, name), "r", encoding="utf-8") as f:
+                texts[os.path.splitext(name)[0]] = f.read()
+    return texts
+
+
+def load_corpus(root: str) -> Corpus:
+    """Read a corpus directory (see the module comment)."""
+    return Corpus(
+        root=root,
+        cvs=_read_dir(os.path.join(root, "cvs")),
+        jobs=_read_dir(os.path.join(root, "jobs")),
+    )
+
+
+def _merge(base: dict, overlay: dict) -> dict:
+    merged = dict(base)
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_variants(path: str, config: dict) -> dict:
+    """
+    Build the configuration of every variant.
+
+    Args:
+        path (str): The variants file. Without it, the workspace configuration
+            is the only variant, named "current".
+        config (dict): The workspace configuration.
+
+    Returns:
+        dict: Variant configurations keyed by name, with the artifact cache off.
+
+    Raises:
+        ValueError: If a variant sets something parsing and tailoring do not
+            read (see VARIANT_KEYS and CHAT_GPT_KEYS).
+    """
+    overlays = {"current": {}}
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            overlays = json.load(f)
+    variants = {}
+    for name, overlay in overlays.items():
+        unknown = sorted(set(overlay) - VARIANT_KEYS) + sorted(
+            f"chat_gpt.{key}" for key in set(overlay.get("chat_gpt", {})) - CHAT_GPT_KEYS
+        )
+        if unknown:
+            raise ValueError(f"Variant '{name}' sets {', '.join(unknown)}, which evaluation cannot apply.")
+        overlay = copy.deepcopy(overlay)
+        prompts = {}
+        for prompt_name, prompt_file in overlay.pop("prompt_files", {}).items():
+            with open(os.path.join(os.path.dirname(path), prompt_file), "r", encoding="utf-8") as f:
+                prompts[prompt_name] = f.read()
+        if prompts:
+            overlay = _merge(overlay, {"prompts": prompts})
+        variants[name] = {**_merge(config, overlay), "artifact_cache": False}
+    return variants
+
+
+def _leaves(value, path=""):
+    """Flatten a section value to {path: normalized leaf}; scalar lists compare as sets."""
+    if isinstance(value, dict):
+        leaves = {}
+        for key, item in value.items():
+            leaves.update(_leaves(item, f"{path}/{key}"))
+        return leaves
+    if isinstance(value, list):
+        if all(not isinstance(item, (dict, list)) for item in value):
+            return {path: frozenset(_normalize(item) for item in value)} if value else {}
+        leaves = {}
+        for index, item in enumerate(value):
+            leaves.update(_leaves(item, f"{path}[{index}]"))
+        return leaves
+    return {path: _normalize(value)} if value not in (None, "") else {}
+
+
+def _normalize(value) -> str:
+    return " ".join(str(value).casefold().split())
+
+
+def field_agreement(output: dict, golden: dict):
+    """
+    Return the share of the golden output's fields that the output reproduces.
+
+    Fields are compared by path after case and whitespace normalization; lists
+    of strings compare as sets. Returns None if the golden output has no fields.
+    """
+    expected = _leaves(golden)
+    if not expected:
+        return None
+    actual = _leaves(output)
+    return sum(actual.get(path) == value for path, value in expected.items()) / len(expected)
+
+
+def _measure(variant, step, item, run):
+    """Run one step under its own trace and turn the trace into a Sample."""
+
+    def traced():
+        root = tracing.start("eval", variant=variant, step=step)
+        started = time.perf_counter()
+        result = run()
+        seconds = time.perf_counter() - started
+        tracing.finish()
+        return result, seconds, root
+
+    # A fresh context, so the trace is this step's alone.
+    result, seconds, root = contextvars.copy_context().run(traced)
+    sample = Sample(variant=variant, step=step, item=item, seconds=seconds)
+    stack = list(root.children)
+    while stack:
+        node = stack.pop()
+        stack.extend(node.children)
+        if node.name in CALL_SPANS:
+            sample.calls += 1
+            sample.input_tokens += node.attrs.get("input_tokens", 0)
+            sample.output_tokens += node.attrs.get("output_tokens", 0)
+        elif node.name == "check_reply":
+            sample.replies += 1
+            sample.valid_json += bool(node.attrs.get("valid_json"))
+            sample.well_formed += bool(node.attrs.get("well_formed"))
+    return result, sample
+
+
+def run_variant(name: str, config: dict, corpus: Corpus, steps=STEPS, repeat: int = 1, on_sample=None) -> list:
+    """
+    Parse and tailor every corpus item with one variant.
+
+    Tailoring starts from the golden parse output of a CV when there is one,
+    so its scores do not depend on the variant's parsing.
+
+    Args:
+        name (str): The variant name.
+        config (dict): The variant's configuration.
+        corpus (Corpus): The inputs.
+        steps (tuple, optional): Which of STEPS to run.
+        repeat (int, optional): Runs per item, for steadier latencies.
+        on_sample (callable, optional): Called with each Sample as it is measured.
+
+    Returns:
+        list: The Samples.
+    """
+    from resumecraftr.api import ResumeCraftr
+
+    craftr = ResumeCraftr(config=config, use_cache=False)
+    samples = []
+
+    def record(sample):
+        samples.append(sample)
+        if on_sample is not None:
+            on_sample(sample)
+
+    for cv_name, cv_text in corpus.cvs.items():
+        golden_sections = corpus.golden(f"{cv_name}.extracted_sections.json")
+        parsed = golden_sections
+        for _ in range(repeat if "parse" in steps else 0):
+            result, sample = _measure(name, "parse", cv_name, lambda: craftr.parse(cv_text))
+            sample.sections, sample.failed = len(result.sections), len(result.failed)
+            if golden_sections is not None:
+                sample.agreement = field_agreement(result.sections, golden_sections)
+            if parsed is None:
+                parsed = result.sections
+            record(sample)
+
+        if "tailor" not in steps or not parsed:
+            continue
+        for job_name, job_text in corpus.jobs.items():
+            item = f"{cv_name}--{job_name}"
+            golden = corpus.golden(f"{item}.optimized_sections.json")
+            for _ in range(repeat):
+                result, sample = _measure(name, "tailor", item, lambda: craftr.tailor(parsed, job_text))
+                sample.sections, sample.failed = len(result.tailored), len(result.failed)
+                if golden is not None:
+                    sample.agreement = field_agreement(result.sections, golden)
+                record(sample)
+    return samples
+
+
+def percentile(values: list, fraction: float):
+    """Return a percentile of a list (lower nearest rank), or None if it is empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[int(fraction * (len(ordered) - 1))]
+
+
+def _share(part, whole):
+    return part / whole if whole else None
+
+
+def summarize(samples: list) -> list:
+    """
+    Aggregate samples per variant and step.
+
+    Returns:
+        list: One dict per (variant, step), in the order first measured, with
+        p50/p95 seconds, mean tokens per item, the JSON, structure and
+        success rates and the mean golden agreement.
+    """
+    groups = {}
+    for sample in samples:
+        groups.setdefault((sample.variant, sample.step), []).append(sample)
+    rows = []
+    for (variant, step), group in groups.items():
+        seconds = [sample.seconds for sample in group]
+        agreements = [sample.agreement for sample in group if sample.agreement is not None]
+        replies = sum(sample.replies for sample in group)
+        produced = sum(sample.sections for sample in group)
+        rows.append(
+            {
+                "variant": variant,
+                "step": step,
+                "samples": len(group),
+                "p50_seconds": percentile(seconds, 0.5),
+                "p95_seconds": percentile(seconds, 0.95),
+                "calls": sum(sample.calls for sample in group) / len(group),
+                "input_tokens": sum(sample.input_tokens for sample in group) / len(group),
+                "output_tokens": sum(sample.output_tokens for sample in group) / len(group),
+                "valid_json": _share(sum(sample.valid_json for sample in group), replies),
+                "well_formed": _share(sum(sample.well_formed for sample in group), replies),
+                "success": _share(produced, produced + sum(sample.failed for sample in group)),
+                "agreement": sum(agreements) / len(agreements) if agreements else None,
+            }
+        )
+    return rows
+
+
+def print_report(console, rows: list):
+    """
+    Print the summary table of an evaluation: latency percentiles, mean calls
+    and tokens per run, and the shares of replies that were valid JSON and
+    had the expected shape, of sections produced and of golden fields matched.
+    """
+    from rich import box
+    from rich.table import Table
+
+    def percent(value):
+        return "-" if value is None else f"{value:.0%}"
+
+    table = Table(
+        title="Evaluation: p50/p95 seconds; calls and in/out tokens per run",
+        box=box.SIMPLE,
+        pad_edge=False,
+        collapse_padding=True,
+    )
+    for column in ("Variant", "Step", "p50/p95", "Calls", "Tokens", "JSON", "Shape", "Done", "Golden"):
+        table.add_column(column, justify="left" if column in ("Variant", "Step") else "right", no_wrap=True)
+    for row in rows:
+        table.add_row(
+            row["variant"],
+            row["step"],
+            f"{row['p50_seconds']:.2f}/{row['p95_seconds']:.2f}",
+            f"{row['calls']:.1f}",
+            f"{row['input_tokens']:.0f}/{row['output_tokens']:.0f}",
+            percent(row["valid_json"]),
+            percent(row["well_formed"]),
+            percent(row["success"]),
+            percent(row["agreement"]),
+        )
+    console.print(table)
+
+
+def write_report(path: str, rows: list, samples: list):
+    """Write the summary and every sample as JSON, for comparing runs."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"summary": rows, "samples": [asdict(sample) for sample in samples]},
+            f,
+            indent=4,
+            ensure_ascii=False,
+        )
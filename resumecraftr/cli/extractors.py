@@ -0,0 +1,351 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from resumecraftr.cli.schemas import section_specs
+from resumecraftr.cli.tracing import span
+
+# Local extractors: sections that follow a predictable layout (Contact
+# Information, Languages, Education) are filled in with regexes and heading
+# detection instead of a model call. Each extractor reports how sure it is,
+# from 0 to 1; only sections at or above `local_extraction_threshold`
+# (resumecraftr.json, default DEFAULT_THRESHOLD) skip the model, so an
+# unusual layout, a leftover fragment or a CV written in another language
+# than the output still goes to the model. Set "local_extraction": false to
+# send every section to the model.
+#
+# Languages and Education can only be filled in for English and Spanish
+# output; Contact Information does not depend on the language.
+
+DEFAULT_THRESHOLD = 0.85
+
+# Headings that open each section, in English and Spanish, compared after
+# dropping case, accents, markdown and a trailing colon.
+HEADINGS = {
+    "Contact Information": ("contact", "contact information", "contact details", "contacto", "informacion de contacto", "datos de contacto"),
+    "Summary": ("summary", "professional summary", "profile", "about me", "resumen", "perfil", "perfil profesional", "sobre mi"),
+    "Technical Skills": ("skills", "technical skills", "tech stack", "habilidades", "habilidades tecnicas", "competencias", "conocimientos tecnicos"),
+    "Work Experience": ("experience", "work experience", "professional experience", "employment history", "experiencia", "experiencia laboral", "experiencia profesional"),
+    "Projects": ("projects", "personal projects", "proyectos"),
+    "Education": ("education", "academic background", "educacion", "formacion", "formacion academica", "estudios"),
+    "Certifications": ("certifications", "certificates", "courses", "certificaciones", "cursos"),
+    "Publications & Open Source Contributions": ("publications", "open source", "open source contributions", "publicaciones"),
+    "Awards & Recognitions": ("awards", "honors", "awards & recognitions", "premios", "reconocimientos"),
+    "Languages": ("languages", "spoken languages", "language skills", "idiomas"),
+}
+
+# (English, Spanish) names of spoken languages and proficiency levels.
+LANGUAGE_NAMES = (
+    ("English", "Inglés"), ("Spanish", "Español"), ("Portuguese", "Portugués"),
+    ("French", "Francés"), ("German", "Alemán"), ("Italian", "Italiano"),
+    ("Dutch", "Neerlandés"), ("Catalan", "Catalán"), ("Basque", "Euskera"),
+    ("Galician", "Gallego"), ("Russian", "Ruso"), ("Ukrainian", "Ucraniano"),
+    ("Polish", "Polaco"), ("Czech", "Checo"), ("Romanian", "Rumano"),
+    ("Greek", "Griego"), ("Swedish", "Sueco"), ("Norwegian", "Noruego"),
+    ("Danish", "Danés"), ("Finnish", "Finés"), ("Hungarian", "Húngaro"),
+    ("Turkish", "Turco"), ("Arabic", "Árabe"), ("Hebrew", "Hebreo"),
+    ("Hindi", "Hindi"), ("Chinese", "Chino"), ("Mandarin", "Mandarín"),
+    ("Cantonese", "Cantonés"), ("Japanese", "Japonés"), ("Korean", "Coreano"),
+    ("Vietnamese", "Vietnamita"), ("Indonesian", "Indonesio"), ("Tagalog", "Tagalo"),
+)
+PROFICIENCY_LEVELS = (
+    ("native", "nativo"), ("mother tongue", "lengua materna"), ("bilingual", "bilingüe"),
+    ("fluent", "fluido"), ("proficient", "competente"), ("advanced", "avanzado"),
+    ("upper intermediate", "intermedio alto"), ("intermediate", "intermedio"),
+    ("conversational", "conversacional"), ("basic", "básico"),
+    ("elementary", "elemental"), ("beginner", "principiante"),
+)
+CEFR_LEVEL = re.compile(r"^(?:[ABC][12](?:\s*[-/]\s*[ABC][12])?|ielts.*|toefl.*|dele.*)$", re.I)
+LANGUAGE_CODES = {
+    "en": "EN", "english": "EN", "ingles": "EN",
+    "es": "ES", "spanish": "ES", "espanol": "ES", "castellano": "ES",
+}
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+LINKEDIN = re.compile(r"(?:https?://)?(?:[\w-]+\.)?linkedin\.com/in/[\w%-]+/?", re.I)
+GITHUB = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9-]+", re.I)
+URL = re.compile(
+    r"(?:https?://|www\.)[^\s|,;()<>]+"
+    r"|\b[\w-]+(?:\.[\w-]+)*\.(?:dev|io|me|com|net|org|site|page|app|tech)(?:/[^\s|,;()<>]*)?(?![\w.])",
+    re.I,
+)
+PHONE = re.compile(r"(?<![\w/.])\+?\(?\d[\d\s().-]{5,}\d(?![\w/])")
+YEAR_RANGE_ONLY = re.compile(r"(?:19|20)\d\d(?:\s*[-–]\s*(?:19|20)\d\d)?")
+NAME_WORD = re.compile(r"^(?:[A-ZÁÉÍÓÚÑÜ][\w'’.-]*|de|del|da|di|la|le|van|von|der|y|e)$")
+
+_YEAR = r"(?:19|20)\d\d(?:[-/.](?:0?[1-9]|1[0-2]))?"
+DATES = re.compile(
+    rf"(?:expected\s+|esperado\s+)?{_YEAR}"
+    rf"(?:\s*(?:-|–|—|to|a|hasta)\s*(?:{_YEAR}|present|current|now|presente|actualidad|actual))?",
+    re.I,
+)
+DEGREE = re.compile(
+    r"\b(?:B\.?\s?Sc|B\.\s?A\.|B\.\s?S\.|BEng|M\.?\s?Sc|M\.\s?A\.|M\.\s?S\.|MEng|MBA|Ph\.?\s?D)"
+    r"|\b(?:bachelor|master|doctor|associate|diploma|licenciad|licenciatur|ingenier|engineer"
+    r"|grado en|máster|magíster|magister|técnic|tecnólog)",
+    re.I,
+)
+INSTITUTION = re.compile(
+    r"\b(?:universit|universidad|college|institut|school|escuela|academ|polytechn|politécnic|facultad|faculty)",
+    re.I,
+)
+FRAGMENT_SEPARATORS = re.compile(r"\s*(?:[,|;•·()]|\s[-–—]\s)\s*")
+BULLET = re.compile(r"^\s*(?:[-*•·]|\d+[.)])\s+")
+
+_WORD = re.compile(r"\w+")
+STOP_WORDS = {
+    "EN": frozenset("the and of with for to in on at as by from".split()),
+    "ES": frozenset("de la el y en con para los las del por un una".split()),
+}
+
+
+@dataclass
+class Extraction:
+    """
+    A section filled in without a model call.
+
+    Attributes:
+        content: The section, in the same shape as the model's reply.
+        confidence (float): How sure the rules are, from 0 to 1.
+    """
+
+    content: object
+    confidence: float
+
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def _heading(line: str):
+    """Return the section a line opens, or None if it is not a heading."""
+    text = _fold(line).strip().strip("#*_=").strip().rstrip(":").strip()
+    if not text or len(text) > 40:
+        return None
+    for section, aliases in HEADINGS.items():
+        if text in aliases:
+            return section
+    return None
+
+
+def split_sections(text: str) -> dict:
+    """
+    Split CV text at its headings.
+
+    Returns:
+        dict: Lines under each recognized heading keyed by section name, and
+        the lines before the first heading under "".
+    """
+    blocks = {"": []}
+    current = ""
+    for line in text.splitlines():
+        section = _heading(line)
+        if section is not None:
+            current = section
+            blocks.setdefault(current, [])
+        elif line.strip():
+            blocks[current].append(line.strip())
+    return blocks
+
+
+def detect_language(text: str):
+    """Guess whether a text is English ("EN") or Spanish ("ES") from its stop words."""
+    words = _WORD.findall(text.casefold())
+    counts = {code: sum(word in stop for word in words) for code, stop in STOP_WORDS.items()}
+    best = max(counts, key=counts.get)
+    return best if counts[best] >= 3 and counts[best] >= 2 * min(counts.values()) else None
+
+
+def extract_contact(blocks: dict, text: str, language: str) -> Extraction:
+    """Fill in Contact Information from the top of the CV and its contact block."""
+    area = "\n".join(blocks[""] + blocks.get("Contact Information", []))
+    emails = list(dict.fromkeys(EMAIL.findall(area) or EMAIL.findall(text)))
+    linkedin = list(dict.fromkeys(m.rstrip("/") for m in LINKEDIN.findall(area) or LINKEDIN.findall(text)))
+    github = list(dict.fromkeys(GITHUB.findall(area) or GITHUB.findall(text)))
+
+    rest = EMAIL.sub(" ", area)
+    rest = LINKEDIN.sub(" ", rest)
+    rest = GITHUB.sub(" ", rest)
+    portfolio = list(dict.fromkeys(url.rstrip(".") for url in URL.findall(rest)))
+    phones = [
+        phone.strip()
+        for phone in PHONE.findall(URL.sub(" ", rest))
+        if 7 <= sum(char.isdigit() for char in phone) <= 15
+        and not YEAR_RANGE_ONLY.fullmatch(phone.strip())
+    ]
+    phones = list(dict.fromkeys(phones))
+
+    name = None
+    for line in blocks[""][:3]:
+        candidate = re.split(r"\s[|–—-]\s|\|", line)[0].strip()
+        words = candidate.split()
+        if 2 <= len(words) <= 5 and all(NAME_WORD.match(word) for word in words) and not any(
+            char.isdigit() for char in candidate
+        ):
+            name = candidate
+            break
+
+    content = {
+        "Full Name": name,
+        "Email": emails[0] if emails else None,
+        "Phone Number": phones[0] if phones else None,
+        "LinkedIn": linkedin[0] if linkedin else None,
+        "GitHub": github[0] if github else None,
+        "Portfolio": portfolio[0] if portfolio else None,
+    }
+    confidence = 0.95
+    if name is None:
+        confidence = min(confidence, 0.4)
+    if not emails and not phones:
+        confidence = min(confidence, 0.5)
+    if max(len(emails), len(phones), len(linkedin), len(github), len(portfolio)) > 1:
+        # Which one is the candidate's is a judgement call.
+        confidence = min(confidence, 0.7)
+    return Extraction(content, confidence)
+
+
+def _translate(term: str, pairs, language: str):
+    """Return a term in the output language if it is one of the known pairs, else None."""
+    folded = _fold(term)
+    for english, spanish in pairs:
+        if folded in (_fold(english), _fold(spanish)):
+            if folded == _fold(english if language == "EN" else spanish):
+                return term
+            return english if language == "EN" else spanish
+    return None
+
+
+def extract_languages(blocks: dict, text: str, language: str) -> Extraction:
+    """Fill in Languages from lines such as "English (C1), Spanish: native"."""
+    lines = blocks.get("Languages")
+    if not lines or language not in ("EN", "ES"):
+        return Extraction([], 0.0)
+    names = sorted((name for pair in LANGUAGE_NAMES for name in pair), key=len, reverse=True)
+    pattern = re.compile(
+        r"^(" + "|".join(re.escape(_fold(name)) for name in names) + r")\b\s*[:\-–—(]?\s*(.*?)\s*\)?\s*$"
+    )
+    entries, unparsed, missing_level = [], 0, 0
+    for line in lines:
+        for item in re.split(r"[,;|•·]", BULLET.sub("", line)):
+            item = item.strip()
+            if not item:
+                continue
+            match = pattern.match(_fold(item))
+            if match is None:
+                unparsed += 1
+                continue
+            # Slice the original text, so accents and case are kept.
+            name = item[: len(match.group(1))]
+            level = item[match.start(2) : match.end(2)] if match.group(2) else ""
+            translated_level = _translate(level, PROFICIENCY_LEVELS, language)
+            if translated_level is None:
+                # CEFR levels and certificates read the same in every language.
+                missing_level += not CEFR_LEVEL.match(level)
+                translated_level = level
+            entries.append(
+                {
+                    "Language": _translate(name, LANGUAGE_NAMES, language),
+                    "Proficiency": translated_level,
+                }
+            )
+    confidence = 0.9 if entries else 0.0
+    if unparsed:
+        confidence = min(confidence, 0.5)
+    if missing_level:
+        confidence = min(confidence, 0.7)
+    return Extraction(entries, confidence)
+
+
+def extract_education(blocks: dict, text: str, language: str) -> Extraction:
+    """Fill in Education from lines holding a degree, an institution and their dates."""
+    lines = blocks.get("Education")
+    if not lines:
+        return Extraction([], 0.0)
+    entries, current, leftovers = [], {}, 0
+
+    def put(field, value):
+        nonlocal current
+        if field in current:
+            entries.append(current)
+            current = {}
+        current[field] = value
+
+    for line in lines:
+        line = BULLET.sub("", line)
+        dates = DATES.search(line)
+        rest = line
+        if dates is not None:
+            rest = line[: dates.start()] + " | " + line[dates.end() :]
+        for fragment in FRAGMENT_SEPARATORS.split(rest):
+            fragment = fragment.strip(" .")
+            if not fragment:
+                continue
+            if DEGREE.search(fragment):
+                put("Degree", fragment)
+            elif INSTITUTION.search(fragment):
+                put("Institution", fragment)
+            else:
+                leftovers += 1
+        if dates is not None:
+            put("Graduation Years", dates.group(0))
+    if current:
+        entries.append(current)
+
+    fields = ("Degree", "Institution", "Graduation Years")
+    content = [{field: entry.get(field, "") for field in fields} for entry in entries]
+    complete = bool(entries) and all(len(entry) == len(fields) for entry in entries)
+    confidence = 0.9 if complete else 0.4
+    if leftovers:
+        # Grades, honors or a campus the rules cannot place.
+        confidence = min(confidence, 0.6)
+    if detect_language(text) != language:
+        # Degree names would have to be translated.
+        confidence = min(confidence, 0.5)
+    return Extraction(content, confidence)
+
+
+EXTRACTORS = {
+    "Contact Information": (extract_contact, ("Full Name", "Email", "Phone Number", "LinkedIn", "GitHub", "Portfolio")),
+    "Languages": (extract_languages, ("Language", "Proficiency")),
+    "Education": (extract_education, ("Degree", "Institution", "Graduation Years")),
+}
+
+
+def extract_locally(config: dict, text: str, section_names: list, language: str) -> dict:
+    """
+    Fill in the sections the local rules are confident about.
+
+    A section is only handled when its fields in sections.json are the ones
+    its extractor produces.
+
+    Args:
+        config (dict): The workspace configuration.
+        text (str): The CV text.
+        section_names (list): The sections to extract.
+        language (str): The output language, e.g. "EN".
+
+    Returns:
+        dict: Extractions at or above the confidence threshold, keyed by section name.
+    """
+    if not config.get("local_extraction", True):
+        return {}
+    threshold = config.get("local_extraction_threshold", DEFAULT_THRESHOLD)
+    language = LANGUAGE_CODES.get(_fold(language or "").strip(), (language or "").upper())
+    specs = section_specs()
+    blocks = None
+    extracted = {}
+    with span("local_extract") as trace:
+        for name in section_names:
+            if name not in EXTRACTORS:
+                continue
+            extractor, fields = EXTRACTORS[name]
+            if tuple(specs.get(name, {}).get("fields", {})) != fields:
+                continue
+            if blocks is None:
+                blocks = split_sections(text)
+            extraction = extractor(blocks, text, language)
+            if trace is not None:
+                trace.attrs[name] = round(extraction.confidence, 2)
+            if extraction.confidence >= threshold:
+                extracted[name] = extraction
+    return extracted
@@ -1,31 +1,172 @@
 import os
+import sys
+import importlib
 import click
-from rich.console import Console
-from resumecraftr.cli.cmd.setup import setup
-from resumecraftr.cli.cmd.import_cv import import_cv
-from resumecraftr.cli.cmd.parse_cv import parse_cv
-from resumecraftr.cli.cmd.add_job import add_job
-from resumecraftr.cli.cmd.tailor_cv import tailor_cv
-from resumecraftr.cli.cmd.export_pdf import export_pdf
-from resumecraftr.cli.cmd.new_cv import new_cv, edit_section, view_cv
-
-console = Console()
-
-@click.group()
-def cli():
+from resumecraftr.cli.workspace import WORKSPACE_ENV, set_workspace, use_workspace, workspace_path
+
+# Socket of `resumecraftr serve`, inside the workspace; see resumecraftr/cli/daemon.py.
+DAEMON_SOCKET_NAME = ".resumecraftr.sock"
+
+# Command name -> ("module:attribute", short help). Modules are imported only
+# when their command runs, so `--help` and local commands such as `view-cv` do
+# not pay for importing the OpenAI SDK, PyPDF2 or the prompt templates.
+LAZY_COMMANDS = {
+    "setup": (
+        "resumecraftr.cli.cmd.setup:setup",
+        "Initialize a new ResumeCraftr workspace.",
+    ),
+    "import-cv": (
+        "resumecraftr.cli.cmd.import_cv:import_cv",
+        "Import a CV from a PDF file and save it in the workspace directory.",
+    ),
+    "parse-cv": (
+        "resumecraftr.cli.cmd.parse_cv:parse_cv",
+        "Parse a CV from a previously imported text file into structured sections.",
+    ),
+    "add-job": (
+        "resumecraftr.cli.cmd.add_job:add_job",
+        "Add a job description by copying content or from a file.",
+    ),
+    "tailor-cv": (
+        "resumecraftr.cli.cmd.tailor_cv:tailor_cv",
+        "Tailor a CV based on a job description.",
+    ),
+    "export-pdf": (
+        "resumecraftr.cli.cmd.export_pdf:export_pdf",
+        "Export a PDF resume using Pandoc.",
+    ),
+    "new-cv": (
+        "resumecraftr.cli.cmd.new_cv:new_cv",
+        "Create a new empty CV with the given name.",
+    ),
+    "edit-section": (
+        "resumecraftr.cli.cmd.new_cv:edit_section",
+        "Add or update a section in a CV.",
+    ),
+    "view-cv": (
+        "resumecraftr.cli.cmd.new_cv:view_cv",
+        "Display the contents of a CV.",
+    ),
+    "watch": (
+        "resumecraftr.cli.cmd.watch:watch",
+        "Watch the workspace and rebuild the tailored CV, Markdown and PDF when inputs change.",
+    ),
+    "collect": (
+        "resumecraftr.cli.cmd.collect:collect",
+        "Merge finished OpenAI batches into the parsed and tailored CV files.",
+    ),
+    "serve": (
+        "resumecraftr.cli.cmd.serve:serve",
+        "Run a background server that keeps OpenAI and workspace state warm for other commands.",
+    ),
+    "gc": (
+        "resumecraftr.cli.cmd.gc:gc",
+        "Remove stored artifacts that nothing references anymore.",
+    ),
+    "eval": (
+        "resumecraftr.cli.cmd.evaluate:evaluate",
+        "Compare prompt revisions and models on a corpus of CVs and job descriptions.",
+    ),
+}
+
+
+class LazyGroup(click.Group):
+    """Click group that imports a command's module only when the command is invoked."""
+
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def main(self, args=None, **kwargs):
+        # From the command line, hand the command to `resumecraftr serve` when
+        # one is running for this workspace. Checking for the socket first
+        # keeps startup cost unchanged when there is no server.
+        if args is None:
+            with use_workspace(_workspace_option(sys.argv[1:])):
+                if os.path.exists(workspace_path(DAEMON_SOCKET_NAME)):
+                    from resumecraftr.cli.daemon import forward
+
+                    code = forward(sys.argv[1:])
+                    if code is not None:
+                        sys.exit(code)
+        return super().main(args, **kwargs)
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_commands:
+            module_name, attribute = self.lazy_commands[cmd_name][0].split(":")
+            return getattr(importlib.import_module(module_name), attribute)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        # Use the registered short help so listing commands imports nothing.
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.lazy_commands:
+                rows.append((name, self.lazy_commands[name][1]))
+            else:
+                command = super().get_command(ctx, name)
+                if command is not None and not command.hidden:
+                    rows.append((name, command.get_short_help_str()))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+def _workspace_option(args):
+    """Return the --workspace value from raw arguments, or None if it is not given."""
+    for index, arg in enumerate(args):
+        if arg == "--workspace" and index + 1 < len(args):
+            return args[index + 1]
+        if arg.startswith("--workspace="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
+@click.option(
+    "--workspace",
+    envvar=WORKSPACE_ENV,
+    type=click.Path(file_okay=False),
+    help=f"Workspace directory to use instead of ./cv-workspace (or set {WORKSPACE_ENV}).",
+)
+@click.option("--profile", is_flag=True, help="Print a per-phase timing tree when the command finishes.")
+@click.option(
+    "--trace-file",
+    type=click.Path(dir_okay=False),
+    help="Also write the timings as Chrome trace-event JSON to this file.",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds the whole command may spend waiting for OpenAI; unfinished calls are cancelled.",
+)
+@click.pass_context
+def cli(ctx, workspace, profile, trace_file, timeout):
     """ResumeCraftr - A tool for creating and managing ATS-friendly resumes."""
-    pass
-
-# Register commands
-cli.add_command(setup)
-cli.add_command(import_cv)
-cli.add_command(parse_cv)
-cli.add_command(add_job)
-cli.add_command(tailor_cv)
-cli.add_command(export_pdf)
-cli.add_command(new_cv)
-cli.add_command(edit_section)
-cli.add_command(view_cv)
+    set_workspace(workspace)
+    if timeout is not None:
+        from resumecraftr.cli.deadlines import deadline
+
+        ctx.with_resource(deadline(timeout))
+    if profile or trace_file:
+        from resumecraftr.cli import tracing
+
+        tracing.start(ctx.invoked_subcommand or "resumecraftr")
+        ctx.call_on_close(lambda: report_profile(profile, trace_file))
+
+
+def report_profile(profile, trace_file):
+    from rich.console import Console
+    from resumecraftr.cli import tracing
+
+    root = tracing.finish()
+    if profile:
+        tracing.print_profile(root, Console(stderr=True))
+    if trace_file:
+        tracing.write_chrome_trace(root, trace_file)
 
 if __name__ == "__main__":
     cli()
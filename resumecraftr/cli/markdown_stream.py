@@ -0,0 +1,118 @@
+import re
+from resumecraftr.cli.deadlines import PromptError
+
+# Streamed Markdown generation. The reply of export-pdf's Markdown prompt is
+# written to its openai-response-*.md file piece by piece as it arrives, so
+# the user can follow it and a dropped connection leaves the part already
+# generated on disk for `export-pdf --skip-md-gen`. The YAML front matter is
+# checked as soon as its closing line arrives: a block Pandoc would reject
+# stops the generation right away instead of after the whole document.
+#
+# PyYAML is used for the check when it is installed; otherwise each line of
+# the block must look like "key: value", a list item or a continuation.
+
+FENCE = re.compile(r"^\s*```[\w-]*\s*\n")
+FRONT_MATTER = re.compile(r"^\s*---[ \t]*\n(.*?\n)(?:---|\.\.\.)[ \t]*\n", re.S)
+YAML_KEY = re.compile(r"^[\w.-]+\s*:")
+
+
+class FrontMatterError(PromptError):
+    """The generated document's YAML front matter would not be accepted by Pandoc."""
+
+
+def front_matter_problems(block: str) -> list:
+    """
+    Check a YAML front matter block, without its --- lines.
+
+    Only YAML Pandoc cannot read is reported. Every field, title included, is
+    optional, so a block without a title is fine.
+
+    Returns:
+        list: What is wrong with it; empty if it is fine.
+    """
+    try:
+        import yaml
+    except ImportError:
+        yaml = None
+
+    if yaml is not None:
+        try:
+            data = yaml.safe_load(block)
+        except yaml.YAMLError as e:
+            return [f"it is not valid YAML ({str(e).splitlines()[0]})"]
+        if data is not None and not isinstance(data, dict):
+            return ["it is not a list of key: value pairs"]
+        return []
+    for line in block.splitlines():
+        if not line.strip() or line.lstrip().startswith("#") or line[:1].isspace():
+            continue
+        if line.startswith("- "):
+            continue
+        if not YAML_KEY.match(line):
+            return [f"'{line.strip()}' is not a key: value line"]
+    return []
+
+
+class MarkdownStream:
+    """
+    Write a Markdown reply to a file as it is generated.
+
+    Pass the instance as `on_delta` to `execute_prompt` (or `render`). The file
+    is created with the first piece and flushed after every piece.
+
+    Args:
+        path (str): The file to write.
+        echo (callable, optional): Also called with every piece, e.g. to show
+            the document in the terminal as it is written.
+
+    Raises:
+        FrontMatterError: From the call that completes an invalid front matter
+            block, which stops the generation.
+    """
+
+    def __init__(self, path: str, echo=None):
+        self.path = path
+        self.echo = echo
+        self.pieces = []
+        self.checked = False
+        self._file = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self.pieces)
+
+    def __call__(self, piece: str):
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(piece)
+        self._file.flush()
+        self.pieces.append(piece)
+        if self.echo is not None:
+            self.echo(piece)
+        if not self.checked:
+            self._check_front_matter()
+
+    def _check_front_matter(self):
+        text = FENCE.sub("", self.text, count=1).lstrip()
+        if len(text) < 3:
+            return
+        if not text.startswith("---"):
+            # No front matter; Pandoc does not need one.
+            self.checked = True
+            return
+        match = FRONT_MATTER.match(text)
+        if match is None:
+            return
+        self.checked = True
+        problems = front_matter_problems(match.group(1))
+        if problems:
+            raise FrontMatterError(f"The generated front matter is invalid: {'; '.join(problems)}.")
+
+    def close(self, final: str = None):
+        """Close the file; with `final`, replace what was streamed with the finished document."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if final is not None:
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(final)
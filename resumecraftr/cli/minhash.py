@@ -0,0 +1,69 @@
+import re
+import random
+import hashlib
+
+# Near-duplicate detection for job descriptions. The same posting is often
+# added again with small edits (another location, a new date, an agency
+# copy); MinHash estimates the Jaccard similarity of two texts' word
+# shingles from short signatures, and LSH banding finds the candidates
+# without comparing against every stored job.
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+# BANDS * ROWS must equal NUM_PERM. With 32 bands of 4 rows, texts with a
+# Jaccard similarity of about 0.42 or more share at least one bucket half of
+# the time, far below the reporting threshold, so real matches are not missed.
+BANDS = 32
+ROWS = 4
+DEFAULT_THRESHOLD = 0.8
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 64) - 1
+_WORD = re.compile(r"\w+")
+
+_rng = random.Random(1)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+]
+
+
+def _hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Return the hashed word `size`-grams of a text, ignoring case and punctuation."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {_hash(" ".join(words))} if words else set()
+    return {_hash(" ".join(words[i : i + size])) for i in range(len(words) - size + 1)}
+
+
+def signature(text: str) -> list:
+    """
+    Compute the MinHash signature of a text.
+
+    Args:
+        text (str): The text, e.g. a job description.
+
+    Returns:
+        list: NUM_PERM integers; the share of equal positions between two
+        signatures estimates the Jaccard similarity of the texts.
+    """
+    hashes = shingles(text)
+    if not hashes:
+        return [_MAX_HASH] * NUM_PERM
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def bands(sig: list) -> list:
+    """Return the LSH bucket of each band of a signature, as (band, bucket) pairs."""
+    return [
+        (band, hashlib.blake2b(repr(sig[band * ROWS : (band + 1) * ROWS]).encode(), digest_size=8).hexdigest())
+        for band in range(BANDS)
+    ]
+
+
+def similarity(sig_a: list, sig_b: list) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / NUM_PERM
@@ -78,4 +78,7 @@ Now, using the following information, generate a properly formatted Markdown doc
 ### Tailored CV (if available):
 {tailored_cv}
 
+### Custom Instructions and Data (if available):
+{custom}
+
 Generate ONLY the Markdown content, properly formatted for the EISVOGEL template. Do not include any explanations or additional text."""
@@ -0,0 +1,18 @@
+REPAIR_PROMPT = r"""
+    The JSON below was produced for the CV section "{section}" but does not have the expected structure.
+
+    **Problems found:**
+{problems}
+
+    **Expected shape** (keys and nesting; scalar values show their type):
+    ```json
+{shape}
+    ```
+
+    **Output to repair:**
+    ```
+{output}
+    ```
+
+    Return the same content with the expected shape: rename, move, or add missing keys (use null or empty lists), and drop unexpected keys. Do not rewrite the text values. Do NOT include any extra text, explanations, or markdown formatting. Return ONLY the JSON.
+    """
@@ -33,5 +33,35 @@ RAW_PROMPTS = {
         "section_content": {{ ... }} // Rewritten but structurally identical JSON object
     }}
     ```
-    """
+    """,
+    "optimize_resume_structured": r"""
+    You will be given a specific **CV section** and a **Job Description** in JSON. Rewrite the content of the CV section so that it aligns with the Job Description. The response schema matches the structure of the section.
+
+    **Rules:**
+    1. **Keep every entry and field.** Do not add, remove, or reorder entries.
+    2. **Do not invent experience.** Rewrite using stronger language but do not add unrealistic or fake details.
+    3. **Optimize for ATS (Applicant Tracking Systems)** by incorporating relevant **keywords** from the job description.
+    4. **Enhance clarity and professionalism** while ensuring the section remains structured, concise, and impactful.
+    5. Use language {language} to write the optimized sections.
+    """,
+    "optimize_resume_patch": r"""
+    You will be given a specific **CV section** in JSON format and a **Job Description**. Decide which parts of the section should be rewritten so that it aligns with the Job Description, and return only those changes as an RFC 6902 JSON Patch against "section_content".
+
+    **Rules:**
+    1. **Only patch what you change.** Text that already fits the job stays out of the patch; an empty patch means the section needs no change.
+    2. **Do not modify the JSON structure.** Use "replace" to rewrite a string. Use "add" or "remove" only for items of lists of strings, such as skills. Do not add, remove, or reorder entries or keys.
+    3. **Do not invent experience.** Rewrite using stronger language but do not add unrealistic or fake details.
+    4. **Optimize for ATS (Applicant Tracking Systems)** by incorporating relevant **keywords** from the job description.
+    5. **Paths are JSON Pointers into "section_content"**, e.g. "/0/Responsibilities/2" for the third bullet of the first entry, or "/Summary".
+    6. Use language {language} to write the optimized sections; if the section is in another language, replace every string.
+    7. **Do not include any extra text, explanations, or formatting**—return only the JSON.
+
+    **Output Format:**
+    ```json
+    {{
+        "section_name": "string",
+        "patch": [{{"op": "replace", "path": "/0/Responsibilities/1", "value": "Rewritten bullet"}}]
+    }}
+    ```
+    """,
 }
@@ -89,3 +89,10 @@ RAW_PROMPTS = {
     Ensure all languages and proficiency levels are retained. If no languages are found, return an empty list []. Do NOT include any additional text, explanations, or markdown formatting. Return ONLY the JSON array.
     """,
 }
+
+# Used with structured outputs: the JSON schema is sent as the response format,
+# so the instructions no longer repeat the field layout.
+STRUCTURED_PROMPT = r"""
+    Extract the "{section}" section from the provided text in {language}. {description}
+    Capture every detail without summarization. Use null or empty lists for information that is not present in the text.
+    """
@@ -0,0 +1,80 @@
+import json
+from rich.console import Console
+from resumecraftr.cli.agent import execute_prompt, is_interactive
+from resumecraftr.cli.prompts.repair import REPAIR_PROMPT
+from resumecraftr.cli.tracing import span
+from resumecraftr.cli.utils.json import json_shape, shape_diff
+
+console = Console()
+DEFAULT_REPAIR_RETRIES = 2
+
+
+def repair_retries(config: dict) -> int:
+    """Repair attempts per section, from `chat_gpt.repair_retries` (default 2, 0 disables repairs)."""
+    return config.get("chat_gpt", {}).get("repair_retries", DEFAULT_REPAIR_RETRIES)
+
+
+def output_problems(parsed, expected) -> list:
+    """Return why a parsed section reply is unusable, or an empty list if it is fine."""
+    if parsed is None:
+        return ["the reply is not valid JSON for this section"]
+    if expected is None:
+        return []
+    return shape_diff(expected, json_shape(parsed))
+
+
+def parse_with_repair(
+    section_name, raw, parse, expected, retries, response_format=None, route=None
+):
+    """
+    Parse a section reply, asking the model to repair it if it is broken.
+
+    A reply is broken when `parse` rejects it or its shape differs from the
+    expected one. The repair prompt carries only the broken reply and the
+    expected shape, not the CV or the job description, so it is much smaller
+    than the original request.
+
+    Args:
+        section_name (str): The section the reply belongs to.
+        raw (str): The model reply.
+        parse (callable): Turns a reply into a value, or None if it is invalid.
+        expected: The expected shape (see `utils.json.json_shape`), or None to
+            only check that the reply parses.
+        retries (int): Maximum number of repair prompts.
+        response_format (dict, optional): Structured-output format for the repair replies.
+        route (Route, optional): Where to send the repair prompts; the section's route.
+
+    Returns:
+        dict | list | None: The parsed value, or None if it is still broken
+        after all retries.
+    """
+    with span("check_reply") as check:
+        parsed = parse(raw)
+        problems = output_problems(parsed, expected)
+        if check is not None:
+            check.attrs.update(valid_json=parsed is not None, well_formed=not problems)
+    attempt = 0
+    while problems and attempt < retries:
+        attempt += 1
+        if is_interactive():
+            console.print(
+                f"[yellow]Repairing '{section_name}' output ({attempt}/{retries}): {problems[0]}[/yellow]"
+            )
+        repair_prompt = REPAIR_PROMPT.format(
+            section=section_name,
+            problems="\n".join(f"    - {problem}" for problem in problems),
+            shape=(
+                json.dumps(expected, indent=4)
+                if expected is not None
+                else "any JSON object or array"
+            ),
+            output=raw,
+        )
+        with span("repair", attempt=attempt):
+            raw = execute_prompt(repair_prompt, response_format=response_format, route=route)
+        parsed = parse(raw)
+        problems = output_problems(parsed, expected)
+
+    if problems:
+        return None
+    return parsed
@@ -0,0 +1,124 @@
+from dataclasses import asdict, dataclass
+
+# Model routing. Every call is sent with the model, temperature and reply
+# limit chosen for its command and section, so simple sections such as
+# Contact Information can use a small fast model while Work Experience keeps
+# the flagship one. Settings are layered, later layers winning:
+#
+#   1. chat_gpt in resumecraftr.json
+#   2. chat_gpt.commands["parse-cv" | "tailor-cv" | "export-pdf"]
+#   3. the section's "chat_gpt" in sections.json
+#   4. chat_gpt.sections[<section name>] in resumecraftr.json
+#
+# Section layers apply to every command; a key named after a command inside
+# them, e.g. {"model": "gpt-4o-mini", "tailor-cv": {"model": "gpt-4o"}},
+# applies to that command only.
+#
+# The bundled sections.json sends Contact Information and Languages to
+# gpt-4o-mini. Its models are skipped when chat_gpt.base_url is set, since
+# another server need not serve OpenAI's model names.
+
+# The command each kind of call belongs to.
+COMMANDS = {
+    "extracted_section": "parse-cv",
+    "optimized_section": "tailor-cv",
+    "markdown": "export-pdf",
+}
+ROUTE_OPTIONS = ("model", "temperature", "top_p", "max_tokens")
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    Where and how one call is sent.
+
+    Attributes:
+        model (str): The model name.
+        temperature (float): Sampling temperature, or None for the assistant's.
+        top_p (float): Nucleus sampling, or None for the assistant's.
+        max_tokens (int): Most reply tokens, or None for the model's limit.
+    """
+
+    model: str = None
+    temperature: float = None
+    top_p: float = None
+    max_tokens: int = None
+
+    def run_options(self) -> dict:
+        """Return the Assistants `runs.create` arguments for this route."""
+        options = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "max_completion_tokens": self.max_tokens,
+        }
+        return {key: value for key, value in options.items() if value is not None}
+
+    def chat_options(self) -> dict:
+        """Return the chat completion body fields for this route."""
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+    def label(self) -> str:
+        """Describe the route in one line, e.g. "gpt-4o-mini (temperature 0, ≤800 tokens)"."""
+        details = []
+        if self.temperature is not None:
+            details.append(f"temperature {self.temperature:g}")
+        if self.max_tokens is not None:
+            details.append(f"≤{self.max_tokens} tokens")
+        return f"{self.model or 'default model'}" + (f" ({', '.join(details)})" if details else "")
+
+
+def default_route(config: dict) -> Route:
+    """Return the route from the plain chat_gpt settings, before any override."""
+    chat_config = config.get("chat_gpt", {})
+    return Route(**{key: chat_config[key] for key in ROUTE_OPTIONS if key in chat_config})
+
+
+def _layer(settings: dict, overrides: dict, command: str):
+    if not isinstance(overrides, dict):
+        return
+    settings.update({key: overrides[key] for key in ROUTE_OPTIONS if key in overrides})
+    scoped = overrides.get(command)
+    if isinstance(scoped, dict):
+        settings.update({key: scoped[key] for key in ROUTE_OPTIONS if key in scoped})
+
+
+def route_for(config: dict, kind: str, section: str = "") -> Route:
+    """
+    Choose the route of a call.
+
+    Args:
+        config (dict): The workspace configuration.
+        kind (str): The artifact kind, a key of COMMANDS.
+        section (str, optional): The section name; "" for whole-document calls.
+
+    Returns:
+        Route: The settings after every layer that applies.
+    """
+    chat_config = config.get("chat_gpt", {})
+    command = COMMANDS[kind]
+    settings = {key: chat_config[key] for key in ROUTE_OPTIONS if key in chat_config}
+    _layer(settings, chat_config.get("commands", {}).get(command), command)
+    if section:
+        from resumecraftr.cli.schemas import section_specs
+
+        bundled = section_specs().get(section, {}).get("chat_gpt")
+        if bundled and chat_config.get("base_url"):
+            bundled = {key: value for key, value in bundled.items() if key != "model"}
+        _layer(settings, bundled, command)
+        _layer(settings, chat_config.get("sections", {}).get(section), command)
+    return Route(**settings)
+
+
+def print_routing(console, config: dict, kind: str, sections: list = ("",)):
+    """Print the routes a command's calls take, unless they all use the plain chat_gpt settings."""
+    routes = {}
+    for section in sections:
+        routes.setdefault(route_for(config, kind, section), []).append(section)
+    if list(routes) == [default_route(config)]:
+        return
+    for route, names in routes.items():
+        names = ", ".join(name for name in names if name)
+        console.print(
+            f"[cyan]{COMMANDS[kind]} → {route.label()}{f': {names}' if names else ''}[/cyan]"
+        )
@@ -0,0 +1,178 @@
+import re
+import json
+import importlib.resources
+from functools import lru_cache
+from typing import List, Literal, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model
+
+# Field types allowed in templates/sections.json and their Python annotations.
+FIELD_TYPES = {
+    "string": str,
+    "string|null": Optional[str],
+    "string[]": List[str],
+}
+# Strict structured outputs need an object at the top level, so array sections
+# are returned wrapped in {"entries": [...]}.
+ARRAY_KEY = "entries"
+STRICT_CONFIG = ConfigDict(extra="forbid")
+
+
+@lru_cache(maxsize=None)
+def load_sections_config() -> dict:
+    """Load the sections.json bundled with the package."""
+    with importlib.resources.files("resumecraftr.templates").joinpath(
+        "sections.json"
+    ).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def section_specs() -> dict:
+    """Return the section definitions from sections.json, keyed by section name."""
+    return {spec["name"]: spec for spec in load_sections_config().get("sections", [])}
+
+
+def _model_name(section_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", section_name).strip("_")
+
+
+@lru_cache(maxsize=None)
+def _content_type(section_name: str):
+    """Return the Python type of a section's content, or None if it has no field layout."""
+    spec = section_specs().get(section_name)
+    if spec is None or not spec.get("fields"):
+        return None
+    entry = create_model(
+        _model_name(section_name),
+        __config__=STRICT_CONFIG,
+        **{field: (FIELD_TYPES[kind], ...) for field, kind in spec["fields"].items()},
+    )
+    return List[entry] if spec.get("type") == "array" else entry
+
+
+@lru_cache(maxsize=None)
+def section_model(section_name: str):
+    """
+    Build the pydantic model for an extracted section.
+
+    Args:
+        section_name (str): The section name as listed in sections.json.
+
+    Returns:
+        type[BaseModel] | None: The model, or None if the section has no field layout.
+    """
+    content_type = _content_type(section_name)
+    if content_type is None:
+        return None
+    if section_specs()[section_name].get("type") == "array":
+        return create_model(
+            f"{_model_name(section_name)}_Section",
+            __config__=STRICT_CONFIG,
+            **{ARRAY_KEY: (content_type, ...)},
+        )
+    return content_type
+
+
+@lru_cache(maxsize=None)
+def tailored_section_model(section_name: str):
+    """Build the model for a tailored section: {"section_name", "section_content"}."""
+    content_type = _content_type(section_name)
+    if content_type is None:
+        return None
+    return create_model(
+        f"{_model_name(section_name)}_Tailored",
+        __config__=STRICT_CONFIG,
+        section_name=(str, ...),
+        section_content=(content_type, ...),
+    )
+
+
+class PatchOperation(BaseModel):
+    """
+    One RFC 6902 operation of a tailoring patch, as strict structured outputs
+    allow it: every key is present, and "from" or "value" is null when the
+    operation takes none. Values are strings or lists of strings, which is
+    what section fields hold.
+    """
+
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str
+    from_: Optional[str] = Field(..., alias="from")
+    value: Union[str, List[str], None]
+
+
+@lru_cache(maxsize=None)
+def tailored_patch_model(section_name: str):
+    """Build the model for a tailoring patch: {"section_name", "patch"}."""
+    if _content_type(section_name) is None:
+        return None
+    return create_model(
+        f"{_model_name(section_name)}_Patch",
+        __config__=STRICT_CONFIG,
+        section_name=(str, ...),
+        patch=(List[PatchOperation], ...),
+    )
+
+
+def section_shape(section_name: str):
+    """
+    Return the expected shape of an extracted section, in the form used by
+    `utils.json.json_shape`, or None if the section has no field layout.
+    """
+    spec = section_specs().get(section_name)
+    if spec is None or not spec.get("fields"):
+        return None
+    entry = {
+        field: ["string"] if kind == "string[]" else kind
+        for field, kind in spec["fields"].items()
+    }
+    return [entry] if spec.get("type") == "array" else entry
+
+
+def response_format(model) -> dict:
+    """Return the strict JSON-schema response_format for a model."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "strict": True,
+            "schema": model.model_json_schema(),
+        },
+    }
+
+
+def schema_text(model) -> str:
+    """Return the model's JSON schema as canonical text, for versioning prompts."""
+    return json.dumps(model.model_json_schema(), sort_keys=True)
+
+
+def parse_section_response(section_name: str, raw: str):
+    """
+    Parse a structured reply for an extracted section.
+
+    Returns:
+        dict | list | None: The section content (array sections unwrapped), or
+        None if the reply does not match the schema.
+    """
+    model = section_model(section_name)
+    try:
+        data = model.model_validate_json(raw).model_dump()
+    except ValidationError:
+        return None
+    if section_specs()[section_name].get("type") == "array":
+        return data[ARRAY_KEY]
+    return data
+
+
+def parse_tailored_response(section_name: str, raw: str):
+    """Parse a structured reply for a tailored section, or return None if it does not match."""
+    try:
+        return tailored_section_model(section_name).model_validate_json(raw).model_dump()
+    except ValidationError:
+        return None
+
+
+def structured_outputs_enabled(config: dict) -> bool:
+    """Structured outputs are on unless `chat_gpt.structured_outputs` is false."""
+    return config.get("chat_gpt", {}).get("structured_outputs", True)
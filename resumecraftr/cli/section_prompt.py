@@ -0,0 +1,189 @@
+import json
+from dataclasses import asdict, dataclass, field, replace
+from resumecraftr.cli.agent import execute_prompt
+from resumecraftr.cli.repair import output_problems, parse_with_repair
+from resumecraftr.cli.routing import Route
+from resumecraftr.cli.schemas import (
+    parse_section_response,
+    parse_tailored_response,
+    response_format,
+    section_model,
+    tailored_patch_model,
+    tailored_section_model,
+)
+from resumecraftr.cli.tracing import span
+from resumecraftr.cli.utils.json import clean_json_response
+from resumecraftr.cli.utils.json_patch import PatchError, apply_patch
+
+# Artifact kind -> (structured model builder, structured reply parser).
+STRUCTURED_PARSERS = {
+    "extracted_section": (section_model, parse_section_response),
+    "optimized_section": (tailored_section_model, parse_tailored_response),
+}
+
+
+@dataclass
+class SectionPrompt:
+    """
+    A prompt for one CV section, with what is needed to check and store its reply.
+
+    The same object serves interactive runs (`run`) and batch runs, where the
+    prompt is sent in a batch file and the reply arrives later (`complete`).
+
+    Attributes:
+        kind (str): The artifact kind, "extracted_section" or "optimized_section".
+        section (str): The section name.
+        prompt (str): The full prompt text.
+        structured (bool): Whether the reply is a strict structured output.
+        expected: The expected reply shape (see `utils.json.json_shape`), or None.
+        inputs (dict): Everything the reply depends on; the artifact cache key.
+        route (Route): The model, temperature and reply limit to send it with.
+        patch_base: With JSON Patch tailoring, the section content the reply
+            patches; None when the reply is the whole section.
+        fallback_prompt (str): With JSON Patch tailoring, the prompt asking for
+            the whole section, sent when the patch does not apply.
+    """
+
+    kind: str
+    section: str
+    prompt: str
+    structured: bool
+    expected: object
+    inputs: dict
+    route: Route = field(default_factory=Route)
+    patch_base: object = None
+    fallback_prompt: str = None
+
+    def reply_format(self):
+        """Return the strict response_format for the reply, or None for free text."""
+        if not self.structured:
+            return None
+        if self.patch_base is not None:
+            return response_format(tailored_patch_model(self.section))
+        return response_format(STRUCTURED_PARSERS[self.kind][0](self.section))
+
+    def parse(self, raw):
+        if self.structured:
+            return STRUCTURED_PARSERS[self.kind][1](self.section, raw)
+        return clean_json_response(raw)
+
+    def apply_patch(self, raw):
+        """
+        Apply a JSON Patch reply to `patch_base`.
+
+        Returns:
+            dict | None: The reply the patch amounts to, {"section_name",
+            "section_content"}, or None if the patch is malformed, does not
+            apply, or leaves the section with another structure.
+        """
+        reply = clean_json_response(raw)
+        operations = reply.get("patch") if isinstance(reply, dict) else reply
+        if not isinstance(operations, list):
+            return None
+        for operation in operations:
+            # Paths are relative to section_content; accept them from the wrapper too.
+            for key in ("path", "from"):
+                if isinstance(operation, dict) and isinstance(operation.get(key), str):
+                    if operation[key].startswith("/section_content"):
+                        operation[key] = operation[key][len("/section_content") :]
+        try:
+            content = apply_patch(self.patch_base, operations)
+        except PatchError:
+            return None
+        parsed = self.parse(
+            json.dumps({"section_name": self.section, "section_content": content}, ensure_ascii=False)
+        )
+        return None if output_problems(parsed, self.expected) else parsed
+
+    def full_output(self):
+        """Return the prompt asking for the whole section instead of a patch."""
+        return replace(self, prompt=self.fallback_prompt, patch_base=None, fallback_prompt=None)
+
+    def complete(self, raw, retries):
+        """
+        Turn a reply into the stored section content, repairing it if needed.
+
+        A JSON Patch reply that does not apply is not repaired: the whole
+        section is asked for instead.
+
+        Returns:
+            str | None: The section content as JSON text, or None if the reply
+            is still broken after the repair attempts.
+        """
+        if self.patch_base is not None:
+            with span("check_reply", patch=True) as check:
+                parsed = self.apply_patch(raw)
+                if check is not None:
+                    check.attrs.update(valid_json=parsed is not None, well_formed=parsed is not None)
+            if parsed is not None:
+                return json.dumps(parsed, ensure_ascii=False)
+            with span("patch_fallback"):
+                return self.full_output().run(retries)
+        with span("parse_reply"):
+            parsed = parse_with_repair(
+                self.section,
+                raw,
+                self.parse,
+                self.expected,
+                retries,
+                response_format=self.reply_format(),
+                route=self.route,
+            )
+        return None if parsed is None else json.dumps(parsed, ensure_ascii=False)
+
+    def run(self, retries):
+        """Send the prompt to OpenAI and return the completed reply (see `complete`)."""
+        return self.complete(
+            execute_prompt(self.prompt, response_format=self.reply_format(), route=self.route),
+            retries,
+        )
+
+    def record(self) -> dict:
+        """Return the fields needed to complete a reply later, without the prompt text."""
+        record = asdict(self)
+        del record["prompt"]
+        return record
+
+    @classmethod
+    def from_record(cls, record: dict):
+        record = dict(record)
+        record["route"] = Route(**record.get("route", {}))
+        return cls(prompt="", **record)
+
+
+def _merge_values(values):
+    if all(isinstance(value, list) for value in values):
+        return [item for value in values for item in value]
+    if all(isinstance(value, dict) for value in values):
+        merged = {}
+        for value in values:
+            for key, item in value.items():
+                if merged.get(key) in (None, "", []):
+                    merged[key] = item
+                elif isinstance(merged[key], list) and isinstance(item, list):
+                    merged[key] = merged[key] + [x for x in item if x not in merged[key]]
+        return merged
+    return next((value for value in values if value not in (None, "", [])), values[0])
+
+
+def merge_parts(kind, contents):
+    """
+    Join the replies of a section that was sent as several prompts, in order.
+
+    Array sections are concatenated. Object sections extracted from parts of
+    the CV text keep the first non-empty value of each field and combine lists.
+
+    Returns:
+        The section content, or None if a tailored part lost its entry list.
+    """
+    if len(contents) == 1:
+        return contents[0]
+    if kind == "optimized_section":
+        entries = []
+        for content in contents:
+            part = content.get("section_content") if isinstance(content, dict) else None
+            if not isinstance(part, list):
+                return None
+            entries.extend(part)
+        return {"section_name": contents[0].get("section_name"), "section_content": entries}
+    return _merge_values(contents)
@@ -0,0 +1,473 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from resumecraftr.cli.workspace import workspace_path
+
+DB_NAME = "resumecraftr.db"
+
+# Each entry upgrades the schema by one version (tracked in PRAGMA user_version).
+MIGRATIONS = [
+    """
+    CREATE TABLE cvs (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        added_at REAL NOT NULL
+    );
+    CREATE TABLE jobs (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        added_at REAL NOT NULL
+    );
+    CREATE TABLE sections (
+        cv TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        name TEXT NOT NULL,
+        content TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (cv, kind, name)
+    );
+    CREATE TABLE artifacts (
+        id INTEGER PRIMARY KEY,
+        path TEXT NOT NULL UNIQUE,
+        kind TEXT NOT NULL,
+        cv TEXT,
+        job TEXT,
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX artifacts_cv_job ON artifacts (cv, job);
+    """,
+    """
+    CREATE TABLE cache (
+        key TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        blob TEXT NOT NULL,
+        inputs TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_used_at REAL NOT NULL
+    );
+    CREATE INDEX cache_blob ON cache (blob);
+    ALTER TABLE artifacts ADD COLUMN blob TEXT;
+    ALTER TABLE artifacts ADD COLUMN inputs TEXT;
+    CREATE INDEX artifacts_blob ON artifacts (blob);
+    """,
+    """
+    CREATE TABLE batches (
+        id TEXT PRIMARY KEY,
+        command TEXT NOT NULL,
+        status TEXT NOT NULL,
+        input_file TEXT NOT NULL,
+        targets TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        collected_at REAL
+    );
+    """,
+    """
+    ALTER TABLE jobs ADD COLUMN alias_of TEXT;
+    CREATE TABLE job_signatures (
+        job TEXT PRIMARY KEY,
+        signature TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    CREATE TABLE job_lsh (
+        band INTEGER NOT NULL,
+        bucket TEXT NOT NULL,
+        job TEXT NOT NULL,
+        PRIMARY KEY (band, bucket, job)
+    );
+    CREATE INDEX job_lsh_job ON job_lsh (job);
+    """,
+    """
+    CREATE TABLE bullet_sources (
+        source TEXT PRIMARY KEY,
+        hash TEXT NOT NULL,
+        indexed_at REAL NOT NULL
+    );
+    CREATE TABLE bullets (
+        id INTEGER PRIMARY KEY,
+        source TEXT NOT NULL,
+        role TEXT NOT NULL,
+        text TEXT NOT NULL,
+        terms TEXT NOT NULL
+    );
+    CREATE INDEX bullets_source ON bullets (source);
+    """,
+    # The section files are the only copy of parsed and tailored sections.
+    """
+    DROP TABLE sections;
+    """,
+]
+
+# Lists kept in resumecraftr.json for compatibility, and the table backing each.
+EXPORTED_LISTS = {"extracted_files": "cvs", "job_descriptions": "jobs"}
+
+
+class WorkspaceStore:
+    """
+    Transactional SQLite store for the workspace's CVs, jobs, artifacts,
+    batches, job similarity index and bullet bank.
+
+    Writes run inside `BEGIN IMMEDIATE` transactions, so concurrent commands are
+    serialized by SQLite instead of overwriting each other's changes. After each
+    write, the CV and job lists are exported to resumecraftr.json while the write
+    lock is still held, keeping that file valid for older tools and for users.
+    """
+
+    def __init__(self, db_file: str, config_file: str = None):
+        self.db_file = db_file
+        self.config_file = config_file or os.path.join(
+            os.path.dirname(db_file), "resumecraftr.json"
+        )
+        self._migrate()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    @contextmanager
+    def transaction(self, export: bool = False):
+        """
+        Open a write transaction.
+
+        Args:
+            export (bool, optional): Rewrite resumecraftr.json before committing.
+
+        Yields:
+            sqlite3.Connection: The connection inside the transaction.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                if export:
+                    self._export_json(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    @contextmanager
+    def reader(self):
+        """Open a connection for read-only queries."""
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _migrate(self):
+        os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+        with self.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= len(MIGRATIONS):
+                return
+            for script in MIGRATIONS[version:]:
+                for statement in script.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
+            if version == 0:
+                self._import_json(conn)
+
+    def _read_config(self) -> dict:
+        if not os.path.exists(self.config_file):
+            return {}
+        with open(self.config_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _import_json(self, conn):
+        """Seed a new database with the lists already present in resumecraftr.json."""
+        config = self._read_config()
+        now = time.time()
+        for key, table in EXPORTED_LISTS.items():
+            for name in config.get(key, []):
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {table} (name, added_at) VALUES (?, ?)",
+                    (name, now),
+                )
+
+    def _export_json(self, conn):
+        config = self._read_config()
+        for key, table in EXPORTED_LISTS.items():
+            config[key] = [
+                row[0] for row in conn.execute(f"SELECT name FROM {table} ORDER BY id")
+            ]
+        tmp_file = f"{self.config_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(config, f, indent=4)
+        os.replace(tmp_file, self.config_file)
+
+    def export_json(self):
+        """Rewrite the CV and job lists in resumecraftr.json from the store."""
+        with self.transaction(export=True):
+            pass
+
+    def load_config(self) -> dict:
+        """Return resumecraftr.json with the CV and job lists read from the store."""
+        config = self._read_config()
+        with self.reader() as conn:
+            for key, table in EXPORTED_LISTS.items():
+                config[key] = [
+                    row[0] for row in conn.execute(f"SELECT name FROM {table} ORDER BY id")
+                ]
+        return config
+
+    def _add(self, table: str, name: str) -> bool:
+        with self.transaction(export=True) as conn:
+            cursor = conn.execute(
+                f"INSERT OR IGNORE INTO {table} (name, added_at) VALUES (?, ?)",
+                (name, time.time()),
+            )
+            return cursor.rowcount > 0
+
+    def add_cv(self, name: str) -> bool:
+        """Register an extracted CV text file. Returns False if it was already known."""
+        return self._add("cvs", name)
+
+    def add_job(self, name: str) -> bool:
+        """Register a job description file. Returns False if it was already known."""
+        return self._add("jobs", name)
+
+    def index_job(self, name: str, signature: list, buckets: list):
+        """
+        Store a job description's MinHash signature and its LSH buckets.
+
+        Args:
+            name (str): The job description file.
+            signature (list): Its signature from `minhash.signature`.
+            buckets (list): Its (band, bucket) pairs from `minhash.bands`.
+        """
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM job_lsh WHERE job = ?", (name,))
+            conn.execute(
+                "INSERT OR REPLACE INTO job_signatures (job, signature, updated_at) VALUES (?, ?, ?)",
+                (name, json.dumps(signature), time.time()),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO job_lsh (band, bucket, job) VALUES (?, ?, ?)",
+                [(band, bucket, name) for band, bucket in buckets],
+            )
+
+    def unindexed_jobs(self) -> list:
+        """List the jobs that have no MinHash signature yet, e.g. added by an older version."""
+        with self.reader() as conn:
+            return [
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM jobs WHERE name NOT IN (SELECT job FROM job_signatures) ORDER BY id"
+                )
+            ]
+
+    def similar_jobs(self, buckets: list, exclude: str = None) -> dict:
+        """
+        Find the jobs sharing at least one LSH bucket with a signature.
+
+        Returns:
+            dict: Candidate signatures keyed by job description file.
+        """
+        with self.reader() as conn:
+            jobs = set()
+            for band, bucket in buckets:
+                jobs.update(
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT job FROM job_lsh WHERE band = ? AND bucket = ?", (band, bucket)
+                    )
+                )
+            jobs.discard(exclude)
+            return {
+                job: json.loads(sig)
+                for job, sig in conn.execute(
+                    f"SELECT job, signature FROM job_signatures WHERE job IN ({','.join('?' * len(jobs))})",
+                    sorted(jobs),
+                )
+            }
+
+    def set_job_alias(self, name: str, alias_of: str = None):
+        """Make a job reuse another job's description for tailoring; None removes the alias."""
+        with self.transaction() as conn:
+            conn.execute("UPDATE jobs SET alias_of = ? WHERE name = ?", (alias_of, name))
+
+    def job_alias(self, name: str):
+        """Return the job a job description is an alias of, or None."""
+        with self.reader() as conn:
+            row = conn.execute("SELECT alias_of FROM jobs WHERE name = ?", (name,)).fetchone()
+            return row[0] if row else None
+
+    def bullet_sources(self) -> dict:
+        """Return the content hash of each sections file in the bullet bank, keyed by file."""
+        with self.reader() as conn:
+            return dict(conn.execute("SELECT source, hash FROM bullet_sources"))
+
+    def index_bullets(self, source: str, content_hash: str, bullets: list):
+        """
+        Replace the bullets of one sections file in the bullet bank.
+
+        Args:
+            source (str): The .extracted_sections.json file.
+            content_hash (str): Its content hash, to skip it while unchanged.
+            bullets (list): (role, text, terms) tuples; terms maps each term to its count.
+        """
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM bullets WHERE source = ?", (source,))
+            conn.execute(
+                "INSERT OR REPLACE INTO bullet_sources (source, hash, indexed_at) VALUES (?, ?, ?)",
+                (source, content_hash, time.time()),
+            )
+            conn.executemany(
+                "INSERT INTO bullets (source, role, text, terms) VALUES (?, ?, ?, ?)",
+                [(source, role, text, json.dumps(terms)) for role, text, terms in bullets],
+            )
+
+    def remove_bullet_source(self, source: str):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM bullets WHERE source = ?", (source,))
+            conn.execute("DELETE FROM bullet_sources WHERE source = ?", (source,))
+
+    def load_bullets(self) -> list:
+        """Return every bullet in the bank as (role, text, terms) tuples."""
+        with self.reader() as conn:
+            return [
+                (role, text, json.loads(terms))
+                for role, text, terms in conn.execute(
+                    "SELECT role, text, terms FROM bullets ORDER BY id"
+                )
+            ]
+
+    def record_artifact(
+        self,
+        path: str,
+        kind: str,
+        cv: str = None,
+        job: str = None,
+        blob: str = None,
+        inputs: dict = None,
+    ):
+        """
+        Record a generated file together with what it was produced from.
+
+        The path is stored as an absolute path, so the record stays valid when
+        the workspace is used from another directory.
+
+        Args:
+            path (str): The generated file.
+            kind (str): The artifact type, e.g. "optimized_sections" or "pdf".
+            cv (str, optional): The CV text file it belongs to.
+            job (str, optional): The job description it was tailored to.
+            blob (str, optional): Content hash of the file in the artifact store.
+            inputs (dict, optional): Provenance: hashes and settings that produced it.
+        """
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO artifacts (path, kind, cv, job, blob, inputs, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET kind = excluded.kind, cv = excluded.cv, "
+                "job = excluded.job, blob = excluded.blob, inputs = excluded.inputs, "
+                "created_at = excluded.created_at",
+                (
+                    os.path.abspath(path),
+                    kind,
+                    cv,
+                    job,
+                    blob,
+                    json.dumps(inputs, sort_keys=True) if inputs is not None else None,
+                    time.time(),
+                ),
+            )
+
+    def list_artifacts(self, cv: str = None, job: str = None) -> list:
+        query = "SELECT path, kind, cv, job, blob, created_at FROM artifacts"
+        clauses, params = [], []
+        if cv is not None:
+            clauses.append("cv = ?")
+            params.append(cv)
+        if job is not None:
+            clauses.append("job = ?")
+            params.append(job)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self.reader() as conn:
+            return [
+                dict(zip(("path", "kind", "cv", "job", "blob", "created_at"), row))
+                for row in conn.execute(query + " ORDER BY id", params)
+            ]
+
+    def record_batch(self, batch_id: str, command: str, status: str, input_file: str, targets: list):
+        """
+        Record a submitted OpenAI batch so `collect` can merge its results later.
+
+        Args:
+            batch_id (str): The batch ID returned by OpenAI.
+            command (str): The command that submitted it, "parse-cv" or "tailor-cv".
+            status (str): The batch status at submission.
+            input_file (str): The JSONL file that was uploaded.
+            targets (list): Per output file: the CV, the job, the pending
+                section prompts by request ID and the sections already available.
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO batches (id, command, status, input_file, targets, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (batch_id, command, status, input_file, json.dumps(targets, ensure_ascii=False), now, now),
+            )
+
+    def update_batch(self, batch_id: str, status: str, collected: bool = False):
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE batches SET status = ?, updated_at = ?, "
+                "collected_at = CASE WHEN ? THEN ? ELSE collected_at END WHERE id = ?",
+                (status, now, collected, now, batch_id),
+            )
+
+    def list_batches(self, pending: bool = False) -> list:
+        """List recorded batches, oldest first; with pending=True only those not collected yet."""
+        query = "SELECT id, command, status, input_file, targets, created_at, collected_at FROM batches"
+        if pending:
+            query += " WHERE collected_at IS NULL"
+        with self.reader() as conn:
+            return [
+                {
+                    "id": row[0],
+                    "command": row[1],
+                    "status": row[2],
+                    "input_file": row[3],
+                    "targets": json.loads(row[4]),
+                    "created_at": row[5],
+                    "collected_at": row[6],
+                }
+                for row in conn.execute(query + " ORDER BY created_at")
+            ]
+
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_store(db_file: str = None) -> WorkspaceStore:
+    """
+    Get the store for a workspace database, opening it once per process.
+
+    Args:
+        db_file (str, optional): The database file. Defaults to the current workspace's.
+    """
+    db_file = db_file or workspace_path(DB_NAME)
+    key = os.path.abspath(db_file)
+    with _STORES_LOCK:
+        if key not in _STORES:
+            _STORES[key] = WorkspaceStore(db_file)
+        return _STORES[key]
+
+
+def load_config() -> dict:
+    """Load the current workspace's resumecraftr.json with its CV and job lists taken from the store."""
+    return get_store().load_config()
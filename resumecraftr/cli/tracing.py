@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# Lightweight spans for `--profile`. Spans nest through a context variable, so
+# work submitted to thread pools with `submit` is attached to the span that
+# submitted it. When profiling is off, `span` costs one context-variable lookup.
+
+_current = contextvars.ContextVar("resumecraftr_span", default=None)
+# The root span is per context too, so concurrent commands in `serve` each
+# get their own profile.
+_root = contextvars.ContextVar("resumecraftr_root_span", default=None)
+
+
+class Span:
+    """A timed phase with the spans started inside it."""
+
+    __slots__ = ("name", "attrs", "start", "end", "thread", "children", "_lock")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.end = None
+        self.thread = threading.get_ident()
+        self.children = []
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    @property
+    def label(self):
+        if not self.attrs:
+            return self.name
+        details = ", ".join(f"{key}={value}" for key, value in self.attrs.items())
+        return f"{self.name} ({details})"
+
+    def add_child(self, child):
+        with self._lock:
+            self.children.append(child)
+
+
+def enabled() -> bool:
+    return _root.get() is not None
+
+
+def start(name: str, **attrs):
+    """Turn profiling on and open the root span for this command."""
+    root = Span(name, attrs)
+    _root.set(root)
+    _current.set(root)
+    return root
+
+
+def finish():
+    """Close the root span and return it, or None if profiling is off."""
+    root = _root.get()
+    if root is not None and root.end is None:
+        root.end = time.perf_counter()
+    return root
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Time a phase as a child of the current span.
+
+    Args:
+        name (str): The phase name; spans with the same name are summed in the summary.
+        **attrs: Details shown next to the name, e.g. the section.
+
+    Yields:
+        Span | None: The span, or None when profiling is off.
+    """
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    current = Span(name, attrs)
+    parent.add_child(current)
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        current.end = time.perf_counter()
+        _current.reset(token)
+
+
+def submit(executor, fn, *args, **kwargs):
+    """`executor.submit` that keeps the current span as the parent of the task's spans."""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def critical_path(node: Span) -> list:
+    """
+    Return the chain of child spans that determined a span's duration.
+
+    Starting from the child that finished last, each step goes to the child
+    that finished last before the current one started. Parallel siblings that
+    finished earlier are off the path: the parent was not waiting for them.
+    """
+    chain = []
+    cutoff = float("inf")
+    for child in sorted(node.children, key=lambda child: child.end or child.start, reverse=True):
+        if (child.end or child.start) <= cutoff:
+            chain.append(child)
+            cutoff = child.start
+    return chain[::-1]
+
+
+def phase_totals(root: Span) -> dict:
+    """Sum time and count per span name. Parallel spans add up beyond wall time."""
+    totals = {}
+    stack = list(root.children)
+    while stack:
+        node = stack.pop()
+        total, count = totals.get(node.name, (0.0, 0))
+        totals[node.name] = (total + node.duration, count + 1)
+        stack.extend(node.children)
+    return totals
+
+
+def print_profile(root: Span, console):
+    """Print the timing tree, the critical path and per-phase totals."""
+    from rich.table import Table
+    from rich.tree import Tree
+
+    wall = root.duration or 1e-9
+
+    def describe(node):
+        return f"{node.label} [cyan]{node.duration * 1000:.1f} ms[/cyan] ({node.duration / wall:.0%})"
+
+    tree = Tree(describe(root))
+    stack = [(root, tree)]
+    while stack:
+        node, branch = stack.pop()
+        for child in sorted(node.children, key=lambda child: child.start):
+            stack.append((child, branch.add(describe(child))))
+    console.print(tree)
+
+    console.print("[bold]Critical path:[/bold]")
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        chain = critical_path(node)
+        line = f"  {'  ' * depth}{node.label}: {node.duration * 1000:.1f} ms"
+        if chain:
+            own = node.duration - sum(child.duration for child in chain)
+            line += f" (untraced {own * 1000:.1f} ms)"
+        console.print(line)
+        stack.extend((child, depth + 1) for child in reversed(chain))
+
+    table = Table(title="Time per phase")
+    table.add_column("Phase")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Mean ms", justify="right")
+    for name, (total, count) in sorted(
+        phase_totals(root).items(), key=lambda item: item[1][0], reverse=True
+    ):
+        table.add_row(name, str(count), f"{total * 1000:.1f}", f"{total / count * 1000:.1f}")
+    console.print(table)
+
+
+def write_chrome_trace(root: Span, path: str):
+    """Write the spans as Chrome trace-event JSON (chrome://tracing, Perfetto, speedscope)."""
+    events = []
+    stack = [root]
+    pid = os.getpid()
+    while stack:
+        node = stack.pop()
+        events.append(
+            {
+                "name": node.name,
+                "ph": "X",
+                "ts": (node.start - root.start) * 1e6,
+                "dur": node.duration * 1e6,
+                "pid": pid,
+                "tid": node.thread,
+                "args": {key: str(value) for key, value in node.attrs.items()},
+            }
+        )
+        stack.extend(node.children)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -42,14 +42,163 @@ def merge_json_files(target_file: str, source_file: str, output_path: str) -> No
     print(f"Merged JSON successfully saved to: {output_path}")
 
 
+_DECODER = json.JSONDecoder()
+_JSON_START = re.compile(r"[\[{]")
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_LINE_COMMENT = re.compile(r"(?m)[ \t]+//[^\n\"]*$")
+_SMART_QUOTES = str.maketrans({"\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'"})
+
+
+def _scan_json_values(text: str):
+    """
+    Decode every top-level JSON object or array embedded in text.
+
+    Tries `raw_decode` from each opening brace or bracket. After a successful
+    decode the scan resumes at the end of that value, so nested values are not
+    decoded twice.
+
+    Yields:
+        tuple: (start, end, value) for each decoded value.
+    """
+    index = 0
+    length = len(text)
+    while index < length:
+        match = _JSON_START.search(text, index)
+        if match is None:
+            return
+        start = match.start()
+        try:
+            value, end = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            index = start + 1
+            continue
+        yield start, end, value
+        index = end
+
+
+def _repair_json_text(text: str) -> str:
+    """Fix faults models commonly introduce: smart quotes, // comments and trailing commas."""
+    text = text.translate(_SMART_QUOTES)
+    text = _LINE_COMMENT.sub("", text)
+    return _TRAILING_COMMA.sub(r"\1", text)
+
+
+def extract_json(response: str):
+    """
+    Extract the largest valid JSON object or array from a model reply.
+
+    Decoding starts at each opening brace, so Markdown fences and prose around
+    or between JSON blocks are skipped. Unless the whole reply is already valid
+    JSON, it is also decoded after repairing common faults, which can turn a
+    list of fragments (e.g. the entries of an array with a trailing comma) into
+    one larger value. On equal size the unrepaired value wins.
+
+    Args:
+        response (str): The raw reply text.
+
+    Returns:
+        dict | list | None: The decoded value, or None if the reply has no JSON.
+    """
+    if not response:
+        return None
+
+    best = None
+    for start, end, value in _scan_json_values(response):
+        if best is None or end - start > best[0]:
+            best = (end - start, value)
+    if best is not None and best[0] == len(response.strip()):
+        return best[1]
+
+    for start, end, value in _scan_json_values(_repair_json_text(response)):
+        if best is None or end - start > best[0]:
+            best = (end - start, value)
+    return best[1] if best is not None else None
+
+
 def clean_json_response(response):
     """
     Extrae solo el JSON válido de la respuesta de OpenAI eliminando cualquier texto adicional.
+    Retorna None si la respuesta no contiene JSON válido.
+    """
+    return extract_json(response)
+
+
+def json_shape(value):
+    """
+    Reduce a JSON value to its structure.
+
+    Objects keep their keys, arrays are reduced to the merged shape of their
+    items, and scalars become their type name ("string", "number", "boolean"
+    or "null").
+
+    Args:
+        value: A decoded JSON value.
+
+    Returns:
+        dict | list | str: The shape, itself JSON-serializable.
+    """
+    if isinstance(value, dict):
+        return {key: json_shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        merged = None
+        for item in value:
+            merged = _merge_shapes(merged, json_shape(item))
+        return [] if merged is None else [merged]
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    return "string"
+
+
+def _merge_shapes(left, right):
+    if left is None:
+        return right
+    if isinstance(left, dict) and isinstance(right, dict):
+        merged = dict(left)
+        for key, shape in right.items():
+            merged[key] = _merge_shapes(merged.get(key), shape)
+        return merged
+    if isinstance(left, list) and isinstance(right, list):
+        if not left or not right:
+            return left or right
+        return [_merge_shapes(left[0], right[0])]
+    return left
+
+
+def shape_diff(expected, actual, path="$"):
+    """
+    Compare a value's shape against the expected one.
+
+    Scalars are interchangeable (a null may stand in for a string); only
+    objects, arrays and object keys must match. An empty expected array
+    accepts any array.
+
+    Args:
+        expected: The expected shape, as returned by json_shape.
+        actual: The shape to check.
+        path (str, optional): Location used in the messages.
+
+    Returns:
+        list: One message per difference; empty when the shapes match.
     """
-    try:
-        match = re.search(r"(\{.*\}|\[.*\])", response, re.DOTALL)
-        if match:
-            return json.loads(match.group(0))  # Convierte el JSON a objeto Python
-        return None  # Retorna None si no encuentra JSON válido
-    except json.JSONDecodeError:
-        return None  # Retorna None si la conversión a JSON falla
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict):
+            return [f"{path} must be an object"]
+        problems = [f"{path} is missing key '{key}'" for key in expected if key not in actual]
+        problems += [f"{path} has unexpected key '{key}'" for key in actual if key not in expected]
+        for key in expected:
+            if key in actual:
+                problems += shape_diff(expected[key], actual[key], f"{path}.{key}")
+        return problems
+    if isinstance(expected, list):
+        if not isinstance(actual, list):
+            return [f"{path} must be an array"]
+        if not expected or not actual:
+            return []
+        return shape_diff(expected[0], actual[0], f"{path}[]")
+    if isinstance(actual, (dict, list)):
+        return [f"{path} must be a {expected}"]
+    return []
@@ -0,0 +1,130 @@
+import copy
+
+
+class PatchError(ValueError):
+    """A JSON Patch operation that cannot be applied to the document."""
+
+
+def _tokens(pointer) -> list:
+    """Split an RFC 6901 JSON Pointer into its unescaped reference tokens."""
+    if not isinstance(pointer, str):
+        raise PatchError(f"path must be a string, not {pointer!r}")
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise PatchError(f"path '{pointer}' does not start with '/'")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(container: list, token: str, pointer: str, insert: bool = False) -> int:
+    if insert and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchError(f"'{token}' in '{pointer}' is not an array index")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not insert):
+        raise PatchError(f"index {index} in '{pointer}' is out of range")
+    return index
+
+
+def _resolve(document, tokens: list, pointer: str):
+    """Return the value a list of reference tokens points to."""
+    value = document
+    for token in tokens:
+        if isinstance(value, dict):
+            if token not in value:
+                raise PatchError(f"'{pointer}' does not exist")
+            value = value[token]
+        elif isinstance(value, list):
+            value = value[_index(value, token, pointer)]
+        else:
+            raise PatchError(f"'{pointer}' does not exist")
+    return value
+
+
+def _add(document, pointer, value):
+    tokens = _tokens(pointer)
+    if not tokens:
+        return value
+    parent, last = _resolve(document, tokens[:-1], pointer), tokens[-1]
+    if isinstance(parent, dict):
+        parent[last] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, last, pointer, insert=True), value)
+    else:
+        raise PatchError(f"the parent of '{pointer}' is not an object or array")
+    return document
+
+
+def _remove(document, pointer):
+    tokens = _tokens(pointer)
+    if not tokens:
+        raise PatchError("the whole document cannot be removed")
+    parent, last = _resolve(document, tokens[:-1], pointer), tokens[-1]
+    if isinstance(parent, dict):
+        if last not in parent:
+            raise PatchError(f"'{pointer}' does not exist")
+        return parent.pop(last)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, last, pointer))
+    raise PatchError(f"'{pointer}' does not exist")
+
+
+def apply_patch(document, operations: list):
+    """
+    Apply an RFC 6902 JSON Patch to a copy of a document.
+
+    Supports every operation: add, remove, replace, move, copy and test. The
+    operations are applied in order and the patch fails as a whole.
+
+    Args:
+        document: A decoded JSON value.
+        operations (list): The patch, a list of operation objects.
+
+    Returns:
+        The patched copy; the document itself is left untouched.
+
+    Raises:
+        PatchError: If the patch is malformed or an operation does not apply.
+    """
+    if not isinstance(operations, list):
+        raise PatchError("a JSON Patch must be an array of operations")
+    document = copy.deepcopy(document)
+    for operation in operations:
+        if not isinstance(operation, dict) or "path" not in operation:
+            raise PatchError(f"malformed operation {operation!r}")
+        op, path = operation.get("op"), operation["path"]
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise PatchError(f"'{op}' at '{path}' has no value")
+        if op in ("move", "copy") and "from" not in operation:
+            raise PatchError(f"'{op}' at '{path}' has no from")
+
+        if op == "add":
+            document = _add(document, path, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            _remove(document, path)
+        elif op == "replace":
+            tokens = _tokens(path)
+            _resolve(document, tokens, path)
+            if not tokens:
+                document = copy.deepcopy(operation["value"])
+            else:
+                _remove(document, path)
+                document = _add(document, path, copy.deepcopy(operation["value"]))
+        elif op == "move":
+            source = operation["from"]
+            if path != source and path.startswith(source + "/"):
+                raise PatchError(f"cannot move '{source}' into its own child '{path}'")
+            value = _resolve(document, _tokens(source), source)
+            _remove(document, source)
+            document = _add(document, path, value)
+        elif op == "copy":
+            source = operation["from"]
+            value = _resolve(document, _tokens(source), source)
+            document = _add(document, path, copy.deepcopy(value))
+        elif op == "test":
+            if _resolve(document, _tokens(path), path) != operation["value"]:
+                raise PatchError(f"test of '{path}' failed")
+        else:
+            raise PatchError(f"unknown operation {op!r}")
+    return document
@@ -0,0 +1,196 @@
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+
+
+def _ignored(name: str, ignore) -> bool:
+    """Return True if a file or directory name matches one of the `ignore` patterns."""
+    return any(fnmatch.fnmatch(name, pattern) for pattern in ignore)
+
+
+def _walk(top: str, ignore):
+    """os.walk that skips ignored directories and leaves ignored files out."""
+    for dirpath, dirnames, filenames in os.walk(top):
+        dirnames[:] = [name for name in dirnames if not _ignored(name, ignore)]
+        yield dirpath, [name for name in filenames if not _ignored(name, ignore)]
+
+
+class PollingWatcher:
+    """
+    Detects file changes under a directory by comparing modification times.
+    Used wherever inotify is not available.
+    """
+
+    def __init__(self, root: str, interval: float = 1.0, ignore=()):
+        self.root = root
+        self.interval = interval
+        self.ignore = tuple(ignore)
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict:
+        snapshot = {}
+        for dirpath, filenames in _walk(self.root, self.ignore):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: float = None) -> set:
+        """
+        Block until at least one file changes or the timeout expires.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait. Waits forever if None.
+
+        Returns:
+            set: Paths that were created, modified or deleted.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {
+                path
+                for path in set(current) | set(self._snapshot)
+                if current.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(
+                self.interval
+                if deadline is None
+                else max(0.0, min(self.interval, deadline - time.monotonic()))
+            )
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher over a directory tree, using libc through ctypes."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    EVENT_MASK = (
+        IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    )
+    _HEADER = struct.Struct("iIII")
+
+    def __init__(self, root: str, ignore=()):
+        self.root = root
+        self.ignore = tuple(ignore)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}
+        for dirpath, _ in _walk(root, self.ignore):
+            self._add_watch(dirpath)
+
+    def _add_watch(self, path: str):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.EVENT_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self._dirs[wd] = path
+
+    def _watch_tree(self, top: str) -> set:
+        """Watch `top` and every directory under it; return the files found there."""
+        files = set()
+        for dirpath, filenames in _walk(top, self.ignore):
+            try:
+                self._add_watch(dirpath)
+            except OSError:
+                # Removed again before it could be watched.
+                continue
+            files.update(os.path.join(dirpath, filename) for filename in filenames)
+        return files
+
+    def wait(self, timeout: float = None) -> set:
+        """
+        Block until at least one file changes or the timeout expires.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait. Waits forever if None.
+
+        Returns:
+            set: Paths that were created, modified or deleted.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_len = self._HEADER.unpack_from(data, offset)
+            offset += self._HEADER.size
+            name = data[offset:offset + name_len].rstrip(b"\0").decode(errors="replace")
+            offset += name_len
+
+            if mask & self.IN_Q_OVERFLOW:
+                # The kernel dropped events: rescan and report every file.
+                changed |= self._watch_tree(self.root)
+                continue
+            if mask & self.IN_IGNORED:
+                # The directory was removed and its watch with it.
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name or _ignored(name, self.ignore):
+                continue
+            path = os.path.join(directory, name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    # Files may have been written before the watch was in place.
+                    changed |= self._watch_tree(path)
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+def create_watcher(root: str, interval: float = 1.0, polling: bool = False, ignore=()):
+    """
+    Create the best available watcher for a directory tree.
+
+    Args:
+        root (str): The directory to watch recursively.
+        interval (float, optional): Polling interval in seconds, if polling is used.
+        polling (bool, optional): Force the polling watcher even when inotify works.
+        ignore (iterable, optional): Glob patterns of file and directory names
+            to leave out; nothing inside an ignored directory is reported.
+
+    Returns:
+        InotifyWatcher | PollingWatcher: The watcher instance.
+    """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, ignore)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, interval, ignore)
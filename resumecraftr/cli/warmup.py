@@ -0,0 +1,58 @@
+import threading
+import contextvars
+import concurrent.futures
+from resumecraftr.cli.agent import create_or_get_agent, get_openai_client, non_interactive
+from resumecraftr.cli.tracing import span
+
+# Background warm-up for commands that ask the user to pick a file before they
+# talk to OpenAI. Importing the SDK, checking the client and looking up the
+# assistant take a second or more; started when the command starts, they run
+# while the user is still reading the prompt.
+#
+# A warm-up never reports anything itself. It runs non-interactively, so it
+# neither prints nor asks for an API key, and its errors are kept in the
+# returned future. The command still makes its usual call (for example
+# `create_or_get_agent()`) where it needs the result: that call waits for the
+# warm-up to finish and reuses what it resolved, or, if the warm-up failed,
+# does the work again in the foreground and reports the error as before.
+
+
+def in_background(name: str, fn, *args) -> concurrent.futures.Future:
+    """
+    Start `fn(*args)` in a daemon thread.
+
+    The thread sees the caller's workspace, deadlines and trace (its span is
+    a child of the current one), and does not keep the process alive if the
+    user quits at a prompt.
+
+    Args:
+        name (str): What is being warmed up, for the trace.
+        fn (callable): The work to do.
+
+    Returns:
+        concurrent.futures.Future: The result of `fn`, or the exception it raised.
+    """
+    future = concurrent.futures.Future()
+
+    def run():
+        try:
+            with non_interactive(), span("warm_up", task=name):
+                result = fn(*args)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(run,), name=f"warm-up {name}", daemon=True).start()
+    return future
+
+
+def warm_up_openai(assistant: bool = True) -> concurrent.futures.Future:
+    """
+    Create the OpenAI client and, unless `assistant` is False, look up or create
+    the assistant and its vector store, in the background.
+    """
+    if assistant:
+        return in_background("assistant", create_or_get_agent)
+    return in_background("openai.client", get_openai_client)
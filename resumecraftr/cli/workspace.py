@@ -0,0 +1,54 @@
+import os
+import contextvars
+from contextlib import contextmanager
+
+# Every path ResumeCraftr reads or writes lives under the workspace root. The
+# root is chosen per context rather than per process, so one process (the
+# `serve` daemon, or a service using resumecraftr.api) can work on many
+# workspaces at the same time; threads started with `tracing.submit` inherit
+# it. The OpenAI client, the request limiter in agent.py and the in-memory
+# result cache in artifacts.py stay shared by all of them.
+
+DEFAULT_WORKSPACE = "cv-workspace"
+WORKSPACE_ENV = "RESUMECRAFTR_WORKSPACE"
+
+_root = contextvars.ContextVar("resumecraftr_workspace", default=None)
+
+
+def workspace_root() -> str:
+    """
+    Return the current workspace directory.
+
+    Resolved from `use_workspace`, then the RESUMECRAFTR_WORKSPACE environment
+    variable, then "cv-workspace" in the current directory.
+    """
+    return _root.get() or os.environ.get(WORKSPACE_ENV) or DEFAULT_WORKSPACE
+
+
+def workspace_path(*parts) -> str:
+    """Join path parts onto the current workspace directory."""
+    return os.path.join(workspace_root(), *parts)
+
+
+def config_file() -> str:
+    """Return the path of the current workspace's resumecraftr.json."""
+    return workspace_path("resumecraftr.json")
+
+
+@contextmanager
+def use_workspace(root):
+    """Make `root` the workspace for the current context; None keeps the current one."""
+    if root is None:
+        yield workspace_root()
+        return
+    token = _root.set(root)
+    try:
+        yield root
+    finally:
+        _root.reset(token)
+
+
+def set_workspace(root):
+    """Make `root` the workspace for the rest of the current context."""
+    if root is not None:
+        _root.set(root)
@@ -0,0 +1,51 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer
+import pytest
+from click.testing import CliRunner
+from resumecraftr.cli.main import cli
+from resumecraftr.cli.workspace import use_workspace
+from tests import fake_openai_server
+
+
+@pytest.fixture(scope="session")
+def fake_openai():
+    """Serve tests/fake_openai_server.py on a free port for the whole session; yields its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), fake_openai_server.Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def workspace(tmp_path, fake_openai, monkeypatch):
+    """A workspace whose resumecraftr.json points at the fake OpenAI server."""
+    monkeypatch.setenv("RESUMECRAFTR_NO_DAEMON", "1")
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+    root = tmp_path / "cv-workspace"
+    root.mkdir()
+    config = {
+        "primary_language": "EN",
+        "chat_gpt": {
+            "model": "gpt-4o",
+            "temperature": 0.7,
+            "top_p": 1.0,
+            "structured_outputs": True,
+            "repair_retries": 2,
+            "base_url": fake_openai,
+        },
+    }
+    (root / "resumecraftr.json").write_text(json.dumps(config, indent=4), encoding="utf-8")
+    with use_workspace(str(root)):
+        yield root
+
+
+def run_cli(workspace, *args, input=None):
+    """Run a resumecraftr command in `workspace` and return its click Result."""
+    result = CliRunner().invoke(
+        cli, ["--workspace", str(workspace), *args], input=input, catch_exceptions=False
+    )
+    assert result.exit_code == 0, result.output
+    return result
@@ -0,0 +1,575 @@
+"""
+Local stand-in for the parts of the OpenAI API used by ResumeCraftr.
+
+Serves /v1/models, /v1/files, /v1/batches, /v1/chat/completions,
+/v1/completions (one prompt or a list of them) and the
+Assistants API (assistants, vector stores, threads, messages and runs) from
+memory. Replies are made without a model: tailoring prompts get their input
+section back unchanged (as a patch rewriting one string with itself when a
+JSON Patch is asked for), structured-output prompts get the smallest value
+that matches the JSON schema and Markdown prompts a short fixed document.
+Runs and chat completions created with "stream": true are answered as
+server-sent events, a few characters per delta. Batches finish after --delay
+seconds and runs after --run-delay seconds; batch requests for a section given
+with --fail-section end up in the batch's error file instead.
+
+Usage:
+    python tests/fake_openai_server.py [--port 8765] [--delay 0] [--run-delay 0] [--fail-section NAME]
+
+Then point the workspace at it, with any API key:
+    "chat_gpt": {"base_url": "http://127.0.0.1:8765/v1", ...}
+or set OPENAI_BASE_URL=http://127.0.0.1:8765/v1 for one command.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from urllib.parse import parse_qs, urlsplit
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from resumecraftr.cli.utils.json import extract_json  # noqa: E402
+
+_lock = threading.Lock()
+FILES = {}
+BATCHES = {}
+THREADS = {}
+RUNS = {}
+VECTOR_STORES = {}
+# The assistant the CLI looks up by name exists from the start, so commands
+# never need to create it.
+ASSISTANTS = {
+    "asst-fake": {
+        "id": "asst-fake",
+        "object": "assistant",
+        "created_at": 0,
+        "name": "ResumeCraftr Agent",
+        "model": "fake",
+        "instructions": "",
+        "tools": [],
+        "metadata": {},
+    }
+}
+
+
+def new_id(prefix):
+    return f"{prefix}-{uuid.uuid4().hex[:16]}"
+
+
+def sample_value(schema, defs):
+    """Return the smallest value that matches a JSON schema."""
+    if "$ref" in schema:
+        return sample_value(defs[schema["$ref"].split("/")[-1]], defs)
+    if "anyOf" in schema:
+        return sample_value(schema["anyOf"][0], defs)
+    kind = schema.get("type")
+    if kind == "object":
+        return {
+            name: sample_value(prop, defs)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return []
+    if kind == "null":
+        return None
+    if kind in ("integer", "number"):
+        return 0
+    if kind == "boolean":
+        return False
+    return ""
+
+
+def first_string(value, path=""):
+    """Return the JSON Pointer of the first string in a value, or None."""
+    if isinstance(value, str):
+        return path
+    items = value.items() if isinstance(value, dict) else enumerate(value) if isinstance(value, list) else ()
+    for key, item in items:
+        found = first_string(item, f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}")
+        if found is not None:
+            return found
+    return None
+
+
+MARKDOWN_REPLY = """---
+title: Jane Doe
+author: Jane Doe
+date: \\today
+lang: en
+---
+
+# Experience
+
+## Engineer at Example Corp
+
+- Kept the lights on.
+
+# Education
+
+- BSc, Example University
+"""
+
+
+def pieces(content, size=8):
+    """Split a reply into the chunks a streamed answer is sent in."""
+    return [content[i : i + size] for i in range(0, len(content), size)] or [""]
+
+
+def fake_reply(body):
+    """Answer a chat completion request without a model."""
+    prompt = body["messages"][-1]["content"]
+    data = extract_json(prompt)
+    if isinstance(data, dict) and "section_content" in data and "JSON Patch" in prompt:
+        # Rewrite the first string of the section with itself.
+        path = first_string(data["section_content"])
+        patch = []
+        if path is not None:
+            value = data["section_content"]
+            for token in path.split("/")[1:]:
+                token = token.replace("~1", "/").replace("~0", "~")
+                value = value[int(token)] if isinstance(value, list) else value[token]
+            patch.append({"op": "replace", "path": path, "from": None, "value": value})
+        return json.dumps({"section_name": data["section_name"], "patch": patch}, ensure_ascii=False)
+    if isinstance(data, dict) and "section_name" in data and "section_content" in data:
+        return json.dumps(
+            {"section_name": data["section_name"], "section_content": data["section_content"]},
+            ensure_ascii=False,
+        )
+    schema = (body.get("response_format") or {}).get("json_schema", {}).get("schema")
+    if schema:
+        return json.dumps(sample_value(schema, schema.get("$defs", {})))
+    if "EISVOGEL" in prompt:
+        return MARKDOWN_REPLY
+    return "{}"
+
+
+def usage(prompt, content):
+    prompt_tokens = len(prompt) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": len(content) // 4,
+        "total_tokens": prompt_tokens + len(content) // 4,
+    }
+
+
+def chat_completion(body):
+    content = fake_reply(body)
+    return {
+        "id": new_id("chatcmpl"),
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model") or "fake",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": usage("".join(m["content"] for m in body["messages"]), content),
+    }
+
+
+def chat_chunks(body):
+    """The chunks of a streamed chat completion, ending with the usage chunk."""
+    content = fake_reply(body)
+    base = {
+        "id": new_id("chatcmpl"),
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model") or "fake",
+    }
+    chunks = [
+        {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+        for piece in pieces(content)
+    ]
+    chunks.append({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+    if (body.get("stream_options") or {}).get("include_usage"):
+        prompt = "".join(m["content"] for m in body["messages"])
+        chunks.append({**base, "choices": [], "usage": usage(prompt, content)})
+    return chunks
+
+
+def completion(body):
+    prompts = body["prompt"] if isinstance(body["prompt"], list) else [body["prompt"]]
+    replies = [
+        fake_reply({"messages": [{"content": prompt}], "response_format": body.get("response_format")})
+        for prompt in prompts
+    ]
+    return {
+        "id": new_id("cmpl"),
+        "object": "text_completion",
+        "created": int(time.time()),
+        "model": body.get("model") or "fake",
+        "choices": [
+            {"index": index, "text": reply, "finish_reason": "stop", "logprobs": None}
+            for index, reply in enumerate(replies)
+        ],
+        "usage": usage("".join(prompts), "".join(replies)),
+    }
+
+
+def new_message(thread_id, role, content, run_id=None, assistant_id=None):
+    message = {
+        "id": new_id("msg"),
+        "object": "thread.message",
+        "created_at": int(time.time()),
+        "thread_id": thread_id,
+        "role": role,
+        "content": [{"type": "text", "text": {"value": content, "annotations": []}}],
+        "run_id": run_id,
+        "assistant_id": assistant_id,
+        "attachments": [],
+        "metadata": {},
+    }
+    THREADS[thread_id]["messages"].append(message)
+    return message
+
+
+def new_run(thread_id, request):
+    assistant = ASSISTANTS.get(request["assistant_id"], {})
+    run = {
+        "id": new_id("run"),
+        "object": "thread.run",
+        "created_at": int(time.time()),
+        "thread_id": thread_id,
+        "assistant_id": request["assistant_id"],
+        "status": "queued",
+        "model": request.get("model") or assistant.get("model", "fake"),
+        "instructions": assistant.get("instructions", ""),
+        "tools": request.get("tools", assistant.get("tools", [])),
+        "response_format": request.get("response_format"),
+        "temperature": request.get("temperature"),
+        "top_p": request.get("top_p"),
+        "max_completion_tokens": request.get("max_completion_tokens"),
+        "last_error": None,
+        "usage": None,
+        "metadata": {},
+    }
+    RUNS[run["id"]] = {"run": run, "started": time.monotonic()}
+    return run
+
+
+def advance_run(entry, delay):
+    """Complete a run once it has taken `delay` seconds, posting the reply to its thread."""
+    run = entry["run"]
+    if run["status"] not in ("queued", "in_progress"):
+        return run
+    if time.monotonic() - entry["started"] < delay:
+        run["status"] = "in_progress"
+        return run
+    messages = THREADS[run["thread_id"]]["messages"]
+    prompt = next(m for m in reversed(messages) if m["role"] == "user")["content"][0]["text"]["value"]
+    content = fake_reply(
+        {"messages": [{"role": "user", "content": prompt}], "response_format": run["response_format"]}
+    )
+    new_message(run["thread_id"], "assistant", content, run_id=run["id"], assistant_id=run["assistant_id"])
+    run.update(status="completed", completed_at=int(time.time()), usage=usage(prompt, content))
+    return run
+
+
+def run_events(entry, delay):
+    """The server-sent events of a streamed run: its reply in pieces, then completion."""
+    run = entry["run"]
+    run["status"] = "in_progress"
+    yield "thread.run.created", dict(run)
+    time.sleep(delay)
+    advance_run(entry, delay)
+    message = THREADS[run["thread_id"]]["messages"][-1]
+    for piece in pieces(message["content"][0]["text"]["value"]):
+        yield "thread.message.delta", {
+            "id": message["id"],
+            "object": "thread.message.delta",
+            "delta": {"content": [{"index": 0, "type": "text", "text": {"value": piece}}]},
+        }
+    yield "thread.message.completed", message
+    yield "thread.run.completed", run
+
+
+def store_file(content, filename, purpose):
+    file_id = new_id("file")
+    FILES[file_id] = {
+        "content": content,
+        "object": {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed",
+        },
+    }
+    return FILES[file_id]["object"]
+
+
+def batch_section(request):
+    """Return the section a batch request extracts or tailors, or None."""
+    prompt = request["body"]["messages"][-1]["content"]
+    match = re.search(r'Extract the "([^"]+)" section', prompt)
+    if match:
+        return match.group(1)
+    data = extract_json(prompt)
+    return data.get("section_name") if isinstance(data, dict) else None
+
+
+def run_batch(batch, fail_sections=()):
+    """Answer every request of a batch and attach the output and error files."""
+    lines = FILES[batch["input_file_id"]]["content"].decode("utf-8").splitlines()
+    output, errors = [], []
+    for line in lines:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        if batch_section(request) in fail_sections:
+            errors.append(
+                {
+                    "id": new_id("batch_req"),
+                    "custom_id": request["custom_id"],
+                    "response": None,
+                    "error": {"code": "server_error", "message": "The fake server failed this request."},
+                }
+            )
+            continue
+        output.append(
+            {
+                "id": new_id("batch_req"),
+                "custom_id": request["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "request_id": new_id("req"),
+                    "body": chat_completion(request["body"]),
+                },
+                "error": None,
+            }
+        )
+    files = {}
+    for key, items, suffix in (("output_file_id", output, "output"), ("error_file_id", errors, "error")):
+        if items:
+            content = "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items)
+            files[key] = store_file(content.encode("utf-8"), f"{batch['id']}_{suffix}.jsonl", "batch_output")["id"]
+    batch.update(
+        status="completed",
+        completed_at=int(time.time()),
+        request_counts={"total": len(output) + len(errors), "completed": len(output), "failed": len(errors)},
+        **files,
+    )
+
+
+class Handler(BaseHTTPRequestHandler):
+    delay = 0.0
+    run_delay = 0.0
+    fail_sections = ()
+
+    def _send(self, status, payload, raw=None):
+        data = raw if raw is not None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json" if raw is None else "application/octet-stream")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, events):
+        """Send (event, data) pairs as server-sent events, then [DONE]."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for event, data in events:
+            head = f"event: {event}\n" if event else ""
+            self.wfile.write(f"{head}data: {json.dumps(data)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(0.005)
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _not_found(self):
+        self._send(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        with _lock:
+            if url.path == "/v1/assistants":
+                return self._send(200, {"object": "list", "data": list(ASSISTANTS.values()), "has_more": False})
+            match = re.fullmatch(r"/v1/threads/([^/]+)/runs/([^/]+)", url.path)
+            if match and match.group(2) in RUNS:
+                return self._send(200, advance_run(RUNS[match.group(2)], self.run_delay))
+            match = re.fullmatch(r"/v1/threads/([^/]+)/messages", url.path)
+            if match and match.group(1) in THREADS:
+                messages = THREADS[match.group(1)]["messages"]
+                if "run_id" in query:
+                    messages = [m for m in messages if m["run_id"] == query["run_id"][0]]
+                if query.get("order", ["desc"])[0] == "desc":
+                    messages = messages[::-1]
+                return self._send(200, {"object": "list", "data": messages, "has_more": False})
+            match = re.fullmatch(r"/v1/vector_stores/([^/]+)/file_batches/([^/]+)", url.path)
+            if match and match.group(1) in VECTOR_STORES:
+                return self._send(200, VECTOR_STORES[match.group(1)]["batches"][match.group(2)])
+            if self.path == "/v1/models":
+                return self._send(
+                    200,
+                    {"object": "list", "data": [{"id": "fake", "object": "model", "created": 0, "owned_by": "local"}]},
+                )
+            match = re.fullmatch(r"/v1/files/([^/]+)/content", self.path)
+            if match and match.group(1) in FILES:
+                return self._send(200, None, raw=FILES[match.group(1)]["content"])
+            match = re.fullmatch(r"/v1/batches/([^/?]+)", self.path)
+            if match and match.group(1) in BATCHES:
+                batch = BATCHES[match.group(1)]
+                if batch["status"] != "completed" and time.time() - batch["created_at"] >= self.delay:
+                    run_batch(batch, self.fail_sections)
+                elif batch["status"] == "validating":
+                    batch["status"] = "in_progress"
+                return self._send(200, batch)
+        self._not_found()
+
+    def do_POST(self):
+        body = self._body()
+        with _lock:
+            if self.path == "/v1/files":
+                message = BytesParser(policy=HTTP).parsebytes(
+                    b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + body
+                )
+                fields, content, filename = {}, b"", "upload.jsonl"
+                for part in message.iter_parts():
+                    name = part.get_param("name", header="content-disposition")
+                    if name == "file":
+                        content = part.get_payload(decode=True)
+                        filename = part.get_filename() or filename
+                    else:
+                        fields[name] = part.get_content().strip()
+                return self._send(200, store_file(content, filename, fields.get("purpose", "batch")))
+            if self.path == "/v1/batches":
+                request = json.loads(body)
+                batch_id = new_id("batch")
+                BATCHES[batch_id] = {
+                    "id": batch_id,
+                    "object": "batch",
+                    "endpoint": request["endpoint"],
+                    "errors": None,
+                    "input_file_id": request["input_file_id"],
+                    "completion_window": request["completion_window"],
+                    "status": "validating",
+                    "output_file_id": None,
+                    "error_file_id": None,
+                    "created_at": int(time.time()),
+                    "request_counts": {"total": 0, "completed": 0, "failed": 0},
+                    "metadata": request.get("metadata"),
+                }
+                return self._send(200, BATCHES[batch_id])
+            if self.path == "/v1/chat/completions":
+                request = json.loads(body)
+                if request.get("stream"):
+                    return self._stream((None, chunk) for chunk in chat_chunks(request))
+                return self._send(200, chat_completion(request))
+            if self.path == "/v1/completions":
+                return self._send(200, completion(json.loads(body)))
+            request = json.loads(body) if body else {}
+            if self.path == "/v1/assistants":
+                assistant = {
+                    "id": new_id("asst"),
+                    "object": "assistant",
+                    "created_at": int(time.time()),
+                    "metadata": {},
+                    **request,
+                }
+                ASSISTANTS[assistant["id"]] = assistant
+                return self._send(200, assistant)
+            match = re.fullmatch(r"/v1/assistants/([^/]+)", self.path)
+            if match and match.group(1) in ASSISTANTS:
+                ASSISTANTS[match.group(1)].update(request)
+                return self._send(200, ASSISTANTS[match.group(1)])
+            if self.path == "/v1/vector_stores":
+                store_id = new_id("vs")
+                VECTOR_STORES[store_id] = {
+                    "object": {
+                        "id": store_id,
+                        "object": "vector_store",
+                        "created_at": int(time.time()),
+                        "name": request.get("name"),
+                        "status": "completed",
+                        "file_counts": {"in_progress": 0, "completed": 0, "failed": 0, "cancelled": 0, "total": 0},
+                    },
+                    "batches": {},
+                }
+                return self._send(200, VECTOR_STORES[store_id]["object"])
+            match = re.fullmatch(r"/v1/vector_stores/([^/]+)/file_batches", self.path)
+            if match and match.group(1) in VECTOR_STORES:
+                count = len(request.get("file_ids", []))
+                batch = {
+                    "id": new_id("vsfb"),
+                    "object": "vector_store.file_batch",
+                    "created_at": int(time.time()),
+                    "vector_store_id": match.group(1),
+                    "status": "completed",
+                    "file_counts": {"in_progress": 0, "completed": count, "failed": 0, "cancelled": 0, "total": count},
+                }
+                VECTOR_STORES[match.group(1)]["batches"][batch["id"]] = batch
+                return self._send(200, batch)
+            if self.path == "/v1/threads":
+                thread_id = new_id("thread")
+                THREADS[thread_id] = {"messages": []}
+                return self._send(
+                    200,
+                    {"id": thread_id, "object": "thread", "created_at": int(time.time()), "metadata": {}},
+                )
+            match = re.fullmatch(r"/v1/threads/([^/]+)/messages", self.path)
+            if match and match.group(1) in THREADS:
+                content = request["content"]
+                if not isinstance(content, str):
+                    content = "".join(part.get("text", "") for part in content)
+                return self._send(200, new_message(match.group(1), request.get("role", "user"), content))
+            match = re.fullmatch(r"/v1/threads/([^/]+)/runs", self.path)
+            if match and match.group(1) in THREADS:
+                run = new_run(match.group(1), request)
+                if request.get("stream"):
+                    return self._stream(run_events(RUNS[run["id"]], self.run_delay))
+                return self._send(200, run)
+            match = re.fullmatch(r"/v1/threads/([^/]+)/runs/([^/]+)/cancel", self.path)
+            if match and match.group(2) in RUNS:
+                run = RUNS[match.group(2)]["run"]
+                if run["status"] in ("queued", "in_progress"):
+                    run["status"] = "cancelled"
+                return self._send(200, run)
+        self._not_found()
+
+    def log_message(self, format, *args):
+        sys.stderr.write("fake-openai: " + format % args + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds before a batch completes.")
+    parser.add_argument("--run-delay", type=float, default=0.0, help="Seconds before an assistant run completes.")
+    parser.add_argument(
+        "--fail-section",
+        action="append",
+        default=[],
+        help="Fail the batch requests for this section; repeat for several.",
+    )
+    options = parser.parse_args()
+    Handler.delay = options.delay
+    Handler.run_delay = options.run_delay
+    Handler.fail_sections = tuple(options.fail_section)
+    server = ThreadingHTTPServer(("127.0.0.1", options.port), Handler)
+    print(f"Fake OpenAI API listening on http://127.0.0.1:{options.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
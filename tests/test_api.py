@@ -0,0 +1,63 @@
+import os
+import json
+import pytest
+from resumecraftr import api
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "corpus", "eval")
+
+
+def golden_sections():
+    with open(os.path.join(CORPUS, "golden", "jane_doe.extracted_sections.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_failed_merge_keeps_untrimmed_section(workspace, monkeypatch):
+    sections = golden_sections()
+    config = {**json.loads((workspace / "resumecraftr.json").read_text()), "top_bullets": 1, "min_entry_tokens": 0}
+
+    sent_bullets = []
+
+    def answer(config, section_prompt):
+        content = json.loads(section_prompt.prompt[section_prompt.prompt.index("{") :])["section_content"]
+        if section_prompt.section == "Work Experience":
+            sent_bullets.extend(len(entry["Responsibilities"]) for entry in content)
+        if section_prompt.section == "Work Experience" and content[0]["Company"] != sections["Work Experience"][0]["Company"]:
+            # A part whose entry list went missing cannot be merged.
+            return {"section_name": section_prompt.section, "section_content": None}
+        return {"section_name": section_prompt.section, "section_content": content}
+
+    monkeypatch.setattr(api, "run_section_prompt", answer)
+    result = api.tailor_sections(config, sections, "Platform engineer, Kubernetes and Go.")
+
+    assert sent_bullets == [1, 1]
+    assert "Work Experience" in result.failed
+    assert "Work Experience" not in result.tailored
+    assert result.sections["Work Experience"] == sections["Work Experience"]
+    assert result.tailored["Summary"]["section_content"] == sections["Summary"]
+
+
+def test_missing_workspace_is_not_created(tmp_path):
+    missing = tmp_path / "nonexist_ws"
+    with pytest.raises(api.ResumeCraftrError, match="resumecraftr setup"):
+        api.ResumeCraftr(str(missing))
+    assert not missing.exists()
+
+
+def test_assistant_without_model_points_at_setup(workspace):
+    craftr = api.ResumeCraftr(str(workspace), config={"chat_gpt": {}})
+    with pytest.raises(api.ResumeCraftrError, match="resumecraftr setup"):
+        craftr.parse("Jane Doe")
+
+
+def test_render_uses_primary_language(workspace, monkeypatch):
+    config = json.loads((workspace / "resumecraftr.json").read_text())
+    languages = []
+
+    def generate(template, sections, job_description, language, **kwargs):
+        languages.append(language)
+        return "# Jane Doe\n"
+
+    monkeypatch.setattr(api, "generate_markdown", generate)
+    api.ResumeCraftr(str(workspace), config={**config, "primary_language": "ES"}).render(golden_sections())
+    api.ResumeCraftr(str(workspace)).render(golden_sections())
+    assert languages == ["ES", "EN"]
@@ -0,0 +1,93 @@
+import os
+import json
+import time
+import shutil
+from resumecraftr.cli.schemas import section_specs
+from resumecraftr.cli.store import get_store
+from tests import fake_openai_server
+from tests.conftest import run_cli
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "corpus", "eval")
+
+
+def add_cv(workspace, parsed=False):
+    """Copy the corpus CV into the workspace, with its golden parse if `parsed`."""
+    shutil.copy(os.path.join(CORPUS, "cvs", "jane_doe.txt"), workspace / "cv.txt")
+    if parsed:
+        shutil.copy(
+            os.path.join(CORPUS, "golden", "jane_doe.extracted_sections.json"),
+            workspace / "cv.extracted_sections.json",
+        )
+    get_store().add_cv("cv.txt")
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def batch_requests(workspace, command):
+    (input_file,) = [name for name in os.listdir(workspace / "batches") if name.startswith(command)]
+    with open(workspace / "batches" / input_file, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_parse_cv_batch_collect(workspace):
+    add_cv(workspace)
+    result = run_cli(workspace, "parse-cv", "--batch", "--no-cache")
+    assert "Submitted batch" in result.output
+    # Contact, languages and education are filled in locally, not sent.
+    assert len(batch_requests(workspace, "parse-cv")) == 7
+    assert not (workspace / "cv.extracted_sections.json").exists()
+
+    result = run_cli(workspace, "collect")
+    assert "Saved:" in result.output
+    sections = read_json(workspace / "cv.extracted_sections.json")
+    assert list(sections) == list(section_specs())
+    assert sections["Contact Information"]["Email"] == "jane.doe@example.com"
+    assert get_store().list_batches(pending=True) == []
+    assert "No pending batches." in run_cli(workspace, "collect").output
+
+
+def test_tailor_cv_batch_collect_waits_for_batch(workspace, monkeypatch):
+    add_cv(workspace, parsed=True)
+    run_cli(workspace, "add-job", "job", "--file", os.path.join(CORPUS, "jobs", "platform_engineer.txt"))
+    monkeypatch.setattr(fake_openai_server.Handler, "delay", 1.0)
+
+    run_cli(workspace, "tailor-cv", "--batch", "--no-cache")
+    extracted = read_json(workspace / "cv.extracted_sections.json")
+    requests = batch_requests(workspace, "tailor-cv")
+    assert len(requests) == len(extracted)
+    assert all(request["body"]["response_format"]["type"] == "json_schema" for request in requests)
+
+    result = run_cli(workspace, "collect")
+    assert "is in_progress" in result.output
+    assert not (workspace / "cv.optimized_sections.json").exists()
+
+    time.sleep(1.0)
+    result = run_cli(workspace, "collect")
+    assert "Saved:" in result.output
+    # The fake server returns each section unchanged, so every reply must land
+    # on the section it was asked for.
+    assert read_json(workspace / "cv.optimized_sections.json") == {
+        name: {"section_name": name, "section_content": content} for name, content in extracted.items()
+    }
+    (artifact,) = [a for a in get_store().list_artifacts(cv="cv.txt") if a["kind"] == "optimized_sections"]
+    assert artifact["job"] == "job.txt"
+
+
+def test_batch_with_failed_items(workspace, monkeypatch):
+    add_cv(workspace)
+    monkeypatch.setattr(fake_openai_server.Handler, "fail_sections", ("Projects", "Certifications"))
+    run_cli(workspace, "parse-cv", "--batch", "--no-cache")
+
+    result = run_cli(workspace, "collect")
+    assert "No reply for section 'Projects'" in result.output
+    assert "No reply for section 'Certifications'" in result.output
+    sections = read_json(workspace / "cv.extracted_sections.json")
+    assert "Projects" not in sections
+    assert "Certifications" not in sections
+    assert list(sections) == [
+        name for name in section_specs() if name not in ("Projects", "Certifications")
+    ]
+    assert get_store().list_batches(pending=True) == []
@@ -0,0 +1,42 @@
+import json
+import socket
+import threading
+import pytest
+from resumecraftr.cli import daemon
+
+
+@pytest.fixture
+def server(workspace, monkeypatch):
+    """A daemon serving `workspace` whose commands exit with status 7 without running."""
+    monkeypatch.delenv("RESUMECRAFTR_NO_DAEMON")
+    monkeypatch.setenv("OPENAI_API_KEY", "daemon-key")
+    monkeypatch.setattr(daemon, "run_command", lambda argv: 7)
+    server = daemon.DaemonServer(daemon.socket_file(), daemon.RequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_same_environment_is_forwarded(server):
+    assert daemon.forward(["view-cv", "cv"]) == 7
+
+
+def test_different_api_key_runs_locally(server, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "client-key")
+    assert daemon.forward(["view-cv", "cv"]) is None
+
+
+def test_plain_env_value_runs_locally(server, workspace):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(daemon.socket_file())
+        header = {
+            "argv": ["view-cv", "cv"],
+            "cwd": ".",
+            "workspace": str(workspace),
+            "isatty": False,
+            "env": {**daemon._environment_digest(), "OPENAI_API_KEY": "daemon-key"},
+        }
+        conn.sendall((json.dumps(header) + "\n").encode("utf-8"))
+        assert json.loads(conn.makefile("r").readline()) == {"local": True}
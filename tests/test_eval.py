@@ -0,0 +1,42 @@
+import os
+import json
+from tests.conftest import run_cli
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "corpus", "eval")
+
+
+def test_eval_corpus_against_fake_backend(workspace, tmp_path):
+    report_file = tmp_path / "eval.json"
+    result = run_cli(workspace, "eval", CORPUS, "--output", str(report_file))
+
+    report = json.loads(report_file.read_text(encoding="utf-8"))
+    summary = {(row["variant"], row["step"]): row for row in report["summary"]}
+    assert set(summary) == {
+        (variant, step)
+        for variant in ("baseline", "mini", "free-text")
+        for step in ("parse", "tailor")
+    }
+    failed = {(sample["variant"], sample["step"]): sample["failed"] for sample in report["samples"]}
+
+    # Structured outputs get schema-shaped replies for every section.
+    for variant in ("baseline", "mini"):
+        assert failed[(variant, "parse")] == 0
+        assert summary[(variant, "parse")]["success"] == 1.0
+        assert summary[(variant, "parse")]["well_formed"] == 1.0
+    # Without a schema the fake server's parse replies lack the section keys and
+    # repairs cannot fix them: the seven sections sent to the model fail, the
+    # three filled in locally (contact, languages, education) do not.
+    assert failed[("free-text", "parse")] == 7
+    assert summary[("free-text", "parse")]["calls"] == 21
+    assert summary[("free-text", "parse")]["success"] == 0.3
+    assert summary[("free-text", "parse")]["well_formed"] == 0.0
+
+    # Tailoring echoes its input section back, so every variant succeeds.
+    for variant in ("baseline", "mini", "free-text"):
+        assert failed[(variant, "tailor")] == 0
+        assert summary[(variant, "tailor")]["success"] == 1.0
+        assert summary[(variant, "tailor")]["valid_json"] == 1.0
+
+    for variant in ("baseline", "mini", "free-text"):
+        assert variant in result.output
+    assert "Report saved to:" in result.output
@@ -0,0 +1,24 @@
+import os
+import json
+import pytest
+from resumecraftr.cli.utils.json import extract_json
+
+CORPUS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "corpus", "failed_replies.jsonl"
+)
+
+
+def load_cases():
+    with open(CORPUS, "r", encoding="utf-8") as f:
+        cases = [json.loads(line) for line in f if line.strip()]
+    return [pytest.param(case["reply"], case["expected"], id=case["name"]) for case in cases]
+
+
+@pytest.mark.parametrize("reply, expected", load_cases())
+def test_extract_json_recovers_failed_reply(reply, expected):
+    assert extract_json(reply) == expected
+
+
+def test_corpus_covers_every_recovery():
+    # benchmarks/bench_json_extract.py reports 12/12 on this corpus.
+    assert len(load_cases()) == 12
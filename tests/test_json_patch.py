@@ -0,0 +1,68 @@
+import pytest
+from resumecraftr.cli.utils.json_patch import PatchError, apply_patch
+
+SECTION = {
+    "Job Title": "Engineer",
+    "Responsibilities": ["Built APIs", "Ran on-call"],
+    "Details": {"Team": "Payments", "Stack": ["Go"]},
+}
+
+
+def test_add_at_end_of_array():
+    patched = apply_patch(SECTION, [{"op": "add", "path": "/Responsibilities/-", "value": "Mentored"}])
+    assert patched["Responsibilities"] == ["Built APIs", "Ran on-call", "Mentored"]
+
+
+def test_add_at_array_length_appends():
+    patched = apply_patch(SECTION, [{"op": "add", "path": "/Responsibilities/2", "value": "Mentored"}])
+    assert patched["Responsibilities"][-1] == "Mentored"
+
+
+def test_document_is_not_modified():
+    apply_patch(SECTION, [{"op": "remove", "path": "/Responsibilities/0"}])
+    assert SECTION["Responsibilities"] == ["Built APIs", "Ran on-call"]
+
+
+def test_replace_and_move():
+    patched = apply_patch(
+        SECTION,
+        [
+            {"op": "replace", "path": "/Job Title", "value": "Senior Engineer"},
+            {"op": "move", "from": "/Details/Team", "path": "/Team"},
+        ],
+    )
+    assert patched["Job Title"] == "Senior Engineer"
+    assert patched["Team"] == "Payments"
+    assert "Team" not in patched["Details"]
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        pytest.param({"op": "remove", "path": "/Responsibilities/2"}, id="remove-out-of-range"),
+        pytest.param({"op": "remove", "path": "/Responsibilities/-"}, id="remove-dash"),
+        pytest.param({"op": "add", "path": "/Responsibilities/3", "value": "x"}, id="add-past-end"),
+        pytest.param({"op": "replace", "path": "/Responsibilities/01", "value": "x"}, id="leading-zero-index"),
+        pytest.param({"op": "move", "from": "/Details", "path": "/Details/Inner"}, id="move-into-own-child"),
+        pytest.param({"op": "remove", "path": "/Missing"}, id="remove-missing-key"),
+        pytest.param({"op": "test", "path": "/Job Title", "value": "Manager"}, id="failed-test"),
+        pytest.param({"op": "replace", "path": "/Job Title"}, id="no-value"),
+        pytest.param({"op": "rename", "path": "/Job Title"}, id="unknown-op"),
+        pytest.param({"op": "add", "path": "Job Title", "value": "x"}, id="relative-path"),
+    ],
+)
+def test_invalid_operation_raises(operation):
+    with pytest.raises(PatchError):
+        apply_patch(SECTION, [operation])
+
+
+def test_patch_fails_as_a_whole():
+    with pytest.raises(PatchError):
+        apply_patch(
+            SECTION,
+            [
+                {"op": "replace", "path": "/Job Title", "value": "Senior Engineer"},
+                {"op": "remove", "path": "/Responsibilities/5"},
+            ],
+        )
+    assert SECTION["Job Title"] == "Engineer"
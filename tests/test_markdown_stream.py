@@ -0,0 +1,42 @@
+import pytest
+from resumecraftr.cli.markdown_stream import FrontMatterError, MarkdownStream, front_matter_problems
+
+
+@pytest.mark.parametrize(
+    "block",
+    [
+        pytest.param("title: Jane Doe\nlang: en\n", id="with-title"),
+        pytest.param("author: Jane Doe\ngeometry: margin=2cm\n", id="without-title"),
+        pytest.param("author:\n- Jane Doe\n", id="list-value"),
+        pytest.param("", id="empty"),
+    ],
+)
+def test_front_matter_pandoc_accepts(block):
+    assert front_matter_problems(block) == []
+
+
+@pytest.mark.parametrize(
+    "block",
+    [
+        pytest.param("title: [Jane Doe\n", id="unclosed-list"),
+        pytest.param("- Jane Doe\n- Engineer\n", id="not-a-mapping"),
+    ],
+)
+def test_front_matter_pandoc_rejects(block):
+    assert front_matter_problems(block)
+
+
+def test_stream_keeps_document_without_title(tmp_path):
+    stream = MarkdownStream(str(tmp_path / "cv.md"))
+    for piece in ("---\nauthor: Jane", " Doe\n---\n", "# Experience\n"):
+        stream(piece)
+    stream.close()
+    assert (tmp_path / "cv.md").read_text(encoding="utf-8") == "---\nauthor: Jane Doe\n---\n# Experience\n"
+
+
+def test_stream_stops_on_invalid_front_matter(tmp_path):
+    stream = MarkdownStream(str(tmp_path / "cv.md"))
+    stream("---\ntitle: [Jane\n")
+    with pytest.raises(FrontMatterError):
+        stream("---\n")
+    stream.close()
@@ -0,0 +1,22 @@
+from resumecraftr.cli.routing import Route, route_for
+
+CONFIG = {"chat_gpt": {"model": "gpt-4o", "temperature": 0.7}}
+
+
+def test_bundled_sections_use_a_smaller_model():
+    assert route_for(CONFIG, "extracted_section", "Contact Information") == Route(model="gpt-4o-mini", temperature=0)
+    assert route_for(CONFIG, "optimized_section", "Languages") == Route(model="gpt-4o-mini", temperature=0)
+    assert route_for(CONFIG, "optimized_section", "Work Experience") == Route(model="gpt-4o", temperature=0.7)
+
+
+def test_workspace_overrides_bundled_section_settings():
+    config = {"chat_gpt": {**CONFIG["chat_gpt"], "sections": {"Languages": {"tailor-cv": {"model": "gpt-4o"}}}}}
+    assert route_for(config, "extracted_section", "Languages").model == "gpt-4o-mini"
+    assert route_for(config, "optimized_section", "Languages").model == "gpt-4o"
+
+
+def test_bundled_models_are_skipped_with_base_url():
+    config = {"chat_gpt": {**CONFIG["chat_gpt"], "model": "Qwen2.5-14B-Instruct", "base_url": "http://127.0.0.1:8000/v1"}}
+    assert route_for(config, "extracted_section", "Contact Information") == Route(
+        model="Qwen2.5-14B-Instruct", temperature=0
+    )
@@ -0,0 +1,49 @@
+import os
+import sys
+import pytest
+from resumecraftr.cli.cmd import watch
+from resumecraftr.cli.utils.watcher import create_watcher
+
+
+@pytest.mark.parametrize(
+    "polling",
+    [
+        True,
+        pytest.param(False, marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify")),
+    ],
+)
+def test_watcher_ignores_workspace_internals(tmp_path, polling):
+    (tmp_path / ".artifacts").mkdir()
+    watcher = create_watcher(str(tmp_path), interval=0.05, polling=polling, ignore=watch.IGNORED_PATHS)
+    try:
+        (tmp_path / ".artifacts" / "blob").write_text("x")
+        (tmp_path / ".checkpoints").mkdir()
+        (tmp_path / ".checkpoints" / "cv.json").write_text("{}")
+        (tmp_path / "resumecraftr.db").write_text("x")
+        (tmp_path / "resumecraftr.db-wal").write_text("x")
+        assert watcher.wait(timeout=0.3) == set()
+
+        (tmp_path / "cv.extracted_sections.json").write_text("{}")
+        assert str(tmp_path / "cv.extracted_sections.json") in watcher.wait(timeout=2)
+    finally:
+        watcher.close()
+
+
+def test_pdf_step_is_skipped_without_pandoc(workspace, monkeypatch, capsys):
+    monkeypatch.setattr(watch, "check_pandoc", lambda: False)
+    session = watch.WatchSession("cv.extracted_sections.json", "job.txt", "EN")
+    built = []
+    monkeypatch.setitem(
+        session.graph._rules,
+        os.path.abspath(session.md_path),
+        ([], lambda: built.append("md") or open(session.md_path, "w").close()),
+    )
+
+    session.rebuild([os.path.abspath(session.md_path), os.path.abspath(session.pdf_path)])
+    session.rebuild([os.path.abspath(session.pdf_path)])
+
+    output = capsys.readouterr().out
+    assert built == ["md"]
+    assert not os.path.exists(session.pdf_path)
+    assert output.count("Installing Pandoc") == 1
+    assert output.count("Pandoc is not installed; skipping") == 2